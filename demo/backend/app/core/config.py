@@ -0,0 +1,199 @@
+# backend/app/core/config.py
+import json
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+API_KEY = os.getenv("API_KEY")
+TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+
+# Upstream endpoints (overridable so benchmarks can point at a local stub server)
+OPENROUTER_URL = os.getenv("OPENROUTER_URL", "https://openrouter.ai/api/v1/chat/completions")
+TAVILY_URL = os.getenv("TAVILY_URL", "https://api.tavily.com/search")
+DUCKDUCKGO_URL = os.getenv("DUCKDUCKGO_URL", "https://html.duckduckgo.com/html/")
+
+# Shared HTTP client
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "512"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+# In-flight requests allowed to API hosts (OpenRouter, Tavily); news sites use HTTP_MAX_CONNECTIONS_PER_HOST
+HTTP_API_MAX_CONNECTIONS = int(os.getenv("HTTP_API_MAX_CONNECTIONS", "256"))
+
+# Worker threads for blocking work (HTML parsing, text cleaning) offloaded from the event loop
+OFFLOAD_WORKERS = int(os.getenv("OFFLOAD_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))
+
+# Deep research fan-out
+DEEP_RESEARCH_MAX_RESULTS = int(os.getenv("DEEP_RESEARCH_MAX_RESULTS", "5"))
+DEEP_RESEARCH_CONCURRENCY = int(os.getenv("DEEP_RESEARCH_CONCURRENCY", "5"))
+# Overall budget in seconds for one /deep-research request; pages still loading when it runs out are dropped
+DEEP_RESEARCH_DEADLINE = float(os.getenv("DEEP_RESEARCH_DEADLINE", "12"))
+
+# Scraped page cache
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "900"))
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "1000"))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Directory for the on-disk tier; leave unset to keep the cache in memory only
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR") or None
+PAGE_CACHE_DISK_MAX_BYTES = int(os.getenv("PAGE_CACHE_DISK_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# LLM response cache: "memory", "sqlite" or "none"
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 60 * 60)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+
+# LLM gateway; the default model answers calls made without a task (see model routing below)
+LLM_DEFAULT_MODEL = os.getenv("LLM_DEFAULT_MODEL", "deepseek/deepseek-r1-zero:free")
+
+# Model routing (app/services/model_router.py). Quality tier per model, "light" < "standard" < "reasoning";
+# models missing here count as meeting any tier
+LLM_MODEL_TIERS = {
+    "deepseek/deepseek-r1-zero:free": "reasoning",
+    "deepseek/deepseek-r1:free": "reasoning",
+    "deepseek/deepseek-chat-v3-0324:free": "standard",
+    "meta-llama/llama-3.3-70b-instruct:free": "standard",
+    "mistralai/mistral-small-3.1-24b-instruct:free": "light",
+    "google/gemma-3-12b-it:free": "light",
+    **json.loads(os.getenv("LLM_MODEL_TIERS", "{}")),
+}
+# Per task, the lowest tier it accepts and its models in preference order (the fallback chain).
+# LLM_TASK_ROUTES replaces single tasks as JSON, e.g. {"summary": {"tier": "light", "models": ["..."]}}
+LLM_TASK_ROUTES = {
+    "related_topics": {"tier": "light", "models": ["mistralai/mistral-small-3.1-24b-instruct:free",
+                                                   "google/gemma-3-12b-it:free",
+                                                   "meta-llama/llama-3.3-70b-instruct:free"]},
+    "summary": {"tier": "standard", "models": ["deepseek/deepseek-chat-v3-0324:free",
+                                               "meta-llama/llama-3.3-70b-instruct:free",
+                                               "deepseek/deepseek-r1-zero:free"]},
+    "perspective": {"tier": "standard", "models": ["deepseek/deepseek-chat-v3-0324:free",
+                                                   "meta-llama/llama-3.3-70b-instruct:free",
+                                                   "deepseek/deepseek-r1:free"]},
+    "fact_check": {"tier": "reasoning", "models": ["deepseek/deepseek-r1-zero:free", "deepseek/deepseek-r1:free"]},
+    **json.loads(os.getenv("LLM_TASK_ROUTES", "{}")),
+}
+# Calls measured before a model's latency ranks it (or its error rate benches it), and the error rate,
+# over the last ERROR_WINDOW seconds, above which a model is tried only after the healthy ones
+LLM_ROUTER_MIN_SAMPLES = int(os.getenv("LLM_ROUTER_MIN_SAMPLES", "5"))
+LLM_ROUTER_MAX_ERROR_RATE = float(os.getenv("LLM_ROUTER_MAX_ERROR_RATE", "0.5"))
+LLM_ROUTER_ERROR_WINDOW = float(os.getenv("LLM_ROUTER_ERROR_WINDOW", "60"))
+
+# Prompt budgets: input tokens per prompt before long text is split into chunks (map-reduce)
+CHARS_PER_TOKEN = int(os.getenv("CHARS_PER_TOKEN", "4"))
+LLM_CHUNK_TOKENS = int(os.getenv("LLM_CHUNK_TOKENS", "3000"))
+# Per-model overrides as JSON, e.g. {"deepseek/deepseek-r1-zero:free": 6000}
+LLM_MODEL_TOKEN_BUDGETS = json.loads(os.getenv("LLM_MODEL_TOKEN_BUDGETS", "{}"))
+# Chunk summaries requested in parallel per article
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+
+# Background jobs (/jobs/*)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_MAX_DEPTH = int(os.getenv("JOB_QUEUE_MAX_DEPTH", "100"))
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.sqlite3")
+# Finished jobs kept in memory; older ones are still served from SQLite
+JOB_MEMORY_MAX = int(os.getenv("JOB_MEMORY_MAX", "1000"))
+
+# Analysis storage
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./deeplens.sqlite3")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Stored results younger than this (seconds) are served instead of re-running the pipeline
+ANALYSIS_MAX_AGE = float(os.getenv("ANALYSIS_MAX_AGE", str(24 * 60 * 60)))
+
+# Document export
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EXPORT_BATCH_MAX = int(os.getenv("EXPORT_BATCH_MAX", "500"))
+
+# Page downloads: bodies are streamed and cut off at these limits
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(5 * 1024 * 1024)))
+# Seconds for a whole page download, connect included, unless the caller sets its own
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE", "20"))
+# Stop reading once this much paragraph text has arrived; far more than one summary prompt uses
+FETCH_ENOUGH_TEXT_CHARS = int(os.getenv("FETCH_ENOUGH_TEXT_CHARS", "60000"))
+
+# Scraped text cleaning: "unicode" keeps every script, "ascii" keeps only [a-zA-Z0-9 .,!?] (the old behaviour)
+TEXT_CLEANING_MODE = os.getenv("TEXT_CLEANING_MODE", "unicode").lower()
+TEXT_CLEANING_LOWERCASE = os.getenv("TEXT_CLEANING_LOWERCASE", "false").lower() in ("1", "true", "yes")
+
+# Keyword extraction (BM25 over the document frequencies of every article researched so far)
+# SQLite file holding the DF index across restarts; empty keeps it in memory only
+KEYWORD_INDEX_PATH = os.getenv("KEYWORD_INDEX_PATH", "keywords.sqlite3")
+BM25_K1 = float(os.getenv("BM25_K1", "1.5"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+# Local vector store of analyzed articles (near-duplicate reuse, local corpus for research)
+# Directory for the memory-mapped vectors and their metadata; empty keeps the store in memory only
+VECTOR_STORE_DIR = os.getenv("VECTOR_STORE_DIR", "vector_store")
+VECTOR_DIM = int(os.getenv("VECTOR_DIM", "1024"))
+# Exact search below this many articles; above it an IVF index scans VECTOR_ANN_NPROBE buckets
+VECTOR_ANN_MIN_ROWS = int(os.getenv("VECTOR_ANN_MIN_ROWS", "20000"))
+VECTOR_ANN_NPROBE = int(os.getenv("VECTOR_ANN_NPROBE", "8"))
+# Cosine similarity from which another article counts as the same story and its analysis is reused
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+# Minimum similarity for a stored article to be offered as related material
+VECTOR_RELATED_MIN_SCORE = float(os.getenv("VECTOR_RELATED_MIN_SCORE", "0.25"))
+
+# Web search for deep research and fact-checking
+# Providers in preference order: "duckduckgo", "tavily" (needs TAVILY_API_KEY), "fake" (offline)
+SEARCH_PROVIDERS = [p.strip().lower() for p in os.getenv("SEARCH_PROVIDERS", "duckduckgo,tavily").split(",") if p.strip()]
+# "merge": every provider's results, deduplicated; "first": the first provider with results wins
+SEARCH_MODE = os.getenv("SEARCH_MODE", "merge").lower()
+# Seconds one provider gets per query before it is skipped
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "8"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "3600"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000"))
+
+# Per-claim fact-checking: claims taken from an article, verified in parallel
+FACT_CHECK_MAX_CLAIMS = int(os.getenv("FACT_CHECK_MAX_CLAIMS", "5"))
+FACT_CHECK_CONCURRENCY = int(os.getenv("FACT_CHECK_CONCURRENCY", "5"))
+# Search results used as evidence for each claim
+FACT_CHECK_EVIDENCE_RESULTS = int(os.getenv("FACT_CHECK_EVIDENCE_RESULTS", "3"))
+
+# Fact-check checkpoints, kept per run so a failed or interrupted run resumes instead of starting over
+# "memory", or "sqlite" (needs langgraph-checkpoint-sqlite) to also resume jobs re-queued after a restart
+FACT_CHECK_CHECKPOINTER = os.getenv("FACT_CHECK_CHECKPOINTER", "memory").lower()
+FACT_CHECK_CHECKPOINT_PATH = os.getenv("FACT_CHECK_CHECKPOINT_PATH", "checkpoints.sqlite3")
+# Checkpoints of unfinished runs are dropped after this many seconds; memory keeps at most MAX_THREADS runs
+FACT_CHECK_CHECKPOINT_TTL = float(os.getenv("FACT_CHECK_CHECKPOINT_TTL", "3600"))
+FACT_CHECK_CHECKPOINT_MAX_THREADS = int(os.getenv("FACT_CHECK_CHECKPOINT_MAX_THREADS", "200"))
+
+# Batch endpoints (/scrape-and-summarize/batch, /fact-check/batch, /deep-research/batch)
+BATCH_MAX_URLS = int(os.getenv("BATCH_MAX_URLS", "500"))
+# URLs processed at once across all batches, and per site (politeness towards each outlet)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "32"))
+BATCH_PER_HOST_CONCURRENCY = int(os.getenv("BATCH_PER_HOST_CONCURRENCY", "2"))
+
+# Outbound rate limits: a token bucket per host, in requests per second with a burst allowance
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+# News sites and any other host without a budget of its own
+RATE_LIMIT_DEFAULT_RPS = float(os.getenv("RATE_LIMIT_DEFAULT_RPS", "2"))
+RATE_LIMIT_DEFAULT_BURST = int(os.getenv("RATE_LIMIT_DEFAULT_BURST", "5"))
+RATE_LIMIT_OPENROUTER_RPS = float(os.getenv("RATE_LIMIT_OPENROUTER_RPS", "20"))
+RATE_LIMIT_OPENROUTER_BURST = int(os.getenv("RATE_LIMIT_OPENROUTER_BURST", "40"))
+RATE_LIMIT_TAVILY_RPS = float(os.getenv("RATE_LIMIT_TAVILY_RPS", "5"))
+RATE_LIMIT_TAVILY_BURST = int(os.getenv("RATE_LIMIT_TAVILY_BURST", "10"))
+RATE_LIMIT_DUCKDUCKGO_RPS = float(os.getenv("RATE_LIMIT_DUCKDUCKGO_RPS", "1"))
+RATE_LIMIT_DUCKDUCKGO_BURST = int(os.getenv("RATE_LIMIT_DUCKDUCKGO_BURST", "3"))
+# Per-host overrides as JSON, e.g. {"www.example.com": [0.5, 1]} for [requests per second, burst]
+RATE_LIMIT_HOSTS = json.loads(os.getenv("RATE_LIMIT_HOSTS", "{}"))
+# Longest Retry-After honoured; longer requests are cut to this
+RATE_LIMIT_MAX_RETRY_AFTER = float(os.getenv("RATE_LIMIT_MAX_RETRY_AFTER", "60"))
+
+# Resilience of API calls (OpenRouter per model, Tavily): retries, circuit breakers and hedging
+RESILIENCE_RETRIES = int(os.getenv("RESILIENCE_RETRIES", "2"))
+RESILIENCE_BACKOFF = float(os.getenv("RESILIENCE_BACKOFF", "0.5"))
+RESILIENCE_MAX_BACKOFF = float(os.getenv("RESILIENCE_MAX_BACKOFF", "10"))
+# A breaker opens after this many failed calls in a row, then fails fast for RESET seconds before one probe call
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+# Hedged requests: a call still running past this quantile of the upstream's recent latencies (known once
+# HEDGE_MIN_SAMPLES calls succeeded) fires a second attempt, on LLM_FALLBACK_MODEL if set; the first answer wins
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+HEDGE_QUANTILE = float(os.getenv("HEDGE_QUANTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "")
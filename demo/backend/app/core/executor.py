@@ -0,0 +1,41 @@
+# backend/app/core/executor.py
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.core import config
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def init_executor(max_workers: int = config.OFFLOAD_WORKERS) -> ThreadPoolExecutor:
+    """Creates the offload pool; called from the FastAPI lifespan on startup."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="offload")
+    return _executor
+
+
+def shutdown_executor():
+    """Waits for in-flight offloaded work and releases the pool on shutdown."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Returns the offload pool, creating it lazily outside the app lifespan."""
+    return _executor or init_executor()
+
+
+async def run_sync(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Runs a blocking function (BeautifulSoup parsing, regex cleaning, ...) on the
+    offload pool so the event loop keeps serving other requests meanwhile.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
@@ -0,0 +1,184 @@
+# backend/app/core/http_client.py
+import asyncio
+import logging
+import random
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core import config
+from app.core.rate_limit import RateLimiter, get_rate_limiter, retry_after_seconds
+
+logger = logging.getLogger("uvicorn.error")
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def jittered_backoff(base: float, attempt: int, cap: float = config.RESILIENCE_MAX_BACKOFF) -> float:
+    """
+    Delay before retry `attempt`, anywhere up to base * 2**attempt ("full jitter"),
+    so callers that failed together do not all retry at the same moment.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _default_host_limits() -> Dict[str, int]:
+    """API upstreams are sized for many concurrent calls, unlike the news sites we scrape."""
+    return {urlsplit(url).netloc: config.HTTP_API_MAX_CONNECTIONS for url in (config.OPENROUTER_URL, config.TAVILY_URL)}
+
+
+class HTTPClient:
+    """
+    Pooled async HTTP client shared by every scraper and service.
+    Keeps connections alive between calls, caps concurrent connections per host,
+    paces requests per host through the rate limiter (see rate_limit.py) and retries
+    transient failures with jittered exponential backoff, or after Retry-After if that is
+    longer. API calls (OpenRouter, Tavily) retry in resilience.py instead.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        max_connections_per_host: int = config.HTTP_MAX_CONNECTIONS_PER_HOST,
+        host_connection_limits: Optional[Dict[str, int]] = None,
+        connect_timeout: float = config.HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = config.HTTP_READ_TIMEOUT,
+        retries: int = config.HTTP_RETRIES,
+        backoff: float = config.HTTP_BACKOFF,
+        http2: bool = config.HTTP2_ENABLED,
+        verify: bool = True,
+        rate_limited: bool = config.RATE_LIMIT_ENABLED,
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self.host_connection_limits = _default_host_limits() if host_connection_limits is None else host_connection_limits
+        self.retries = retries
+        self.backoff = backoff
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.rate_limiter: Optional[RateLimiter] = get_rate_limiter() if rate_limited else None
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            http2=http2 and _http2_available(),
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            verify=verify,
+        )
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(str(url)).netloc
+        if host not in self._host_limits:
+            limit = self.host_connection_limits.get(host, self.max_connections_per_host)
+            self._host_limits[host] = asyncio.Semaphore(limit)
+        return self._host_limits[host]
+
+    async def _acquire(self, url: str):
+        # Before taking a connection slot, so a request waiting for its turn holds none
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(url)
+
+    def hold(self, url: str, headers: Optional[httpx.Headers]) -> Optional[float]:
+        """
+        Seconds asked for by a Retry-After in `headers` (None without one); the rate
+        limiter then holds back every other request to the host for as long.
+        """
+        retry_after = retry_after_seconds(headers)
+        if retry_after is not None and self.rate_limiter is not None:
+            retry_after = self.rate_limiter.pause(url, retry_after)
+        return retry_after
+
+    async def pause(self, url: str, attempt: int, headers: Optional[httpx.Headers] = None):
+        """Waits before retry `attempt`: the jittered backoff, or the Retry-After in `headers` if longer."""
+        await asyncio.sleep(max(jittered_backoff(self.backoff, attempt), self.hold(url, headers) or 0))
+
+    async def request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """
+        Sends a request through the shared pool. Connection errors, timeouts and
+        retryable status codes (429/5xx) are retried with jittered exponential backoff;
+        the last response or exception is returned/raised once retries run out.
+        """
+        retries = self.retries if retries is None else retries
+        attempt = 0
+        while True:
+            headers = None
+            try:
+                await self._acquire(url)
+                async with self._host_limit(url):
+                    response = await self._client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                    return response
+                logger.warning("HTTP %s from %s, retrying (%d/%d)", response.status_code, url, attempt + 1, retries)
+                headers = response.headers
+            except httpx.TransportError as e:
+                if attempt >= retries:
+                    raise
+                logger.warning("%s for %s, retrying (%d/%d)", type(e).__name__, url, attempt + 1, retries)
+            await self.pause(url, attempt, headers)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        Opens a streaming response (e.g. server-sent events) under the same per-host cap
+        and rate limit. Not retried: once bytes have been handed to the caller a replay
+        would duplicate them.
+        """
+        await self._acquire(url)
+        async with self._host_limit(url):
+            async with self._client.stream(method, url, **kwargs) as response:
+                yield response
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+_client: Optional[HTTPClient] = None
+
+
+async def init_http_client(**kwargs) -> HTTPClient:
+    """Creates the shared client; called from the FastAPI lifespan on startup."""
+    global _client
+    if _client is None:
+        _client = HTTPClient(**kwargs)
+    return _client
+
+
+async def close_http_client():
+    """Closes the shared client and its pooled connections on shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> HTTPClient:
+    """
+    Returns the shared client. Outside the app lifespan (scripts, benchmarks)
+    the client is created lazily on first use.
+    """
+    global _client
+    if _client is None:
+        _client = HTTPClient()
+    return _client
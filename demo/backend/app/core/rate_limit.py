@@ -0,0 +1,182 @@
+# backend/app/core/rate_limit.py
+"""
+Outbound request rate limits, one token bucket per host.
+
+OpenRouter, Tavily and DuckDuckGo have their own budgets (RATE_LIMIT_*), other hosts
+(the news sites we scrape) share the default one, and RATE_LIMIT_HOSTS overrides
+single hosts. Callers reserve their slot when they ask, so requests to a host go
+out in the order they asked and none waits behind later ones. A Retry-After answer
+from a host holds back every request to it until then. Works from async code
+(acquire) and from threads (acquire_sync); wait times are kept per host for
+/rate-limit-stats.
+"""
+import asyncio
+import email.utils
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core import config
+
+MAX_TRACKED_HOSTS = 10000
+
+
+def _host(url) -> str:
+    return urlsplit(str(url)).netloc
+
+
+def retry_after_seconds(headers: Optional[httpx.Headers]) -> Optional[float]:
+    """Seconds asked for by a Retry-After header (delay or HTTP date); None without a usable one."""
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    `rate` requests per second with bursts of up to `burst`, as a virtual schedule:
+    `_next` is when the bucket would be empty again, so a reservation is one addition.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1.0 / rate
+        self.tolerance = (max(1, burst) - 1) * self.interval
+        self._next = 0.0
+        self.requests = 0
+        self.delayed = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+        self.retry_afters = 0
+
+    def reserve(self, now: float) -> float:
+        """Takes the next free slot; returns how long the caller has to wait for it."""
+        scheduled = max(self._next, now)
+        wait = max(0.0, scheduled - self.tolerance - now)
+        self._next = scheduled + self.interval
+        self.requests += 1
+        if wait:
+            self.delayed += 1
+            self.waited += wait
+            self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def pause_until(self, until: float):
+        """No request before `until`, and only one right then (no burst straight after a 429)."""
+        self._next = max(self._next, until + self.tolerance)
+        self.retry_afters += 1
+
+    def idle(self, now: float) -> bool:
+        return self._next <= now
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "delayed": self.delayed,
+            "wait_seconds": round(self.waited, 3),
+            "max_wait_seconds": round(self.max_wait, 3),
+            "retry_after": self.retry_afters,
+        }
+
+
+def _default_budgets() -> Dict[str, Tuple[float, int]]:
+    budgets = {
+        _host(config.DUCKDUCKGO_URL): (config.RATE_LIMIT_DUCKDUCKGO_RPS, config.RATE_LIMIT_DUCKDUCKGO_BURST),
+        _host(config.TAVILY_URL): (config.RATE_LIMIT_TAVILY_RPS, config.RATE_LIMIT_TAVILY_BURST),
+        _host(config.OPENROUTER_URL): (config.RATE_LIMIT_OPENROUTER_RPS, config.RATE_LIMIT_OPENROUTER_BURST),
+    }
+    budgets.update({host: (float(rate), int(burst)) for host, (rate, burst) in config.RATE_LIMIT_HOSTS.items()})
+    return budgets
+
+
+class RateLimiter:
+    """Token buckets per host; thread-safe, so async and sync callers share the budgets."""
+
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default: Tuple[float, int] = (config.RATE_LIMIT_DEFAULT_RPS, config.RATE_LIMIT_DEFAULT_BURST),
+                 max_retry_after: float = config.RATE_LIMIT_MAX_RETRY_AFTER):
+        self.budgets = _default_budgets() if budgets is None else budgets
+        self.default = default
+        self.max_retry_after = max_retry_after
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._retired = TokenBucket(1, 1)  # totals of buckets dropped while idle
+
+    def _bucket(self, host: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TRACKED_HOSTS:
+                self._drop_idle(now)
+            bucket = self._buckets[host] = TokenBucket(*self.budgets.get(host, self.default))
+        return bucket
+
+    def _drop_idle(self, now: float):
+        # An idle bucket is full again, so forgetting it changes no future wait; keep its counts
+        for host, bucket in list(self._buckets.items()):
+            if bucket.idle(now):
+                for name in ("requests", "delayed", "waited", "retry_afters"):
+                    setattr(self._retired, name, getattr(self._retired, name) + getattr(bucket, name))
+                self._retired.max_wait = max(self._retired.max_wait, bucket.max_wait)
+                del self._buckets[host]
+
+    def reserve(self, url) -> float:
+        """Reserves a request to `url`'s host; returns the seconds to wait before sending it."""
+        now = time.monotonic()
+        with self._lock:
+            return self._bucket(_host(url), now).reserve(now)
+
+    async def acquire(self, url):
+        wait = self.reserve(url)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, url):
+        wait = self.reserve(url)
+        if wait:
+            time.sleep(wait)
+
+    def pause(self, url, seconds: float) -> float:
+        """Holds back `url`'s host for `seconds` (capped at max_retry_after); returns the pause applied."""
+        seconds = min(seconds, self.max_retry_after)
+        now = time.monotonic()
+        with self._lock:
+            self._bucket(_host(url), now).pause_until(now + seconds)
+        return seconds
+
+    def stats(self, top: int = 10) -> dict:
+        with self._lock:
+            buckets = list(self._buckets.items())
+            totals = self._retired.stats()
+            for _, bucket in buckets:
+                for name, value in bucket.stats().items():
+                    totals[name] = max(totals[name], value) if name == "max_wait_seconds" else totals[name] + value
+            busiest = sorted(buckets, key=lambda item: item[1].waited, reverse=True)[:top]
+            return {
+                "enabled": True,
+                "hosts": len(buckets),
+                **{name: round(value, 3) for name, value in totals.items()},
+                "by_host": {host: {"rate": round(1 / bucket.interval, 3), **bucket.stats()} for host, bucket in busiest},
+            }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """The process-wide limiter, shared by the HTTP client and any synchronous caller."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
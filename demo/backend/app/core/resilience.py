@@ -0,0 +1,293 @@
+# backend/app/core/resilience.py
+"""
+Resilience for API calls (OpenRouter, once per model, and Tavily): bounded retries
+with jittered backoff, a circuit breaker per upstream and optional hedged requests.
+
+Failures are typed (UpstreamError and its subclasses) rather than strings. Retryable
+failures are retried up to RESILIENCE_RETRIES times, waiting at least any
+Retry-After. An upstream that keeps failing trips its breaker, and for
+BREAKER_RESET_SECONDS every call to it fails at once with CircuitOpenError instead
+of waiting on timeouts. After that a single probe call decides whether it closes
+again. With hedging on, a call still running past the upstream's HEDGE_QUANTILE
+latency fires a second attempt (or the fallback), and the first answer wins.
+Latencies and errors per upstream are reported by /upstream-stats.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import httpx
+
+from app.core import config
+from app.core.http_client import RETRY_STATUS_CODES, get_http_client, jittered_backoff
+
+logger = logging.getLogger("uvicorn.error")
+
+T = TypeVar("T")
+
+LATENCY_WINDOW = 200  # recent calls kept per upstream for latency quantiles and the error rate
+
+
+class UpstreamError(Exception):
+    """A call to an upstream API failed; `retryable` failures may succeed when tried again."""
+    retryable = True
+
+    def __init__(self, message: str, upstream: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class UpstreamTimeout(UpstreamError):
+    """The upstream did not answer in time."""
+
+
+class UpstreamConnectionError(UpstreamError):
+    """The upstream could not be reached, or dropped the connection."""
+
+
+class UpstreamStatusError(UpstreamError):
+    """The upstream answered with an error status; 429 and 5xx are retryable."""
+
+    def __init__(self, status: int, upstream: str = "", retry_after: Optional[float] = None, detail: str = ""):
+        super().__init__(f"{upstream or 'upstream'} answered HTTP {status}" + (f": {detail}" if detail else ""),
+                         upstream, retry_after)
+        self.status = status
+        self.retryable = status in RETRY_STATUS_CODES
+
+
+class UpstreamResponseError(UpstreamError):
+    """A success status with an unusable body: not JSON, no content, or an error object."""
+
+
+class CircuitOpenError(UpstreamError):
+    """The upstream's breaker is open; `retry_after` is when it lets a probe call through."""
+    retryable = False
+
+
+@contextmanager
+def typed_errors(upstream: str):
+    """Raises httpx transport failures inside the block as UpstreamTimeout / UpstreamConnectionError."""
+    try:
+        yield
+    except httpx.TimeoutException as e:
+        raise UpstreamTimeout(f"{upstream} timed out: {e!r}", upstream) from e
+    except httpx.TransportError as e:
+        raise UpstreamConnectionError(f"{upstream} unreachable: {e!r}", upstream) from e
+
+
+def check_response(response: httpx.Response, upstream: str):
+    """Raises UpstreamStatusError for a non-2xx response, honouring its Retry-After."""
+    if not response.is_success:
+        retry_after = get_http_client().hold(str(response.request.url), response.headers)
+        raise UpstreamStatusError(response.status_code, upstream, retry_after, response.text[:200])
+
+
+async def api_request(method: str, url: str, upstream: str, **kwargs) -> httpx.Response:
+    """
+    One attempt at an API call through the shared client: no retries of its own (the
+    Upstream retries), every failure raised as an UpstreamError.
+    """
+    with typed_errors(upstream):
+        response = await get_http_client().request(method, url, retries=0, **kwargs)
+    check_response(response, upstream)
+    return response
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` failures in a row -> half-open (one probe) after `reset_after`."""
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = config.BREAKER_FAILURE_THRESHOLD,
+                 reset_after: float = config.BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probing = False
+
+    def is_open(self, now: float) -> bool:
+        """True while calls are refused outright (open, and not yet due for a probe)."""
+        return self.state == self.OPEN and now < self.opened_at + self.reset_after
+
+    def refuse(self, now: float) -> Optional[float]:
+        """None if a call may go ahead, else the seconds until the breaker lets a probe through."""
+        if self.state == self.OPEN:
+            remaining = self.opened_at + self.reset_after - now
+            if remaining > 0:
+                return remaining
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return self.reset_after
+            self._probing = True
+        return None
+
+    def success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def failure(self, now: float):
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self.state = self.OPEN
+            self.opened_at = now
+            self.trips += 1
+
+    def release(self):
+        """The call ended without telling anything about the upstream (cancelled, or a bad request)."""
+        self._probing = False
+
+
+class Upstream:
+    """Retries, breaker, hedging and latency/error tracking for one API upstream."""
+
+    def __init__(self, name: str, retries: int = config.RESILIENCE_RETRIES,
+                 backoff: float = config.RESILIENCE_BACKOFF, breaker: Optional[CircuitBreaker] = None,
+                 hedge: bool = config.HEDGE_ENABLED, hedge_quantile: float = config.HEDGE_QUANTILE,
+                 hedge_min_samples: int = config.HEDGE_MIN_SAMPLES):
+        self.name = name
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)  # seconds, successful attempts
+        self.outcomes: deque = deque(maxlen=LATENCY_WINDOW)  # (monotonic time, True if the attempt failed)
+        self.calls = self.errors = self.retried = self.rejected = self.hedged = self.hedge_wins = 0
+
+    def latency(self, quantile: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def recent_outcomes(self, window: Optional[float] = None) -> List[bool]:
+        """Whether each kept attempt failed; only attempts in the last `window` seconds if given."""
+        since = time.monotonic() - window if window is not None else float("-inf")
+        return [failed for at, failed in self.outcomes if at >= since]
+
+    def error_rate(self, window: Optional[float] = None) -> float:
+        outcomes = self.recent_outcomes(window)
+        return sum(outcomes) / len(outcomes) if outcomes else 0.0
+
+    @asynccontextmanager
+    async def guard(self):
+        """
+        One attempt under the breaker: refused with CircuitOpenError while it is open,
+        and its outcome and latency recorded. For calls that cannot be retried, like streams.
+        """
+        wait = self.breaker.refuse(time.monotonic())
+        if wait is not None:
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} is failing; not calling it for {wait:.0f}s", self.name, wait)
+        started = time.monotonic()
+        try:
+            yield
+        except UpstreamError as e:
+            e.upstream = e.upstream or self.name
+            if not e.retryable:
+                self.breaker.release()  # our request was at fault, not the upstream
+                raise
+            self.errors += 1
+            self.outcomes.append((time.monotonic(), True))
+            self.breaker.failure(time.monotonic())
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.latencies.append(time.monotonic() - started)
+        self.outcomes.append((time.monotonic(), False))
+        self.breaker.success()
+
+    async def _with_retries(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        for number in range(self.retries + 1):
+            try:
+                async with self.guard():
+                    return await attempt()
+            except UpstreamError as e:
+                if not e.retryable or number >= self.retries:
+                    raise
+                delay = max(jittered_backoff(self.backoff, number), e.retry_after or 0)
+                logger.warning("%s, retrying in %.1fs (%d/%d)", e, delay, number + 1, self.retries)
+                self.retried += 1
+                await asyncio.sleep(delay)
+
+    def hedge_delay(self) -> Optional[float]:
+        """How long a call may run before it is hedged; None when hedging is off or latencies are not known yet."""
+        if not self.hedge or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return self.latency(self.hedge_quantile)
+
+    async def call(self, attempt: Callable[[], Awaitable[T]],
+                   fallback: Optional[Callable[[], Awaitable[T]]] = None, hedge: bool = True) -> T:
+        """
+        Runs `attempt` (one request, raising UpstreamError on failure) with retries.
+        If hedged, `fallback` (default: `attempt` again) races a slow first call.
+        """
+        self.calls += 1
+        delay = self.hedge_delay() if hedge else None
+        if delay is None:
+            return await self._with_retries(attempt)
+        return await self._hedged(attempt, fallback or (lambda: self._with_retries(attempt)), delay)
+
+    async def _hedged(self, attempt, second, delay):
+        first = asyncio.create_task(self._with_retries(attempt))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedged += 1
+                tasks.add(asyncio.create_task(second()))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.hedge_wins += task is not first
+                        return task.result()
+                    if task is first or error is None:
+                        error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        p50, p95 = self.latency(0.5), self.latency(0.95)
+        return {
+            "state": self.breaker.state,
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate(), 3),
+            "retries": self.retried,
+            "rejected": self.rejected,
+            "trips": self.breaker.trips,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+        }
+
+
+_upstreams: Dict[str, Upstream] = {}
+
+
+def get_upstream(name: str) -> Upstream:
+    """The process-wide Upstream for `name` (e.g. "tavily", "openrouter:<model>"), created on first use."""
+    upstream = _upstreams.get(name)
+    if upstream is None:
+        upstream = _upstreams[name] = Upstream(name)
+    return upstream
+
+
+def upstream_stats() -> Dict[str, dict]:
+    return {name: upstream.stats() for name, upstream in sorted(_upstreams.items())}
@@ -0,0 +1,79 @@
+# backend/app/db/database.py
+from typing import Optional
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+
+from app.core import config
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def _engine_kwargs(url: str) -> dict:
+    # In-memory SQLite lives on a single connection, so it gets SQLAlchemy's static pool
+    if make_url(url).database in (None, "", ":memory:"):
+        return {}
+    return {"pool_size": config.DB_POOL_SIZE, "max_overflow": config.DB_MAX_OVERFLOW, "pool_pre_ping": True}
+
+
+def _enable_wal(dbapi_connection, _record):
+    # WAL lets readers keep going while a stage result is being written
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def get_engine() -> AsyncEngine:
+    """Returns the process-wide async engine, creating it from DATABASE_URL on first use."""
+    global _engine, _sessionmaker
+    if _engine is None:
+        _engine = create_async_engine(config.DATABASE_URL, **_engine_kwargs(config.DATABASE_URL))
+        if _engine.dialect.name == "sqlite":
+            event.listen(_engine.sync_engine, "connect", _enable_wal)
+        _sessionmaker = async_sessionmaker(_engine, expire_on_commit=False)
+    return _engine
+
+
+def get_session() -> AsyncSession:
+    """New session on the shared engine; use as `async with get_session() as session:`."""
+    get_engine()
+    return _sessionmaker()
+
+
+def _add_missing_columns(connection):
+    """Adds nullable columns added to the models since a table was created (create_all skips existing tables)."""
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+
+
+async def init_db():
+    """Creates missing tables and columns; called from the app lifespan."""
+    from app.db import models  # noqa: F401  (registers the tables on Base.metadata)
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+
+
+async def close_db():
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _sessionmaker = None
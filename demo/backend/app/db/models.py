@@ -0,0 +1,183 @@
+# backend/app/db/models.py
+import time
+import uuid
+from typing import Any, List, Optional
+
+from sqlalchemy import JSON, Float, ForeignKey, Index, Integer, String, Text, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core import config
+from app.db.database import Base, get_session
+from app.scrapers.page_cache import cache_key, normalize_url
+
+OPPOSITE_PERSPECTIVE = "Opposite perspective"
+
+
+class Article(Base):
+    """A scraped article, one row per normalized URL."""
+    __tablename__ = "articles"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    url_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    url: Mapped[str] = mapped_column(Text)
+    title: Mapped[Optional[str]] = mapped_column(Text)
+    text: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[float] = mapped_column(Float, default=time.time, index=True)
+
+    analyses: Mapped[List["Analysis"]] = relationship(back_populates="article")
+
+    @classmethod
+    async def get_or_create(cls, session: AsyncSession, url: str) -> "Article":
+        url_hash = cache_key(url)
+        article = await session.scalar(select(cls).where(cls.url_hash == url_hash))
+        if article is not None:
+            return article
+        try:
+            async with session.begin_nested():
+                article = cls(url_hash=url_hash, url=normalize_url(url))
+                session.add(article)
+        except IntegrityError:
+            # Another request stored the same article first
+            article = await session.scalar(select(cls).where(cls.url_hash == url_hash))
+        return article
+
+
+class Perspective(Base):
+    __tablename__ = "perspectives"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    analysis_id: Mapped[str] = mapped_column(ForeignKey("analyses.id", ondelete="CASCADE"), index=True)
+    name: Mapped[str] = mapped_column(String(100))
+    content: Mapped[str] = mapped_column(Text)
+
+
+class Analysis(Base):
+    """
+    Stage results for one article: summary, perspectives, related topics,
+    fact-check scores and deep research. Stages fill in their columns as they run;
+    `completed_at` is set once the whole /analyze pipeline has been stored.
+    """
+    __tablename__ = "analyses"
+    __table_args__ = (Index("analyses_article_created", "article_id", "created_at"),)
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    article_id: Mapped[int] = mapped_column(ForeignKey("articles.id", ondelete="CASCADE"))
+    summary: Mapped[Optional[str]] = mapped_column(Text)
+    topics: Mapped[Optional[Any]] = mapped_column(JSON)
+    true_percentage: Mapped[Optional[int]] = mapped_column(Integer)
+    fake_percentage: Mapped[Optional[int]] = mapped_column(Integer)
+    resources: Mapped[Optional[Any]] = mapped_column(JSON)
+    claims: Mapped[Optional[Any]] = mapped_column(JSON)  # per-claim fact-check verdicts (FactCheckResult dicts)
+    research: Mapped[Optional[Any]] = mapped_column(JSON)
+    research_max_results: Mapped[Optional[int]] = mapped_column(Integer)
+    errors: Mapped[Optional[dict]] = mapped_column(JSON)
+    created_at: Mapped[float] = mapped_column(Float, default=time.time, index=True)
+    updated_at: Mapped[float] = mapped_column(Float, default=time.time, onupdate=time.time)
+    completed_at: Mapped[Optional[float]] = mapped_column(Float)
+
+    article: Mapped[Article] = relationship(back_populates="analyses", lazy="joined")
+    perspectives: Mapped[List[Perspective]] = relationship(
+        lazy="selectin", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    @property
+    def article_title(self) -> str:
+        return self.article.title or self.article.url
+
+    @property
+    def perspective(self) -> Optional[str]:
+        return next((p.content for p in self.perspectives if p.name == OPPOSITE_PERSPECTIVE), None)
+
+    @property
+    def reliability(self) -> Optional[dict]:
+        if self.true_percentage is None:
+            return None
+        return {"true_percentage": self.true_percentage, "fake_percentage": self.fake_percentage}
+
+    def to_result(self) -> dict:
+        """Same shape as run_analysis() returns, plus the analysis ID."""
+        fact_check = None
+        if self.reliability is not None:
+            fact_check = {"reliability": self.reliability, "resources": self.resources or [],
+                          "claims": self.claims or []}
+        return {
+            "analysis_id": self.id,
+            "summary": self.summary,
+            "perspective": self.perspective,
+            "topics": self.topics,
+            "fact_check": fact_check,
+            "research": self.research,
+            "errors": self.errors or {},
+        }
+
+    def fact_check_result(self, article_text: Optional[str] = None) -> dict:
+        """Same shape as run_fact_check() returns; `article_text` defaults to the stored article's."""
+        claim_results = self.claims or []
+        return {
+            "article_text": self.article.text if article_text is None else article_text,
+            "claims": [result["claim"] for result in claim_results],
+            "claim_results": claim_results,
+            "resources": self.resources or [],
+            "reliability": self.reliability,
+        }
+
+    def apply(self, title=None, text=None, perspective=None, reliability=None, **fields):
+        """Copies stage results onto the row; arguments left as None keep what is stored."""
+        if title is not None:
+            self.article.title = title
+        if text is not None:
+            self.article.text = text
+        if perspective is not None:
+            existing = next((p for p in self.perspectives if p.name == OPPOSITE_PERSPECTIVE), None)
+            if existing is None:
+                self.perspectives.append(Perspective(name=OPPOSITE_PERSPECTIVE, content=perspective))
+            else:
+                existing.content = perspective
+        if reliability is not None:
+            self.true_percentage = reliability.get("true_percentage")
+            self.fake_percentage = reliability.get("fake_percentage")
+        for key, value in fields.items():
+            if value is not None:
+                setattr(self, key, value)
+
+    @classmethod
+    async def get(cls, analysis_id: str) -> Optional["Analysis"]:
+        async with get_session() as session:
+            return await session.get(cls, analysis_id)
+
+    @classmethod
+    async def _latest(cls, session: AsyncSession, url: str, max_age: float) -> Optional["Analysis"]:
+        query = (
+            select(cls)
+            .join(cls.article)
+            .where(Article.url_hash == cache_key(url), cls.created_at > time.time() - max_age)
+            .order_by(cls.created_at.desc())
+            .limit(1)
+        )
+        return await session.scalar(query)
+
+    @classmethod
+    async def latest_for_url(cls, url: str, max_age: float = config.ANALYSIS_MAX_AGE) -> Optional["Analysis"]:
+        """Newest analysis of `url` younger than `max_age` seconds, or None."""
+        async with get_session() as session:
+            return await cls._latest(session, url, max_age)
+
+    @classmethod
+    async def record(cls, url: str, complete: bool = False, max_age: float = config.ANALYSIS_MAX_AGE,
+                     **results) -> "Analysis":
+        """
+        Stores stage results (see apply()) on the newest fresh analysis of `url`,
+        starting a new one if there is none; `complete` marks a full pipeline run.
+        """
+        async with get_session() as session:
+            analysis = await cls._latest(session, url, max_age)
+            if analysis is None:
+                analysis = cls(article=await Article.get_or_create(session, url), perspectives=[])
+                session.add(analysis)
+            analysis.apply(**results)
+            if complete:
+                analysis.completed_at = time.time()
+            await session.commit()
+            return analysis
@@ -1,9 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.routes import router
+from app.core.http_client import init_http_client, close_http_client
+from app.core.executor import init_executor, shutdown_executor
+from app.scrapers.page_cache import close_page_cache
+from app.services.llm_cache import close_llm_cache
+from app.services.keywords import close_keyword_index
+from app.services.vector_store import close_vector_store
+from app.services.checkpoints import close_checkpointer
+from app.services.job_queue import init_job_queue, close_job_queue
+from app.services.jobs import JOB_HANDLERS
+from app.db.database import init_db, close_db
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-app = FastAPI(title="Perspective AI", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client for the whole process, shared by every scraper and service
+    await init_http_client()
+    # Thread pool for the blocking parsing/cleaning steps the async routes offload
+    init_executor()
+    # Analysis storage; repeat requests for an article are served from here
+    await init_db()
+    await init_job_queue(handlers=JOB_HANDLERS)
+    yield
+    await close_job_queue()
+    await close_http_client()
+    shutdown_executor()
+    close_page_cache()
+    close_llm_cache()
+    close_keyword_index()
+    close_vector_store()
+    await close_checkpointer()
+    await close_db()
+
+
+app = FastAPI(title="Perspective AI", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,133 @@
+# backend/app/prompts/budget.py
+"""
+Prompt assembly within a per-model token budget (see token_budget in app/utils/chunking.py).
+
+A template's own text is always kept. The text sections filling its placeholders
+share what is left of the budget: a section that needs less than its share keeps
+all of it, and the remainder is split among the others in proportion to their weights.
+Long text is cut to whole leading sentences. Search results are reduced to title,
+site and snippet, ranked by relevance to the query text, deduplicated, and packed
+one line each until their share runs out.
+"""
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core import config
+from app.scrapers.page_cache import normalize_url
+from app.services.vector_store import embed
+from app.utils.chunking import estimate_tokens, leading_sentences, token_budget
+
+# Longest snippet kept per search result
+RESOURCE_SNIPPET_CHARS = 400
+
+
+def resource_line(resource: dict) -> str:
+    """One search result as "- title (site): snippet", the only fields the model needs."""
+    host = urllib.parse.urlparse(resource.get("url", "")).netloc.removeprefix("www.")
+    snippet = " ".join(str(resource.get("snippet") or resource.get("content") or "").split())
+    line = f"- {resource.get('title') or host or 'Untitled'}" + (f" ({host})" if host else "")
+    return f"{line}: {leading_sentences(snippet, RESOURCE_SNIPPET_CHARS)}" if snippet else line
+
+
+def rank_resources(resources: Sequence[dict], query: str) -> List[str]:
+    """
+    Lines for `resources`, most relevant to `query` first (cosine of hashed embeddings,
+    search rank breaking ties), without repeated URLs or near-duplicate results.
+    """
+    lines, vectors, seen = [], [], set()
+    for resource in resources:
+        key = normalize_url(resource.get("url", "")) if resource.get("url") else None
+        if key in seen:
+            continue
+        seen.add(key)
+        line = resource_line(resource)
+        vector = embed(line)
+        if any(float(vector @ kept) >= config.NEAR_DUPLICATE_THRESHOLD for kept in vectors):
+            continue
+        lines.append(line)
+        vectors.append(vector)
+    if not lines:
+        return []
+    scores = np.stack(vectors) @ embed(query)
+    return [lines[i] for i in np.argsort(-scores, kind="stable")]
+
+
+@dataclass
+class _Section:
+    name: str
+    weight: float
+    text: str = ""
+    lines: List[str] = field(default_factory=list)
+    empty: str = ""
+
+    def need(self) -> int:
+        if self.lines:
+            return sum(estimate_tokens(line) + 1 for line in self.lines)
+        return estimate_tokens(self.text or self.empty)
+
+    def fit(self, tokens: int) -> str:
+        if self.lines:
+            packed, used = [], 0
+            for line in self.lines:
+                cost = estimate_tokens(line) + 1
+                if used + cost <= tokens:
+                    packed.append(line)
+                    used += cost
+            return "\n".join(packed) or self.empty
+        if not self.text:
+            return self.empty
+        return self.text if estimate_tokens(self.text) <= tokens else leading_sentences(
+            self.text, tokens * config.CHARS_PER_TOKEN)
+
+
+class PromptBudget:
+    """
+    Fills a str.format template's placeholders within `budget` tokens (default:
+    token_budget(model)). After fill(), report() gives the estimated tokens per section.
+    """
+
+    def __init__(self, model: Optional[str] = None, budget: Optional[int] = None):
+        self.budget = budget or token_budget(model)
+        self._sections: List[_Section] = []
+        self._report: Dict[str, int] = {}
+
+    def text(self, name: str, text: str, weight: float = 1.0) -> "PromptBudget":
+        """Free text for {name}, cut to whole leading sentences if it does not fit."""
+        self._sections.append(_Section(name, weight, text=text or ""))
+        return self
+
+    def resources(self, name: str, resources: Sequence[dict], query: str, weight: float = 1.0,
+                  empty: str = "") -> "PromptBudget":
+        """Search results for {name}, most relevant to `query` first; `empty` stands in if none fit."""
+        self._sections.append(_Section(name, weight, lines=rank_resources(resources, query), empty=empty))
+        return self
+
+    def _allowances(self, available: int) -> Dict[str, int]:
+        allowances, left = {}, list(self._sections)
+        while left:
+            weights = sum(section.weight for section in left)
+            satisfied = [s for s in left if s.need() <= available * s.weight / weights]
+            if not satisfied:
+                allowances.update({s.name: int(available * s.weight / weights) for s in left})
+                break
+            for section in satisfied:
+                allowances[section.name] = section.need()
+                available -= section.need()
+                left.remove(section)
+        return allowances
+
+    def fill(self, template: str) -> str:
+        instructions = estimate_tokens(template.format(**{s.name: "" for s in self._sections}))
+        allowances = self._allowances(max(0, self.budget - instructions))
+        values = {section.name: section.fit(allowances[section.name]) for section in self._sections}
+        self._report = {"instructions": instructions}
+        self._report.update({name: estimate_tokens(value) for name, value in values.items()})
+        self._report["total"] = sum(self._report.values())
+        self._report["budget"] = self.budget
+        return template.format(**values)
+
+    def report(self) -> Dict[str, int]:
+        return dict(self._report)
@@ -1,3 +1,5 @@
+from app.prompts.budget import PromptBudget
+
 OPPOSITE_PERSPECTIVE_PROMPT = """
     You are an analytical assistant that provides comprehensive alternative viewpoints to news articles and opinion pieces. Given the article text below, create a thoughtful, balanced, and detailed opposite perspective.
 
@@ -14,8 +16,9 @@ OPPOSITE_PERSPECTIVE_PROMPT = """
 
     """
 
-def get_opposite_perspective_prompt(article_text: str) -> str:
+def get_opposite_perspective_prompt(article_text: str, model: str = None, budget: int = None) -> str:
     """
-    Formats the prompt for generating an opposite perspective by injecting the provided article text.
+    Formats the prompt for generating an opposite perspective by injecting the provided article text,
+    cut to whole leading sentences if it would exceed the model's token budget.
     """
-    return OPPOSITE_PERSPECTIVE_PROMPT.format(article_text=article_text)
\ No newline at end of file
+    return PromptBudget(model, budget).text("article_text", article_text).fill(OPPOSITE_PERSPECTIVE_PROMPT)
@@ -1,3 +1,5 @@
+from app.prompts.budget import PromptBudget
+
 RELATED_TOPICS_PROMPT = """
 You are an expert content analyst specializing in identifying nuanced and interconnected themes within articles. 
 
@@ -19,8 +21,9 @@ Output Requirements:
 Format your response as a structured list of related topics with their perspectives.
 """
 
-def get_related_topics_prompt(article_text: str) -> str:
+def get_related_topics_prompt(article_text: str, model: str = None, budget: int = None) -> str:
     """
-    Formats the prompt for generating related topics by injecting the provided article text.
+    Formats the prompt for generating related topics by injecting the provided article text,
+    cut to whole leading sentences if it would exceed the model's token budget.
     """
-    return RELATED_TOPICS_PROMPT.format(article_text=article_text)
\ No newline at end of file
+    return PromptBudget(model, budget).text("article_text", article_text).fill(RELATED_TOPICS_PROMPT)
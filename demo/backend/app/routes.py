@@ -1,21 +1,40 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
 from app.scrapers.article_scraper import scrape_website
 from app.scrapers.clean_data import clean_scraped_data
-from app.services.summarization_service import summarize_text
+from app.services.summarization_service import summarize_text, stream_summary
 import json
-from app.services.counter_service import generate_opposite_perspective
+from app.services.counter_service import generate_opposite_perspective, stream_opposite_perspective, extract_perspective
 import logging
 from typing import List, Optional
+import time
 import uuid
 from app.services.related_topics import generate_related_topics
 from app.services.deep_research import do_deep_research
 from app.services.fact_check_service import run_fact_check
+from app.services.analysis_pipeline import run_analysis, stream_analysis
+from app.services.job_queue import QueueFullError, get_job_queue
 from app.models.schemas import FactCheckRequest, FactCheckResult
+from app.core.executor import run_sync
+from app.core.http_client import get_http_client
+from app.core.resilience import UpstreamError, upstream_stats
+from app.core.config import BATCH_MAX_URLS, DEEP_RESEARCH_MAX_RESULTS, EXPORT_BATCH_MAX
+from app.scrapers.page_cache import get_page_cache
+from app.services.llm_cache import get_llm_cache
+from app.services.search import get_search_service
+from app.services.batch import get_batch_scheduler
+from app.services.model_router import get_model_router
+from app.services.analysis_store import load_analysis, load_duplicate_analysis, reuse_analysis, save_analysis
+from app.db.models import Analysis
+from app.services.export_services import FORMATS, ExportService
+from app.utils.helpers import format_ndjson, format_sse
 
 router = APIRouter()
 logger = logging.getLogger("uvicorn.error")
 
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 class ArticleRequest(BaseModel):
     summary: str  # summarized article text to generate opposite perspective
 
@@ -24,79 +43,394 @@ class ScrapURLRequest(BaseModel):
     
 class ResearchURLRequest(BaseModel):
     url: str
+    max_results: int = Field(DEEP_RESEARCH_MAX_RESULTS, ge=1, le=30)  # number of search results to research
 
 class RelatedTopicsRequest(BaseModel):
     summary: str  # Ensure this matches the frontend's request
 
+class BatchURLRequest(BaseModel):
+    urls: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_URLS)  # repeats are processed once
+
+class BatchResearchRequest(BatchURLRequest):
+    max_results: int = Field(DEEP_RESEARCH_MAX_RESULTS, ge=1, le=30)
+
+class BatchExportRequest(BaseModel):
+    analysis_ids: List[str] = Field(..., min_length=1, max_length=EXPORT_BATCH_MAX)
+    format: str = "pdf"  # one of FORMATS
+
+def _unavailable(e: UpstreamError) -> HTTPException:
+    """503 while the model or search API keeps failing, with a Retry-After when the failure tells one."""
+    logger.warning("Upstream unavailable: %s", e)
+    headers = {"Retry-After": str(max(1, round(e.retry_after)))} if e.retry_after else None
+    return HTTPException(status_code=503, detail="The AI service is unavailable, try again shortly", headers=headers)
+
 @router.post("/generate-perspective")
-def generate_ai_perspective(request: ArticleRequest):
+async def generate_ai_perspective(request: ArticleRequest):
     try:
-        new_perspective = generate_opposite_perspective(request.summary)
+        new_perspective = await generate_opposite_perspective(request.summary)
         logger.info("Generated perspective: %s", new_perspective)
         return {"perspective": new_perspective}
+    except UpstreamError as e:
+        raise _unavailable(e)
     except Exception as e:
         logger.error("Error in generate-perspective: %s", e)
         raise HTTPException(status_code=500, detail="Error generating perspective")
 
+@router.post("/generate-perspective/stream")
+async def stream_ai_perspective(request: ArticleRequest):
+    """Server-sent events: one `data: {"token": ...}` per token, then `event: done` with the perspective."""
+    async def events():
+        parts = []
+        try:
+            async for token in stream_opposite_perspective(request.summary):
+                parts.append(token)
+                yield format_sse({"token": token})
+            yield format_sse({"perspective": extract_perspective("".join(parts))}, event="done")
+        except Exception as e:
+            logger.error("Error in generate-perspective/stream: %s", e)
+            yield format_sse({"detail": "Error generating perspective"}, event="error")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+async def _summarize_url(url):
+    stored = await load_analysis(url)
+    if stored is not None and stored.summary:
+        return {"summary": stored.summary}
+
+    # Scrape the website
+    data = await scrape_website(url)
+    if data is None:
+        logger.error("Scraped data is None for URL: %s", url)
+        raise HTTPException(status_code=500, detail="Error scraping the article. No data returned.")
+    logger.debug("Scraped data: %s", data)
+
+    # Clean the data (make sure data is a string)
+    clean = await run_sync(clean_scraped_data, data)
+    logger.debug("Cleaned data: %s", clean)
+
+    duplicate = await load_duplicate_analysis(url, clean)
+    if duplicate is not None and duplicate.summary:
+        await reuse_analysis(url, clean, duplicate)
+        return {"summary": duplicate.summary}
+
+    # Summarize the text
+    summary = await summarize_text({"inputs": clean})
+    logger.debug("Summary output: %s", summary)
+    await save_analysis(url, text=clean, summary=summary)
+
+    # Return summary directly (assuming it's a JSON-serializable object)
+    return {"summary": summary}
+
+
 @router.post("/scrape-and-summarize")
 async def scrape_article(article: ScrapURLRequest):
-    print("huhuh")
     try:
         if not article.url:
             raise HTTPException(status_code=422, detail="URL is required")
-        
-        # Scrape the website
-        print(article.url)
-        data = scrape_website(article.url)
-        if data is None:
-            logger.error("Scraped data is None for URL: %s", article.url)
-            raise HTTPException(status_code=500, detail="Error scraping the article. No data returned.")
-        logger.info("Scraped data: %s", data)
-        
-        # Clean the data (make sure data is a string)
-        clean = clean_scraped_data(data)
-        print("Cleaned data: %s", clean)
-        
-        # Summarize the text
-        summary = summarize_text({"inputs": clean})
-        print("Summary output: %s", summary)
-        
-        # Return summary directly (assuming it's a JSON-serializable object)
-        return {"summary": summary}
+        return await _summarize_url(article.url)
+    except UpstreamError as e:
+        raise _unavailable(e)
     except Exception as e:
         logger.error("Error in scrape-and-summarize: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Error processing the URL")
 
 
+@router.post("/scrape-and-summarize/stream")
+async def stream_scrape_article(article: ScrapURLRequest):
+    """
+    Scrapes and cleans the article up front (so bad URLs still get a plain HTTP error),
+    then streams the summary as server-sent events like /generate-perspective/stream.
+    """
+    if not article.url:
+        raise HTTPException(status_code=422, detail="URL is required")
+    data = await scrape_website(article.url)
+    if data is None:
+        logger.error("Scraped data is None for URL: %s", article.url)
+        raise HTTPException(status_code=500, detail="Error scraping the article. No data returned.")
+    clean = await run_sync(clean_scraped_data, data)
+
+    async def events():
+        parts = []
+        try:
+            async for token in stream_summary(clean):
+                parts.append(token)
+                yield format_sse({"token": token})
+            yield format_sse({"summary": "".join(parts)}, event="done")
+        except Exception as e:
+            logger.error("Error in scrape-and-summarize/stream: %s", e)
+            yield format_sse({"detail": "Error processing the URL"}, event="error")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.post("/related-topics")
 async def get_related_topics(request: RelatedTopicsRequest):
-    related_topics = generate_related_topics(request.summary)
+    try:
+        related_topics = await generate_related_topics(request.summary)
+    except UpstreamError as e:
+        raise _unavailable(e)
     return {"topics": related_topics}
 
-@router.post("/deep-research")
-async def get_related_topics(request:ResearchURLRequest):
-    research = do_deep_research(request.url)
-    print("research")
-    print(research)
+async def _deep_research_url(url, max_results):
+    stored = await load_analysis(url)
+    if stored is not None and stored.research and stored.research_max_results == max_results:
+        return {"research": stored.research}
+    research = await do_deep_research(url, max_results=max_results)
+    logger.debug("Research: %s", research)
+    if research is not None:
+        await save_analysis(url, research=research, research_max_results=max_results)
     return {"research": research}
 
 
+@router.post("/deep-research")
+async def get_related_topics(request:ResearchURLRequest):
+    try:
+        return await _deep_research_url(request.url, request.max_results)
+    except UpstreamError as e:
+        raise _unavailable(e)
 
 
+async def _fact_check_url(url):
+    stored = await load_analysis(url)
+    if stored is not None and stored.reliability is not None:
+        return stored.fact_check_result()
+    raw_data = await scrape_website(url)
+    if raw_data is None:
+        logger.error("Scraped data is None for URL: %s", url)
+        raise HTTPException(status_code=500, detail="Error scraping the article")
+    clean_text = await run_sync(clean_scraped_data, raw_data)
+    duplicate = await load_duplicate_analysis(url, clean_text)
+    if duplicate is not None and duplicate.reliability is not None:
+        await reuse_analysis(url, clean_text, duplicate)
+        return duplicate.fact_check_result(clean_text)
+    result_state = await run_fact_check(clean_text)
+    await save_analysis(url, text=clean_text, reliability=result_state["reliability"],
+                        resources=result_state["resources"], claims=result_state["claim_results"])
+    return result_state
+
 
 @router.post("/fact-check")
 async def fact_check_article(request: FactCheckRequest):
-   
     if not request.url:
         raise HTTPException(status_code=422, detail="URL is required")
     try:
-        raw_data = scrape_website(request.url)
-        if raw_data is None:
-            logger.error("Scraped data is None for URL: %s", request.url)
-            raise HTTPException(status_code=500, detail="Error scraping the article")
-        clean_text = clean_scraped_data(raw_data)
-        result_state = run_fact_check(clean_text)
-        return result_state
+        return await _fact_check_url(request.url)
+    except UpstreamError as e:
+        raise _unavailable(e)
     except Exception as e:
         logger.error("Error in fact-check endpoint: %s", e, exc_info=True)
-        raise HTTPException(status_code=500, detail="Error processing fact check")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Error processing fact check")
+
+
+def _stream_batch(urls, work):
+    """
+    NDJSON stream of one record per distinct URL in completion order (see app/services/batch.py),
+    then a {"summary": ...} record.
+    """
+    if not all(url.strip() for url in urls):
+        raise HTTPException(status_code=422, detail="Every URL is required")
+
+    async def records():
+        started = time.perf_counter()
+        counts = {"ok": 0, "error": 0}
+        async for record in get_batch_scheduler().run(urls, work):
+            counts[record["status"]] += 1
+            yield format_ndjson(record)
+        yield format_ndjson({"summary": {"urls": len(urls), "distinct": counts["ok"] + counts["error"],
+                                         "succeeded": counts["ok"], "failed": counts["error"],
+                                         "seconds": round(time.perf_counter() - started, 3)}})
+
+    return StreamingResponse(records(), media_type="application/x-ndjson")
+
+
+@router.post("/scrape-and-summarize/batch")
+async def batch_scrape_articles(request: BatchURLRequest):
+    """Summaries for many URLs in one call, streamed as NDJSON in completion order."""
+    return _stream_batch(request.urls, _summarize_url)
+
+
+@router.post("/fact-check/batch")
+async def batch_fact_check(request: BatchURLRequest):
+    """Fact-checks for many URLs in one call, streamed as NDJSON in completion order."""
+    return _stream_batch(request.urls, _fact_check_url)
+
+
+@router.post("/deep-research/batch")
+async def batch_deep_research(request: BatchResearchRequest):
+    """Deep research for many URLs in one call, streamed as NDJSON in completion order."""
+    return _stream_batch(request.urls, lambda url: _deep_research_url(url, request.max_results))
+
+
+@router.post("/analyze")
+async def analyze_article(request: ScrapURLRequest):
+    """
+    Scrapes the article once and runs summary, perspective, related topics,
+    fact-check and deep research concurrently; returns all results together.
+    A complete analysis of the same article within ANALYSIS_MAX_AGE is served from storage,
+    and so is one of a near-duplicate article (`duplicate_of` names it).
+    """
+    if not request.url:
+        raise HTTPException(status_code=422, detail="URL is required")
+    stored = await load_analysis(request.url)
+    if stored is not None and stored.completed_at is not None:
+        return stored.to_result()
+    raw_data = await scrape_website(request.url)
+    if raw_data is None:
+        logger.error("Scraped data is None for URL: %s", request.url)
+        raise HTTPException(status_code=500, detail="Error scraping the article. No data returned.")
+    article_text = await run_sync(clean_scraped_data, raw_data)
+    duplicate = await load_duplicate_analysis(request.url, article_text)
+    if duplicate is not None and duplicate.completed_at is not None:
+        analysis = await reuse_analysis(request.url, article_text, duplicate)
+        return {**duplicate.to_result(), "analysis_id": analysis.id if analysis else None,
+                "duplicate_of": duplicate.article.url}
+    result = await run_analysis(request.url, article_text)
+    fact_check = result["fact_check"] or {}
+    analysis = await save_analysis(
+        request.url,
+        complete=not result["errors"],  # a run with failed stages is kept but not served as a whole
+        text=article_text,
+        summary=result["summary"],
+        perspective=result["perspective"],
+        topics=result["topics"],
+        reliability=fact_check.get("reliability"),
+        resources=fact_check.get("resources"),
+        claims=fact_check.get("claims"),
+        research=result["research"],
+        research_max_results=DEEP_RESEARCH_MAX_RESULTS if result["research"] else None,
+        errors=result["errors"] or {},  # {} rather than None, so errors of an earlier run are cleared
+    )
+    return {"analysis_id": analysis.id if analysis else None, **result}
+
+
+@router.post("/analyze/stream")
+async def stream_analyze_article(request: ScrapURLRequest):
+    """Same pipeline as /analyze, streamed as one server-sent event per stage as it finishes."""
+    if not request.url:
+        raise HTTPException(status_code=422, detail="URL is required")
+
+    async def events():
+        try:
+            async for stage, update in stream_analysis(request.url):
+                yield format_sse(update, event=stage)
+            yield format_sse({}, event="done")
+        except Exception as e:
+            logger.error("Error in analyze/stream: %s", e, exc_info=True)
+            yield format_sse({"detail": "Error analyzing the article"}, event="error")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+async def _submit_job(kind, params):
+    try:
+        job = await get_job_queue().submit(kind, params)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.post("/jobs/deep-research", status_code=202)
+async def submit_deep_research_job(request: ResearchURLRequest):
+    """Queues a deep-research run and returns its job ID immediately."""
+    return await _submit_job("deep-research", request.model_dump())
+
+
+@router.post("/jobs/fact-check", status_code=202)
+async def submit_fact_check_job(request: FactCheckRequest):
+    """Queues a fact-check run and returns its job ID immediately."""
+    if not request.url:
+        raise HTTPException(status_code=422, detail="URL is required")
+    return await _submit_job("fact-check", request.model_dump())
+
+
+@router.get("/jobs/stats")
+async def job_stats():
+    return get_job_queue().stats()
+
+
+@router.get("/batch-stats")
+async def batch_stats():
+    """Concurrency limits of the /batch endpoints, and the hosts and URLs they are working on now."""
+    return get_batch_scheduler().stats()
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.snapshot()
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    job = await get_job_queue().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.snapshot()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job(job_id: str):
+    """Server-sent events with the job's status/progress on every change, ending once it finishes."""
+    if await get_job_queue().get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        async for snapshot in get_job_queue().watch(job_id):
+            yield format_sse(snapshot, event=snapshot["status"])
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.get("/analyses/{analysis_id}")
+async def get_analysis(analysis_id: str):
+    analysis = await Analysis.get(analysis_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return analysis.to_result()
+
+def _check_export_format(fmt):
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=422, detail=f"Unknown format; use one of {', '.join(FORMATS)}")
+
+@router.get("/analyses/{analysis_id}/export")
+async def export_analysis(analysis_id: str, format: str = "pdf"):
+    """Renders the analysis as pdf, docx, md or json; repeat exports of unchanged content come from the render cache."""
+    _check_export_format(format)
+    rendered = await ExportService.export(analysis_id, format)
+    if rendered is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return Response(
+        rendered.content,
+        media_type=rendered.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{rendered.filename}"'},
+    )
+
+@router.post("/analyses/export")
+async def export_analyses(request: BatchExportRequest):
+    """Streams one ZIP with every requested analysis, rendered one at a time."""
+    _check_export_format(request.format)
+    return StreamingResponse(
+        ExportService.stream_zip(request.analysis_ids, request.format),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="analyses.zip"'},
+    )
+
+@router.get("/rate-limit-stats")
+async def rate_limit_stats():
+    """Outbound requests per host and the time they spent waiting for the rate limiter."""
+    limiter = get_http_client().rate_limiter
+    return limiter.stats() if limiter is not None else {"enabled": False}
+
+@router.get("/upstream-stats")
+async def get_upstream_stats():
+    """Breaker state, retries, hedges, error rate and p50/p95 latency per API upstream (one per model)."""
+    return upstream_stats()
+
+@router.get("/model-routes")
+async def model_routes():
+    """Per task: the tier it needs, the order its models are tried in now, and each model's health and latency."""
+    return get_model_router().stats()
+
+@router.get("/cache-stats")
+async def cache_stats():
+    return {"pages": get_page_cache().stats(), "llm": get_llm_cache().stats(),
+            "exports": ExportService.render_cache.stats(), "search": get_search_service().stats()}
@@ -1,23 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
 
-def scrape_website(url, headers=None):
+import httpx
+from app.scrapers.page_cache import fetch_page
+
+logger = logging.getLogger("uvicorn.error")
+
+async def scrape_website(url, headers=None):
     """
-    Scrapes the content of a website and returns the raw HTML.
+    Scrapes a website and returns the text of its main content, without navigation, ads or banners.
+    Pages come from the shared page cache, so repeat URLs skip the download and parse.
     """
     try:
-        if headers is None:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Raise an error for bad responses (4xx, 5xx)
+        page = await fetch_page(url, headers=headers)
+        return page.text
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        return soup.get_text(separator=' ', strip=True)  # Extract only readable text
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error: {e}")
+    except httpx.HTTPError as e:
+        logger.warning("Error scraping %s: %s", url, e, exc_info=True)
         return None
-
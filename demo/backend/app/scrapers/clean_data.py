@@ -1,16 +1,104 @@
 import re
+import string
+from typing import Iterable, List, Optional
+
+from app.core import config
+
+# Control and invisible formatting characters (zero-width spaces, bidi marks, BOM, soft hyphen,
+# object replacement) that leak out of HTML; whitespace controls are collapsed separately
+INVISIBLE_RE = re.compile('[\x01-\x08\x0e-\x1f\x7f-\x9f\xad\u200b-\u200f\u202a-\u202e\u2060-\u2064\ufeff\ufffc]')
+ASCII_KEPT = set(string.ascii_letters + string.digits + " .,!?")
+# Separates documents while a batch is cleaned as one string (neither whitespace nor filtered
+# by either mode); NUL never belongs in article text, so it is removed from the input first
+BATCH_SEPARATOR = "\x00"
+# Joined size per batch group; big enough to amortize the calls, small enough to stay in cache
+BATCH_GROUP_CHARS = 256 * 1024
+BATCH_SINGLE_CHARS = 16 * 1024
+
+MODES = ("ascii", "unicode")
+
+
+class TextCleaner:
+    """
+    Cleaning pipeline for scraped text, built once and reused.
+
+    Both modes collapse whitespace runs to single spaces. "unicode" keeps text in every
+    script and only drops control and invisible formatting characters; "ascii" keeps
+    letters, digits and .,!? as the original cleaner did. `lowercase` folds case.
+    """
+
+    def __init__(self, mode: str = "unicode", lowercase: bool = False):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cleaning mode {mode!r}; use one of {MODES}")
+        self.mode = mode
+        self.lowercase = lowercase
+        # Single translate pass deleting the ASCII punctuation and symbols ascii mode drops
+        self._ascii_drop = str.maketrans("", "", "".join(
+            c for c in map(chr, range(128)) if c not in ASCII_KEPT and c != BATCH_SEPARATOR
+        ))
+
+    def _clean(self, text: str) -> str:
+        # str.split() uses the same Unicode whitespace as \s and is much faster than re.sub
+        text = " ".join(text.split())
+        if self.mode == "ascii":
+            text = text.encode("ascii", "ignore").decode("ascii").translate(self._ascii_drop)
+        else:
+            text = INVISIBLE_RE.sub('', text)
+        return text.lower() if self.lowercase else text
+
+    def clean(self, raw_text: Optional[str]) -> Optional[str]:
+        if raw_text is None:
+            return None
+        return self._clean(raw_text.replace(BATCH_SEPARATOR, "")).strip()
+
+    def clean_batch(self, texts: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Cleans many documents by running the pipeline over groups of short ones joined
+        into one string (about BATCH_GROUP_CHARS each), which saves the per-call overhead
+        on large batches of short texts. None stays None.
+        """
+        texts = list(texts)
+        cleaned = {}
+        group, group_chars = [], 0
+        for index, text in enumerate(texts):
+            if text is None:
+                continue
+            if len(text) >= BATCH_SINGLE_CHARS:
+                cleaned[index] = self.clean(text)  # long documents gain nothing from joining
+                continue
+            group.append((index, text.replace(BATCH_SEPARATOR, "")))
+            group_chars += len(text)
+            if group_chars >= BATCH_GROUP_CHARS:
+                cleaned.update(self._clean_group(group))
+                group, group_chars = [], 0
+        if group:
+            cleaned.update(self._clean_group(group))
+        return [cleaned.get(index) for index in range(len(texts))]
+
+    def _clean_group(self, group):
+        joined = self._clean(BATCH_SEPARATOR.join(text for _, text in group))
+        return zip((index for index, _ in group), (part.strip() for part in joined.split(BATCH_SEPARATOR)))
+
+
+_default_cleaner: Optional[TextCleaner] = None
+
+
+def get_cleaner() -> TextCleaner:
+    """The cleaner configured by TEXT_CLEANING_MODE / TEXT_CLEANING_LOWERCASE."""
+    global _default_cleaner
+    if _default_cleaner is None:
+        _default_cleaner = TextCleaner(config.TEXT_CLEANING_MODE, config.TEXT_CLEANING_LOWERCASE)
+    return _default_cleaner
+
 
 def clean_scraped_data(raw_text):
     """
-    Cleans the scraped text by removing unwanted characters, multiple spaces, and normalizing case.
+    Cleans the scraped text by collapsing whitespace and removing unwanted characters
+    (see TextCleaner; the mode and case folding come from the config).
     """
-    if raw_text is None:
-        return None
-    
-    # Remove excessive spaces and new lines
-    clean_text = re.sub(r'\s+', ' ', raw_text).strip()
+    return get_cleaner().clean(raw_text)
 
-    # Remove special characters (keeping only letters, numbers, and spaces)
-    clean_text = re.sub(r'[^a-zA-Z0-9\s.,!?]', '', clean_text)
 
-    return clean_text.lower()  # Normalize to lowercase
\ No newline at end of file
+def clean_scraped_batch(texts):
+    """clean_scraped_data for many documents at once."""
+    return get_cleaner().clean_batch(texts)
@@ -0,0 +1,289 @@
+# backend/app/scrapers/extraction.py
+import re
+from functools import cached_property
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:  # pragma: no cover - lxml is in requirements, html.parser ships with Python
+    PARSER = "html.parser"
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Elements that never hold article text
+BOILERPLATE_TAGS = ("script", "style", "noscript", "template", "iframe", "svg", "canvas", "form",
+                    "button", "select", "nav", "footer", "aside")
+# class/id fragments of page furniture; checked on every element before scoring
+BOILERPLATE_RE = re.compile(
+    r"cookie|consent|gdpr|banner|advert|\bads?\b|\bad[-_]|sponsor|promo|newsletter|subscribe|paywall|"
+    r"social|share|sharing|related|recommend|comment|sidebar|footer|masthead|\bnav|menu|breadcrumb|"
+    r"popup|modal|overlay|outbrain|taboola|widget",
+    re.I,
+)
+POSITIVE_RE = re.compile(r"article|content|entry|main|post|story|body|text|blog|news", re.I)
+# A furniture-looking class next to one of these ("main has-sidebar") is probably the page wrapper
+MAYBE_CONTENT_RE = re.compile(r"article|body|column|content|main|story", re.I)
+NEGATIVE_RE = re.compile(r"meta|byline|caption|hidden|hide|foot|header|masthead|skip|tag|author|date", re.I)
+# <p> shorter than this is scored as noise (captions, "Advertisement", share prompts)
+MIN_PARAGRAPH_CHARS = 25
+
+
+@dataclass
+class DomainRule:
+    """
+    Site-specific extraction hints. `content_selectors` are CSS selectors tried in order for
+    the article container (skipping scoring when one matches); `remove_selectors` are dropped
+    before extraction; `extract` replaces the generic paragraph extraction altogether.
+    """
+    content_selectors: Tuple[str, ...] = ()
+    remove_selectors: Tuple[str, ...] = ()
+    extract: Optional[Callable[[BeautifulSoup], List[str]]] = None
+
+
+DOMAIN_RULES: Dict[str, DomainRule] = {}
+
+
+def register_domain_rule(domain: str, rule: DomainRule):
+    """Registers `rule` for `domain` and all of its subdomains."""
+    DOMAIN_RULES[domain.lower().lstrip(".")] = rule
+
+
+def rule_for(url: str) -> Optional[DomainRule]:
+    host = (urlsplit(url).hostname or "").lower()
+    while host:
+        rule = DOMAIN_RULES.get(host)
+        if rule is not None:
+            return rule
+        host = host.partition(".")[2]
+    return None
+
+
+# Times of India keeps the story in a dedicated container next to lots of teaser paragraphs
+register_domain_rule("indiatimes.com", DomainRule(
+    content_selectors=("div.article_content", "div.content-container", "article"),
+))
+
+
+def make_soup(html) -> BeautifulSoup:
+    """Parses with lxml when available, falling back to the stdlib parser if lxml cannot handle the input."""
+    if PARSER != "html.parser":
+        try:
+            return BeautifulSoup(html, PARSER)
+        except Exception:
+            pass
+    return BeautifulSoup(html, "html.parser")
+
+
+def extract_date(soup):
+    """Extracts published date from meta tags or visible elements."""
+    date = None
+    # Check meta tags
+    date_meta = soup.find("meta", {"property": "article:published_time"}) or \
+                soup.find("meta", {"name": "date"}) or \
+                soup.find("meta", {"itemprop": "datePublished"})
+
+    if date_meta and date_meta.get("content"):
+        date = date_meta["content"]
+
+    # Check for visible date elements
+    if not date:
+        time_tag = soup.find("time")
+        if time_tag and time_tag.get("datetime"):
+            date = time_tag["datetime"]
+        elif time_tag:
+            date = time_tag.get_text(strip=True)
+
+    return date if date else "Date not found"
+
+
+def _meta_content(soup, *attrs):
+    # One pass over the <meta> tags (normally all in <head>) instead of a tree walk per attribute
+    metas = (soup.head or soup).find_all("meta")
+    for attr in attrs:
+        (name, value), = attr.items()
+        for tag in metas:
+            if tag.get(name) == value and tag.get("content"):
+                return tag["content"].strip()
+    return ""
+
+
+def extract_title(soup):
+    """Prefers the OpenGraph title, then the page <title>, then the first <h1>."""
+    title = _meta_content(soup, {"property": "og:title"}, {"name": "twitter:title"})
+    if not title:
+        for tag in (soup.find("title"), soup.find("h1")):
+            if tag is not None and tag.get_text(strip=True):
+                title = tag.get_text(strip=True)
+                break
+    return WHITESPACE_RE.sub(' ', title).strip()
+
+
+def extract_author(soup):
+    """Author from meta tags, schema.org markup or a byline element; empty if none."""
+    author = _meta_content(soup, {"name": "author"}, {"property": "article:author"}, {"name": "byl"})
+    if not author:
+        tag = (soup.find(attrs={"itemprop": "author"}) or soup.find("a", rel="author") or
+               soup.find(class_=re.compile(r"byline|author", re.I)))
+        if tag is not None:
+            author = tag.get("content") or tag.get_text(" ", strip=True)
+    author = WHITESPACE_RE.sub(' ', author).strip()
+    return re.sub(r"^by\s+", "", author, flags=re.I)
+
+
+def _attr_text(tag):
+    return " ".join(tag.get("class") or ()) + " " + (tag.get("id") or "")
+
+
+def strip_boilerplate(soup, rule: Optional[DomainRule] = None):
+    """Removes scripts, navigation, ads, cookie banners and the like from `soup` in place."""
+    for tag in soup.find_all(BOILERPLATE_TAGS):
+        tag.decompose()
+    if rule is not None:
+        for selector in rule.remove_selectors:
+            for tag in soup.select(selector):
+                tag.decompose()
+    for tag in soup.find_all(True):
+        if tag.decomposed or tag.name in ("html", "body", "article", "main"):
+            continue
+        if not tag.attrs:
+            continue
+        attrs = _attr_text(tag)
+        if BOILERPLATE_RE.search(attrs) and not MAYBE_CONTENT_RE.search(attrs):
+            tag.decompose()
+
+
+def _paragraph_texts(root):
+    paragraphs = (WHITESPACE_RE.sub(' ', p.get_text()).strip() for p in root.find_all("p"))
+    return [p for p in paragraphs if p]
+
+
+def _class_weight(tag):
+    attrs = _attr_text(tag)
+    weight = 0
+    if POSITIVE_RE.search(attrs):
+        weight += 25
+    if NEGATIVE_RE.search(attrs):
+        weight -= 25
+    return weight
+
+
+def _link_density(tag):
+    text_length = len(tag.get_text(strip=True)) or 1
+    link_length = sum(len(a.get_text(strip=True)) for a in tag.find_all("a"))
+    return link_length / text_length
+
+
+def best_content_node(soup):
+    """
+    Readability-style scoring: every substantial <p> credits its parent fully and its
+    grandparent by half (more for commas and length); the total is adjusted for
+    class/id hints and discounted by link density. Returns None if nothing qualifies.
+    """
+    scores = {}
+    for p in soup.find_all("p"):
+        text = p.get_text(strip=True)
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        for ancestor, share in ((p.parent, 1.0), (p.parent.parent if p.parent else None, 0.5)):
+            if ancestor is None or ancestor.name in ("[document]", "html"):
+                continue
+            if id(ancestor) not in scores:
+                scores[id(ancestor)] = [ancestor, _class_weight(ancestor)]
+            scores[id(ancestor)][1] += score * share
+    if not scores:
+        return None
+    best, best_score = None, 0.0
+    for node, score in scores.values():
+        score *= 1 - _link_density(node)
+        if score > best_score:
+            best, best_score = node, score
+    return best
+
+
+def find_content(soup, url):
+    """
+    Returns (root, paragraphs) for the main article content: the domain rule's container
+    if one matches, else the highest scoring node, else every <p> left after boilerplate
+    removal (root is then the whole document). Prunes `soup` in place.
+    """
+    rule = rule_for(url)
+    if rule is not None and rule.extract is not None:
+        return soup, rule.extract(soup)
+    strip_boilerplate(soup, rule)
+    root = None
+    if rule is not None:
+        root = next((soup.select_one(s) for s in rule.content_selectors if soup.select_one(s)), None)
+    if root is None:
+        root = best_content_node(soup)
+    paragraphs = _paragraph_texts(root) if root is not None else []
+    if not paragraphs:
+        root, paragraphs = soup, _paragraph_texts(soup)
+    return root, paragraphs
+
+
+class ParsedDocument:
+    """
+    A page parsed once and shared by everything that reads it. Title, date, author,
+    paragraphs, text and links are each computed on first access and memoized.
+    Metadata is always read from the unpruned tree, whichever property is asked for first.
+    """
+
+    def __init__(self, html, url):
+        self.html = html
+        self.url = url
+
+    @cached_property
+    def soup(self):
+        return make_soup(self.html)
+
+    @cached_property
+    def title(self):
+        return extract_title(self.soup)
+
+    @cached_property
+    def date(self):
+        return extract_date(self.soup)
+
+    @cached_property
+    def author(self):
+        return extract_author(self.soup)
+
+    @cached_property
+    def _content(self):
+        # Boilerplate stripping removes elements the metadata may live in, so capture it first
+        self.title, self.date, self.author
+        return find_content(self.soup, self.url)
+
+    @property
+    def paragraphs(self):
+        return self._content[1]
+
+    @cached_property
+    def text(self):
+        """The main-content paragraphs, or the visible body text if the page has none."""
+        text = "\n\n".join(self.paragraphs)
+        if not text:
+            text = (self.soup.body or self.soup).get_text(separator=' ', strip=True)
+        return text
+
+    @cached_property
+    def links(self):
+        """Absolute http(s) URLs linked from the main content, in order and without duplicates."""
+        links = (urljoin(self.url, a["href"].strip()) for a in self._content[0].find_all("a", href=True))
+        return list(dict.fromkeys(link for link in links if link.startswith(("http://", "https://"))))
+
+    def extract(self):
+        """Everything the page cache stores for a page."""
+        return {"title": self.title, "date": self.date, "author": self.author,
+                "paragraphs": self.paragraphs, "text": self.text, "links": self.links}
+
+
+def extract_page(html, url):
+    """Parses the page once and extracts everything the scrapers and services use."""
+    return ParsedDocument(html, url).extract()
@@ -0,0 +1,163 @@
+# backend/app/scrapers/html_fetcher.py
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from app.core import config
+from app.core.http_client import RETRY_STATUS_CODES, get_http_client
+from app.scrapers.extraction import MIN_PARAGRAPH_CHARS
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - without lxml the fetch just never stops early
+    etree = None
+
+logger = logging.getLogger("uvicorn.error")
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+
+class FetchError(httpx.HTTPError):
+    """A page fetch refused or abandoned by the fetcher's own limits."""
+
+
+class UnsupportedContentType(FetchError):
+    pass
+
+
+class FetchDeadlineExceeded(FetchError):
+    pass
+
+
+@dataclass
+class FetchedHTML:
+    url: str
+    status_code: int
+    headers: httpx.Headers
+    html: str = ""
+    content_hash: str = ""
+    size: int = 0
+    # Why reading stopped before the end of the body: "max_bytes", "enough_text", "deadline" or None
+    truncated: Optional[str] = None
+
+
+class _ArticleTextCounter:
+    """Incremental lxml parse of the body as it arrives, counting text in substantial <p> elements."""
+
+    def __init__(self):
+        self.chars = 0
+        self._parser = etree.HTMLPullParser(events=("end",), tag="p") if etree is not None else None
+
+    def feed(self, data: bytes):
+        if self._parser is None:
+            return
+        try:
+            self._parser.feed(data)
+            for _, element in self._parser.read_events():
+                text = "".join(element.itertext()).strip()
+                if len(text) >= MIN_PARAGRAPH_CHARS:
+                    self.chars += len(text)
+                element.clear(keep_tail=True)
+        except etree.LxmlError:
+            self._parser = None  # give up on early stopping, keep downloading
+
+
+def _is_html(content_type: str) -> bool:
+    # Servers that send no Content-Type get the benefit of the doubt
+    return not content_type or content_type.split(";")[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+class _Body:
+    """Chunks read so far and why reading stopped early, if it did."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.truncated = None
+
+    async def read(self, url, response, max_bytes, enough_text):
+        content_type = response.headers.get("Content-Type", "")
+        if not _is_html(content_type):
+            raise UnsupportedContentType(f"Not an HTML page ({content_type}): {url}")
+        counter = _ArticleTextCounter()
+        async for chunk in response.aiter_bytes():
+            if self.size + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - self.size]
+                self.truncated = "max_bytes"
+            self.chunks.append(chunk)
+            self.size += len(chunk)
+            if self.truncated:
+                return
+            counter.feed(chunk)
+            if counter.chars >= enough_text:
+                self.truncated = "enough_text"
+                return
+
+
+async def fetch_html(
+    url: str,
+    headers: Optional[dict] = None,
+    deadline: Optional[float] = None,
+    max_bytes: int = config.FETCH_MAX_BYTES,
+    enough_text: int = config.FETCH_ENOUGH_TEXT_CHARS,
+) -> FetchedHTML:
+    """
+    Streams a page body in chunks instead of buffering the whole response.
+
+    Non-HTML responses are rejected from their headers, before any body is read.
+    Reading stops at `max_bytes`, once `enough_text` characters of paragraph text
+    have arrived, or when `deadline` seconds (the whole fetch, connect included)
+    run out; whatever arrived by then is returned with `truncated` saying why.
+    A deadline hit before any body arrived raises FetchDeadlineExceeded.
+    Connection errors and 429/5xx answers are retried while no body has been read,
+    after Retry-After if the site sends one.
+    """
+    client = get_http_client()
+    deadline = config.FETCH_DEADLINE if deadline is None else deadline
+    body = _Body()
+    status_code, response_headers, encoding = 0, httpx.Headers(), None
+    try:
+        async with asyncio.timeout(deadline):
+            attempt = 0
+            while True:
+                retry_headers = None
+                try:
+                    async with client.stream("GET", url, headers=headers) as response:
+                        status_code, response_headers = response.status_code, response.headers
+                        encoding = response.encoding
+                        if response.status_code in RETRY_STATUS_CODES and attempt < client.retries:
+                            logger.warning("HTTP %s from %s, retrying (%d/%d)",
+                                           response.status_code, url, attempt + 1, client.retries)
+                            retry_headers = response.headers
+                        else:
+                            if response.status_code != 304:
+                                response.raise_for_status()
+                                await body.read(url, response, max_bytes, enough_text)
+                            break
+                except httpx.TransportError as e:
+                    if body.size or attempt >= client.retries:
+                        raise
+                    logger.warning("%s for %s, retrying (%d/%d)", type(e).__name__, url, attempt + 1, client.retries)
+                await client.pause(url, attempt, retry_headers)
+                attempt += 1
+    except TimeoutError:
+        if not body.size:
+            raise FetchDeadlineExceeded(f"No content from {url} within {deadline}s")
+        body.truncated = "deadline"
+
+    if body.truncated:
+        logger.info("Stopped reading %s after %d bytes (%s)", url, body.size, body.truncated)
+    data = b"".join(body.chunks)
+    return FetchedHTML(
+        url=url,
+        status_code=status_code,
+        headers=response_headers,
+        html=data.decode(encoding or "utf-8", errors="replace"),
+        content_hash=hashlib.sha256(data).hexdigest() if data else "",
+        size=body.size,
+        truncated=body.truncated,
+    )
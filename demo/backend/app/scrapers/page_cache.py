@@ -0,0 +1,276 @@
+# backend/app/scrapers/page_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core import config
+from app.core.executor import run_sync
+from app.scrapers.extraction import ParsedDocument
+from app.scrapers.html_fetcher import fetch_html
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "ocid", "cmpid")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# Reasons fetch_html stops early that leave a partial page, which is not cached ("enough_text" is a full article)
+PARTIAL_BODY = ("deadline", "max_bytes")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for cache keys: lower-case scheme and host, no default
+    port, no fragment, no tracking parameters and a sorted query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+@dataclass
+class CachedPage:
+    """A fetched page: raw HTML, what we extract from it, its HTTP validators and any early stop of the download."""
+    url: str
+    html: str
+    text: str
+    title: str
+    date: str
+    author: str = ""
+    paragraphs: List[str] = field(default_factory=list)
+    links: List[str] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: str = ""
+    fetched_at: float = 0.0
+    truncated: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return (len(self.html) + len(self.text) + sum(len(p) for p in self.paragraphs)
+                + sum(len(link) for link in self.links))
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+
+class _DiskTier:
+    """SQLite-backed second tier that survives restarts, evicting least recently used pages past max_bytes."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "pages.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, payload BLOB NOT NULL, size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._db.execute("SELECT payload FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return CachedPage(**json.loads(zlib.decompress(row[0])))
+
+    def put(self, key: str, page: CachedPage):
+        payload = zlib.compress(json.dumps(asdict(page)).encode())
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (key, payload, size, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time()),
+            )
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            while total > self.max_bytes:
+                oldest = self._db.execute(
+                    "SELECT key, size FROM pages ORDER BY accessed_at LIMIT 1"
+                ).fetchone()
+                if oldest is None or oldest[0] == key:
+                    break
+                self._db.execute("DELETE FROM pages WHERE key = ?", (oldest[0],))
+                total -= oldest[1]
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class PageCache:
+    """
+    Cache of scraped pages keyed by normalized URL.
+
+    Pages are served from memory (LRU, bounded by entry count and bytes) or from the
+    optional on-disk tier while younger than `ttl`. Stale pages are revalidated with
+    If-None-Match / If-Modified-Since, so an unchanged article costs a 304 instead of a
+    full download and parse. Concurrent misses for the same URL share a single fetch.
+    """
+
+    def __init__(
+        self,
+        ttl: float = config.PAGE_CACHE_TTL,
+        max_entries: int = config.PAGE_CACHE_MAX_ENTRIES,
+        max_bytes: int = config.PAGE_CACHE_MAX_BYTES,
+        directory: Optional[str] = config.PAGE_CACHE_DIR,
+        max_disk_bytes: int = config.PAGE_CACHE_DISK_MAX_BYTES,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._disk = _DiskTier(directory, max_disk_bytes) if directory else None
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.coalesced = 0
+        self.partial = 0
+
+    def _remember(self, key: str, page: CachedPage):
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key).size
+        self._entries[key] = page
+        self._bytes += page.size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    async def _lookup(self, key: str) -> Optional[CachedPage]:
+        page = self._entries.get(key)
+        if page is not None:
+            self._entries.move_to_end(key)
+            return page
+        if self._disk is not None:
+            page = await run_sync(self._disk.get, key)
+            if page is not None:
+                self._remember(key, page)
+        return page
+
+    async def _store(self, key: str, page: CachedPage):
+        self._remember(key, page)
+        if self._disk is not None:
+            await run_sync(self._disk.put, key, page)
+
+    async def fetch(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None) -> CachedPage:
+        """
+        Returns the page for `url`, from cache when fresh; raises httpx errors like a plain GET.
+        `timeout` bounds the whole download (see fetch_html for the size and content-type limits).
+        """
+        key = cache_key(url)
+        page = await self._lookup(key)
+        if page is not None and page.is_fresh(self.ttl):
+            self.hits += 1
+            return page
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._fetch(url, key, page, headers, timeout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._fetch_done(key, t))
+        # Shielded so one caller going away does not cancel the fetch the others wait on
+        return await asyncio.shield(task)
+
+    def _fetch_done(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark as retrieved even if every waiter has gone away
+
+    async def _fetch(self, url, key, stale, headers, timeout) -> CachedPage:
+        request_headers = dict(headers or {})
+        if stale is not None:
+            if stale.etag:
+                request_headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                request_headers["If-Modified-Since"] = stale.last_modified
+        response = await fetch_html(url, headers=request_headers or None, deadline=timeout)
+        if response.status_code == 304 and stale is not None:
+            self.revalidations += 1
+            stale.fetched_at = time.time()
+            stale.etag = response.headers.get("ETag", stale.etag)
+            stale.last_modified = response.headers.get("Last-Modified", stale.last_modified)
+            await self._store(key, stale)
+            return stale
+
+        html = response.html
+        # The one parse of this page; every consumer reads the fields extracted here
+        extracted = await run_sync(ParsedDocument(html, url).extract)
+        page = CachedPage(
+            url=url,
+            html=html,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_hash=response.content_hash,
+            fetched_at=time.time(),
+            truncated=response.truncated,
+            **extracted,
+        )
+        if page.truncated in PARTIAL_BODY:
+            # Serve the partial page to this caller, but let the next one try for the whole of it
+            self.partial += 1
+        else:
+            await self._store(key, page)
+        return page
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "coalesced": self.coalesced,
+            "partial": self.partial,
+        }
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+
+
+_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> PageCache:
+    """Returns the process-wide page cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = PageCache()
+    return _cache
+
+
+def close_page_cache():
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+
+
+async def fetch_page(url: str, headers: Optional[dict] = None, timeout: Optional[float] = None) -> CachedPage:
+    """Fetches a page through the shared cache."""
+    return await get_page_cache().fetch(url, headers=headers, timeout=timeout)
@@ -0,0 +1,135 @@
+# backend/app/services/analysis_pipeline.py
+import logging
+import operator
+from typing import Annotated, Any, AsyncIterator, Optional, Tuple
+
+from typing_extensions import TypedDict
+from langgraph.graph import StateGraph, START, END
+
+from app.core.executor import run_sync
+from app.scrapers.article_scraper import scrape_website
+from app.scrapers.clean_data import clean_scraped_data
+from app.services.counter_service import generate_opposite_perspective
+from app.services.deep_research import do_deep_research
+from app.services.fact_check_service import run_fact_check
+from app.services.related_topics import generate_related_topics
+from app.services.summarization_service import summarize_text
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class AnalysisState(TypedDict, total=False):
+    url: str
+    article_text: str
+    summary: str
+    perspective: str
+    topics: Any
+    fact_check: dict
+    research: dict
+    # Parallel stages report failures side by side, so updates are merged rather than overwritten
+    errors: Annotated[dict, operator.or_]
+
+
+def _guarded(stage, node):
+    """Wraps a node so a failing stage is recorded in `errors` instead of aborting the whole graph."""
+    async def run(state: AnalysisState) -> dict:
+        try:
+            return await node(state)
+        except Exception as e:
+            logger.error("Analysis stage %s failed: %s", stage, e, exc_info=True)
+            return {"errors": {stage: str(e)}}
+    return run
+
+
+async def fetch_article(state: AnalysisState) -> dict:
+    """Scrapes and cleans the article once for every downstream stage, unless the caller already did."""
+    if state.get("article_text") is not None:
+        return {}
+    raw = await scrape_website(state["url"])
+    if raw is None:
+        return {"errors": {"fetch_article": "Error scraping the article. No data returned."}}
+    return {"article_text": await run_sync(clean_scraped_data, raw)}
+
+
+async def summarize(state: AnalysisState) -> dict:
+    return {"summary": await summarize_text({"inputs": state["article_text"]})}
+
+
+async def perspective(state: AnalysisState) -> dict:
+    return {"perspective": await generate_opposite_perspective(state["summary"])}
+
+
+async def related_topics(state: AnalysisState) -> dict:
+    return {"topics": await generate_related_topics(state["summary"], state["url"])}
+
+
+async def fact_check(state: AnalysisState) -> dict:
+    result = await run_fact_check(state["article_text"])
+    return {"fact_check": {"reliability": result["reliability"], "resources": result["resources"],
+                           "claims": result["claim_results"]}}
+
+
+async def deep_research(state: AnalysisState) -> dict:
+    # Reads the article through the page cache, so this is not a second download
+    return {"research": await do_deep_research(state["url"])}
+
+
+def after_fetch(state: AnalysisState):
+    if not state.get("article_text"):
+        return END
+    return ["summary_branch", "fact_check", "deep_research"]
+
+
+def after_summary(state: AnalysisState):
+    if not state.get("summary"):
+        return END
+    return ["perspective", "related_topics"]
+
+
+# The summary branch is its own graph so perspective/related topics start as soon as the
+# summary is ready, instead of waiting for fact-check and deep research to finish their step.
+summary_builder = StateGraph(AnalysisState)
+summary_builder.add_node("summarize", _guarded("summarize", summarize))
+summary_builder.add_node("perspective", _guarded("perspective", perspective))
+summary_builder.add_node("related_topics", _guarded("related_topics", related_topics))
+summary_builder.add_edge(START, "summarize")
+summary_builder.add_conditional_edges("summarize", after_summary, ["perspective", "related_topics", END])
+summary_builder.add_edge("perspective", END)
+summary_builder.add_edge("related_topics", END)
+summary_graph = summary_builder.compile()
+
+# fetch -> {summary branch (summarize -> {perspective, related_topics}), fact_check, deep_research}
+graph_builder = StateGraph(AnalysisState)
+graph_builder.add_node("fetch_article", _guarded("fetch_article", fetch_article))
+graph_builder.add_node("summary_branch", summary_graph)
+graph_builder.add_node("fact_check", _guarded("fact_check", fact_check))
+graph_builder.add_node("deep_research", _guarded("deep_research", deep_research))
+graph_builder.add_edge(START, "fetch_article")
+graph_builder.add_conditional_edges("fetch_article", after_fetch, ["summary_branch", "fact_check", "deep_research", END])
+for stage in ("summary_branch", "fact_check", "deep_research"):
+    graph_builder.add_edge(stage, END)
+
+graph = graph_builder.compile()
+
+RESULT_KEYS = ("summary", "perspective", "topics", "fact_check", "research", "errors")
+
+
+async def run_analysis(url: str, article_text: Optional[str] = None) -> dict:
+    """
+    Runs the whole pipeline and returns every stage's result in one object.
+    `article_text`, if given, is the already scraped and cleaned article.
+    """
+    state = {"url": url, "errors": {}}
+    if article_text is not None:
+        state["article_text"] = article_text
+    final_state = await graph.ainvoke(state)
+    return {key: final_state.get(key) for key in RESULT_KEYS}
+
+
+async def stream_analysis(url: str) -> AsyncIterator[Tuple[str, dict]]:
+    """Yields (stage, update) pairs as each stage finishes, in completion order."""
+    async for _, chunk in graph.astream({"url": url, "errors": {}}, stream_mode="updates", subgraphs=True):
+        for stage, update in chunk.items():
+            if stage == "summary_branch":
+                continue  # its stages were already reported individually from inside the subgraph
+            yield stage, {key: value for key, value in (update or {}).items() if key != "article_text"}
@@ -0,0 +1,75 @@
+# backend/app/services/analysis_store.py
+"""
+Stored analyses in front of the LLM pipeline. A storage problem is logged and
+treated as a miss, so the routes fall back to computing the result.
+Article texts saved here are also added to the local vector store, so a later
+near-duplicate of the article (same story, other URL) can reuse its analysis.
+"""
+import logging
+from typing import Optional
+
+from app.core.executor import run_sync
+from app.db.models import Analysis
+from app.services.vector_store import find_near_duplicate, index_article
+
+logger = logging.getLogger("uvicorn.error")
+
+
+async def load_analysis(url: str) -> Optional[Analysis]:
+    """Newest analysis of `url` still within ANALYSIS_MAX_AGE, or None."""
+    try:
+        return await Analysis.latest_for_url(url)
+    except Exception as e:
+        logger.error("Error loading stored analysis for %s: %s", url, e, exc_info=True)
+        return None
+
+
+async def save_analysis(url: str, **results) -> Optional[Analysis]:
+    """Records stage results for `url` (see Analysis.record); returns None if it could not be stored."""
+    try:
+        analysis = await Analysis.record(url, **results)
+    except Exception as e:
+        logger.error("Error storing analysis for %s: %s", url, e, exc_info=True)
+        return None
+    if results.get("text"):
+        try:
+            await run_sync(index_article, url, results["text"], results.get("title") or "")
+        except Exception as e:
+            logger.error("Error indexing %s in the vector store: %s", url, e, exc_info=True)
+    return analysis
+
+
+async def load_duplicate_analysis(url: str, text: str) -> Optional[Analysis]:
+    """
+    Stored analysis of another article whose text is a near-duplicate of `text`
+    (at least NEAR_DUPLICATE_THRESHOLD similar), or None.
+    """
+    try:
+        match = await run_sync(find_near_duplicate, url, text)
+        if match is None:
+            return None
+        analysis = await Analysis.latest_for_url(match.url)
+    except Exception as e:
+        logger.error("Error looking up near-duplicates of %s: %s", url, e, exc_info=True)
+        return None
+    if analysis is not None:
+        logger.info("Reusing the analysis of %s for near-duplicate %s (similarity %.3f)", match.url, url, match.score)
+    return analysis
+
+
+async def reuse_analysis(url: str, text: str, source: Analysis) -> Optional[Analysis]:
+    """Stores the results of `source`, a near-duplicate's analysis, as the analysis of `url`."""
+    return await save_analysis(
+        url,
+        complete=source.completed_at is not None,
+        text=text,
+        summary=source.summary,
+        perspective=source.perspective,
+        topics=source.topics,
+        reliability=source.reliability,
+        resources=source.resources,
+        claims=source.claims,
+        research=source.research,
+        research_max_results=source.research_max_results,
+        errors=source.errors or {},
+    )
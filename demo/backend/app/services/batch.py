@@ -0,0 +1,103 @@
+# backend/app/services/batch.py
+"""
+Scheduling for the batch endpoints (/scrape-and-summarize/batch and friends).
+
+A batch runs one unit of work per distinct URL; repeats of a URL in the same batch
+share its result. Work is limited at two levels, and both limits hold across every
+batch in flight: at most BATCH_PER_HOST_CONCURRENCY items per site, so one batch
+full of links to one outlet does not hammer it, and at most BATCH_CONCURRENCY items
+overall. An item waits for its site's slot before taking a global one, so a queue
+for one busy site does not hold back the others. Results come back in completion
+order, one dict per distinct URL.
+"""
+import asyncio
+import logging
+import time
+import urllib.parse
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from app.core import config
+from app.scrapers.page_cache import normalize_url
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class BatchScheduler:
+    """Global and per-site concurrency limits shared by every batch."""
+
+    def __init__(self, concurrency: int = config.BATCH_CONCURRENCY,
+                 per_host: int = config.BATCH_PER_HOST_CONCURRENCY):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self._slots = asyncio.Semaphore(concurrency)
+        self._hosts: Dict[str, list] = {}  # host -> [semaphore, items using or waiting for it]
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str):
+        entry = self._hosts.setdefault(host, [asyncio.Semaphore(self.per_host), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._hosts[host]
+
+    async def _run_one(self, url: str, work: Callable[[str], Awaitable[Any]]) -> dict:
+        host = urllib.parse.urlsplit(url).hostname or ""
+        started = time.perf_counter()
+        try:
+            async with self._host_slot(host), self._slots:
+                started = time.perf_counter()  # time spent on the URL, not waiting for a slot
+                result = await work(url)
+            return {"status": "ok", "result": result, "seconds": round(time.perf_counter() - started, 3)}
+        except Exception as e:
+            detail = getattr(e, "detail", None)  # an HTTPException from the route's own per-URL handler
+            if detail is None:
+                logger.error("Batch item %s failed: %s", url, e, exc_info=True)
+            return {"status": "error", "error": detail or "Error processing the URL",
+                    "seconds": round(time.perf_counter() - started, 3)}
+
+    async def run(self, urls: Sequence[str], work: Callable[[str], Awaitable[Any]]) -> AsyncIterator[dict]:
+        """
+        Yields {"url", "indices", "status", "result" or "error", "seconds"} per distinct URL
+        as each finishes; `indices` are the URL's positions in `urls`. Work still running
+        when the caller stops iterating (e.g. the client disconnected) is cancelled.
+        """
+        positions: Dict[str, List[int]] = {}
+        first: Dict[str, str] = {}
+        for index, url in enumerate(urls):
+            key = normalize_url(url)
+            positions.setdefault(key, []).append(index)
+            first.setdefault(key, url)
+
+        async def item(key):
+            return {"url": first[key], "indices": positions[key], **await self._run_one(first[key], work)}
+
+        tasks = [asyncio.create_task(item(key)) for key in positions]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "per_host": self.per_host,
+            "hosts": len(self._hosts),
+            "waiting_or_running": sum(users for _, users in self._hosts.values()),
+        }
+
+
+_scheduler: Optional[BatchScheduler] = None
+
+
+def get_batch_scheduler() -> BatchScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = BatchScheduler()
+    return _scheduler
@@ -0,0 +1,134 @@
+# backend/app/services/checkpoints.py
+"""
+Checkpoint storage for the fact-check graph.
+
+Every fact-check runs on its own thread, so concurrent runs never read each other's
+state. A run that completes deletes its checkpoints. A run that fails or is
+interrupted keeps them, so calling it again with the same thread id resumes after
+the last finished node instead of searching again. Those leftovers expire after
+FACT_CHECK_CHECKPOINT_TTL. The in-memory saver also keeps at most
+FACT_CHECK_CHECKPOINT_MAX_THREADS threads. The SQLite saver survives restarts, which
+lets re-queued jobs resume.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+
+try:
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+except ImportError:  # optional: only needed for FACT_CHECK_CHECKPOINTER=sqlite
+    AsyncSqliteSaver = None
+
+from app.core import config
+
+logger = logging.getLogger("uvicorn.error")
+
+BACKENDS = ("memory", "sqlite")
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    InMemorySaver that forgets whole threads: each is dropped `ttl` seconds after its
+    last write, and the least recently written ones go first beyond `max_threads`.
+    """
+
+    def __init__(self, max_threads: int = config.FACT_CHECK_CHECKPOINT_MAX_THREADS,
+                 ttl: float = config.FACT_CHECK_CHECKPOINT_TTL):
+        super().__init__()
+        self.max_threads = max_threads
+        self.ttl = ttl
+        self._written: "OrderedDict[str, float]" = OrderedDict()  # thread id -> last write, oldest first
+        self.evicted = 0
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        self._touch(config["configurable"]["thread_id"])
+        return saved
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        super().put_writes(config, writes, task_id, task_path)
+        self._touch(config["configurable"]["thread_id"])
+
+    def delete_thread(self, thread_id):
+        super().delete_thread(thread_id)
+        self._written.pop(thread_id, None)
+
+    def _touch(self, thread_id: str):
+        now = time.monotonic()
+        self._written[thread_id] = now
+        self._written.move_to_end(thread_id)
+        while self._written:
+            oldest, written = next(iter(self._written.items()))
+            if len(self._written) <= self.max_threads and now - written < self.ttl:
+                break
+            self.delete_thread(oldest)
+            self.evicted += 1
+
+    @property
+    def threads(self) -> int:
+        # Not __len__: LangGraph tests the checkpointer for truth, and an empty saver would count as none
+        return len(self._written)
+
+
+async def prune_expired(saver: BaseCheckpointSaver, ttl: float) -> int:
+    """Deletes every thread whose latest checkpoint is older than `ttl` seconds; returns how many."""
+    cutoff = datetime.now(timezone.utc).timestamp() - ttl
+    latest = {}
+    async for item in saver.alist(None):
+        thread_id = item.config["configurable"]["thread_id"]
+        written = datetime.fromisoformat(item.checkpoint["ts"]).timestamp()
+        latest[thread_id] = max(written, latest.get(thread_id, written))
+    expired = [thread_id for thread_id, written in latest.items() if written < cutoff]
+    for thread_id in expired:
+        await saver.adelete_thread(thread_id)
+    return len(expired)
+
+
+_saver: Optional[BaseCheckpointSaver] = None
+_connection = None
+_pruned_at: Optional[float] = None
+_lock = asyncio.Lock()
+
+
+async def get_checkpointer() -> BaseCheckpointSaver:
+    """
+    Returns the process-wide saver for FACT_CHECK_CHECKPOINTER, opening it on first use.
+    Expired SQLite threads are pruned at most once per FACT_CHECK_CHECKPOINT_TTL.
+    """
+    global _saver, _connection, _pruned_at
+    async with _lock:
+        if _saver is None:
+            backend = config.FACT_CHECK_CHECKPOINTER
+            if backend == "sqlite" and AsyncSqliteSaver is None:
+                logger.warning("langgraph-checkpoint-sqlite is not installed; fact-check checkpoints stay in memory")
+                backend = "memory"
+            elif backend not in BACKENDS:
+                logger.warning("Unknown FACT_CHECK_CHECKPOINTER %r; using memory", backend)
+                backend = "memory"
+            if backend == "sqlite":
+                _connection = await aiosqlite.connect(config.FACT_CHECK_CHECKPOINT_PATH)
+                _saver = AsyncSqliteSaver(_connection)
+                await _saver.setup()
+            else:
+                _saver = BoundedMemorySaver()
+        due = _pruned_at is None or time.monotonic() - _pruned_at >= config.FACT_CHECK_CHECKPOINT_TTL
+        if due and not isinstance(_saver, BoundedMemorySaver):  # the in-memory saver evicts as it goes
+            _pruned_at = time.monotonic()
+            pruned = await prune_expired(_saver, config.FACT_CHECK_CHECKPOINT_TTL)
+            if pruned:
+                logger.info("Pruned %d expired fact-check threads", pruned)
+        return _saver
+
+
+async def close_checkpointer():
+    global _saver, _connection, _pruned_at
+    if _connection is not None:
+        await _connection.close()
+    _saver, _connection, _pruned_at = None, None, None
@@ -1,38 +1,32 @@
 
-import requests
 from app.prompts.opposite_perspective import get_opposite_perspective_prompt
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-API_KEY = os.getenv("API_KEY")
-
-
-def generate_opposite_perspective(article_text):
-    PERSPECTIVE_URL = "https://openrouter.ai/api/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    final_prompt = get_opposite_perspective_prompt(article_text)
-    
-    payload = {
-        "model": "deepseek/deepseek-r1-zero:free",
-        "messages": [
-            {
-                "role": "user", 
-                "content": final_prompt
-            }
-        ],
-    }
-    
-    response = requests.post(PERSPECTIVE_URL, headers=headers, json=payload)
-    result = response.json()['choices'][0]['message']['content']
-    
+from app.services.llm_gateway import get_llm_gateway
+from app.services.model_router import get_model_router
+
+TASK = "perspective"  # model route, see app/services/model_router.py
+
+
+def build_perspective_messages(article_text):
+    return [
+        {
+            "role": "user", 
+            "content": get_opposite_perspective_prompt(article_text, budget=get_model_router().token_budget(TASK))
+        }
+    ]
+
+
+def extract_perspective(result):
     if "Opposite Perspective:" in result:
-        perspective = result.split("Opposite Perspective:")[-1].strip()
-    else:
-        perspective = result.strip()
-    
-    return perspective
+        return result.split("Opposite Perspective:")[-1].strip()
+    return result.strip()
+
+
+async def generate_opposite_perspective(article_text):
+    result = await get_llm_gateway().complete(build_perspective_messages(article_text), task=TASK)
+    return extract_perspective(result)
+
+
+async def stream_opposite_perspective(article_text):
+    """Yields the raw perspective completion token by token; apply extract_perspective to the joined text."""
+    async for token in get_llm_gateway().stream(build_perspective_messages(article_text), task=TASK):
+        yield token
@@ -1,121 +1,79 @@
-import requests
-import json
-from bs4 import BeautifulSoup
-import urllib.parse
+import asyncio
+import logging
 import re
-from collections import Counter
+from app.core.config import (
+    DEEP_RESEARCH_MAX_RESULTS,
+    DEEP_RESEARCH_CONCURRENCY,
+    DEEP_RESEARCH_DEADLINE,
+)
+from app.core.executor import run_sync
+from app.scrapers.page_cache import fetch_page
+from app.services.keywords import get_keyword_index
+from app.services.search import SearchError, get_search_service
+from app.services.vector_store import search_corpus
 
-def fetch_article_details(url):
+logger = logging.getLogger("uvicorn.error")
+
+async def fetch_article_details(url):
     """Fetches the article title and content from the given URL."""
     try:
         headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Extract title from the <title> tag
-        title_tag = soup.find("title")
-        article_title = title_tag.get_text().strip() if title_tag else ""
-        
-        text = ""
-        # Special extraction for Times of India pages
-        if "indiatimes.com" in url:
-            container = (soup.find("div", {"class": "article_content"}) or 
-                         soup.find("div", {"class": "content-container"}) or 
-                         soup.find("article"))
-            if container:
-                text = " ".join(p.get_text() for p in container.find_all("p"))
-            else:
-                text = " ".join(p.get_text() for p in soup.find_all("p"))
-        else:
-            text = " ".join(p.get_text() for p in soup.find_all("p"))
-        
-        # Clean text: remove tab characters and extra whitespace
-        text = text.replace("\t", " ")
-        text = re.sub(r'\s+', ' ', text).strip()
-        return {"title": article_title, "text": text}
+        page = await fetch_page(url, headers=headers, timeout=10)
+        return {"title": page.title, "text": " ".join(page.paragraphs)}
     except Exception as e:
         return {"title": "", "text": f"Error fetching content: {e}"}
 
-def extract_keywords(text, article_title="", num_keywords=5):
-    """Extracts keywords from text using frequency analysis and prepends the article title if provided."""
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-    common_words = {"the", "with", "this", "that", "from", "about", "have", "more"}
-    filtered_words = [word for word in words if word not in common_words]
-    most_common = Counter(filtered_words).most_common(num_keywords)
-    keywords = [word[0] for word in most_common]
-    keyword_string = " ".join(keywords)
+def extract_keywords(text, article_title="", num_keywords=5, index_document=False):
+    """
+    Picks the text's most distinctive words and two-word phrases (BM25 against every article
+    indexed so far, see app/services/keywords.py) and prepends the article title if provided.
+    `index_document` also adds the text to the index first, which writes to its SQLite file.
+    """
+    index = get_keyword_index()
+    if index_document:
+        index.add_document(text)
+    keyword_string = " ".join(term for term, _ in index.top_terms(text, num_keywords))
     # Prepend article title if available
     if article_title:
         keyword_string = f"{article_title} {keyword_string}"
     return keyword_string
 
-def search_query(query):
-    """Uses DuckDuckGo to fetch search results based on keywords."""
-    search_url = f"https://html.duckduckgo.com/html/?q={query}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(search_url, headers=headers)
-    soup = BeautifulSoup(response.text, "html.parser")
-    results = []
-    for result in soup.find_all("a", class_="result__a", limit=5):
-        title = result.get_text()
-        link = result["href"]
-        parsed_link = urllib.parse.parse_qs(urllib.parse.urlparse(link).query).get('uddg', [None])[0]
-        if parsed_link:
-            results.append({"title": title, "link": parsed_link})
-    return results
-
-def extract_date(soup):
-    """Extracts published date from meta tags or visible elements."""
-    date = None
-    # Check meta tags
-    date_meta = soup.find("meta", {"property": "article:published_time"}) or \
-                soup.find("meta", {"name": "date"}) or \
-                soup.find("meta", {"itemprop": "datePublished"})
+def build_page_summary(page):
+    """Builds a short summary, keywords and published date from an already parsed page."""
+    # Extract summary
+    text = " ".join(page.paragraphs[:5])
     
-    if date_meta and date_meta.get("content"):
-        date = date_meta["content"]
+    # Ensure summary ends at a complete sentence
+    if len(text) > 500:
+        text = text[:500]
+        last_period = text.rfind(".")
+        if last_period != -1:
+            text = text[:last_period+1]
     
-    # Check for visible date elements
-    if not date:
-        time_tag = soup.find("time")
-        if time_tag and time_tag.get("datetime"):
-            date = time_tag["datetime"]
-        elif time_tag:
-            date = time_tag.get_text(strip=True)
+    # Extract keywords
+    keywords = extract_keywords(text)
     
-    return date if date else "Date not found"
+    return {"summary": text, "keywords": keywords, "date": page.date}
 
-def summarize_page(url):
+async def summarize_page(url):
     """Fetches and summarizes webpage content while extracting keywords and date."""
     try:
         headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=5)
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Extract date
-        date = extract_date(soup)
-        
-        # Extract summary
-        paragraphs = soup.find_all("p")
-        text = " ".join(p.get_text() for p in paragraphs[:5])
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Ensure summary ends at a complete sentence
-        if len(text) > 500:
-            text = text[:500]
-            last_period = text.rfind(".")
-            if last_period != -1:
-                text = text[:last_period+1]
-        
-        # Extract keywords
-        keywords = extract_keywords(text)
-        
-        return {"summary": text, "keywords": keywords, "date": date}
+        page = await fetch_page(url, headers=headers, timeout=5)
+        return build_page_summary(page)
     
     except Exception as e:
         return {"summary": f"Error fetching content: {e}", "keywords": "", "date": ""}
 
+def local_summary(match):
+    """Research entry for a related article from the local vector store, shaped like summarize_results() entries."""
+    return {
+        "title": match.title,
+        "link": match.url,
+        "summary": {"summary": match.snippet, "keywords": extract_keywords(match.snippet), "date": ""},
+        "source": "local",
+    }
+
 def generate_combined_summary(summaries):
     """Generates a combined summary by simply concatenating all individual summaries."""
     combined_text = " ".join([s["summary"]["summary"] for s in summaries if "Error" not in s["summary"]["summary"] and s["summary"]["summary"].strip() != ""])
@@ -124,27 +82,89 @@ def generate_combined_summary(summaries):
     combined_text = re.sub(r'\s+', ' ', combined_text).strip()
     return combined_text if combined_text else "No meaningful summary available."
 
-def do_deep_research(article_url):
-    """Takes an article URL, extracts title and keywords, performs deep research, and outputs a JSON summary."""
-    details = fetch_article_details(article_url)
+async def summarize_results(results, timeout, concurrency=DEEP_RESEARCH_CONCURRENCY, on_page_done=None):
+    """
+    Fetches and summarizes all result pages concurrently, at most `concurrency` at a time.
+    Pages that have not finished within `timeout` seconds are cancelled and reported
+    as errors, so the caller still gets every page that did make it.
+    `on_page_done(done, total)` is called as each page finishes (not for cancelled ones).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def summarize(link):
+        async with semaphore:
+            return await summarize_page(link)
+
+    tasks = [asyncio.create_task(summarize(result.url)) for result in results]
+    if on_page_done is not None:
+        finished = []
+
+        def page_done(task):
+            if not task.cancelled():  # a page cut off by the deadline has no summary to count
+                finished.append(task)
+                on_page_done(len(finished), len(tasks))
+
+        for task in tasks:
+            task.add_done_callback(page_done)
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=max(timeout, 0))
+        for task in pending:
+            task.cancel()
+
+    summaries = []
+    for result, task in zip(results, tasks):
+        if task.done() and not task.cancelled():
+            summary = task.result()
+        else:
+            summary = {"summary": "Error fetching content: deadline exceeded", "keywords": "", "date": ""}
+        summaries.append({
+            "title": result.title,
+            "link": result.url,
+            "summary": summary
+        })
+    return summaries
+
+async def do_deep_research(article_url, max_results=DEEP_RESEARCH_MAX_RESULTS, deadline=DEEP_RESEARCH_DEADLINE,
+                           progress=None):
+    """
+    Takes an article URL, extracts title and keywords, performs deep research, and outputs a JSON summary.
+    `progress(fraction, message)`, if given, is told how far along the research is.
+    """
+    def report(fraction, message):
+        if progress is not None:
+            progress(fraction, message)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    details = await fetch_article_details(article_url)
     article_text = details["text"]
     if "Error" in article_text:
-        print(json.dumps({"error": article_text}, indent=4))
+        logger.warning("Deep research could not fetch %s: %s", article_url, article_text)
         return
     
+    report(0.2, "article fetched")
+    
     # Extract keywords using both article text and title
-    keywords = extract_keywords(article_text, details["title"])
+    keywords = await run_sync(extract_keywords, article_text, details["title"], index_document=True)
     
-    results = search_query(keywords)
+    # Related articles analyzed before come from the local corpus; only the rest is searched for
+    local = await run_sync(search_corpus, article_text, max_results, exclude_url=article_url, include_duplicates=False)
+    results = []
+    if len(local) < max_results:
+        try:
+            results = await get_search_service().search(keywords, max_results=max_results - len(local))
+        except SearchError as e:
+            logger.warning("Deep research search failed for %s: %s", article_url, e)
+    report(0.4, f"{len(local)} local articles, {len(results)} search results")
     
-    summaries = []
-    for result in results:
-        summary = summarize_page(result["link"])
-        summaries.append({
-            "title": result["title"],
-            "link": result["link"],
-            "summary": summary
-        })
+    # Fan out over the result pages; whatever is left of the deadline bounds the wait
+    summaries = [local_summary(match) for match in local]
+    summaries += await summarize_results(
+        results,
+        timeout=deadline - (loop.time() - started),
+        on_page_done=lambda done, total: report(0.4 + 0.6 * done / total, f"{done}/{total} pages summarized"),
+    )
     
     combined_summary = generate_combined_summary(summaries)
     
@@ -1,101 +1,311 @@
-
-import os
+import hashlib
+import io
+import json
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
 from fpdf import FPDF
 from docx import Document
-from docx.shared import Inches
+
+from ..core import config
+from ..core.executor import run_sync
 from ..db.models import Analysis
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+
+@dataclass
+class RenderedExport:
+    content: bytes
+    media_type: str
+    filename: str
+
+
+def analysis_snapshot(analysis: Analysis) -> dict:
+    """
+    Plain copy of everything an export shows. Built on the event loop so the
+    renderers in the worker pool never touch the ORM session.
+    """
+    return {
+        "id": analysis.id,
+        "title": analysis.article_title,
+        "url": analysis.article.url,
+        "date": datetime.fromtimestamp(analysis.created_at).strftime("%Y-%m-%d"),
+        "summary": analysis.summary or "",
+        "perspectives": [{"name": p.name, "content": p.content} for p in analysis.perspectives],
+        "topics": analysis.topics,
+        "reliability": analysis.reliability,
+        "resources": analysis.resources or [],
+        "research": analysis.research,
+    }
+
+
+def content_version(snapshot: dict) -> str:
+    """Hash of the exported content; any stored change gives a new version and a new cache entry."""
+    return hashlib.sha256(json.dumps(snapshot, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _research_items(snapshot: dict) -> Iterable[Tuple[str, str, str]]:
+    research = snapshot["research"] or {}
+    for item in research.get("individual_summaries") or []:
+        yield item.get("title", ""), item.get("link", ""), (item.get("summary") or {}).get("summary", "")
+
+
+def _topics_text(topics) -> str:
+    if isinstance(topics, list):
+        return "\n".join(f"- {topic}" for topic in topics)
+    return str(topics or "")
+
+
+def render_markdown(snapshot: dict) -> bytes:
+    lines = [
+        "# Multi-Perspective Analysis",
+        "",
+        f"**Article:** [{snapshot['title']}]({snapshot['url']})  ",
+        f"**Date:** {snapshot['date']}",
+        "",
+        "## Summary",
+        "",
+        snapshot["summary"],
+        "",
+        "## Perspectives",
+        "",
+    ]
+    for perspective in snapshot["perspectives"]:
+        lines += [f"### {perspective['name']}", "", perspective["content"], ""]
+    if snapshot["topics"]:
+        lines += ["## Related Topics", "", _topics_text(snapshot["topics"]), ""]
+    if snapshot["reliability"]:
+        reliability = snapshot["reliability"]
+        lines += ["## Fact Check", "",
+                  f"- True: {reliability['true_percentage']}%",
+                  f"- Fake: {reliability['fake_percentage']}%", ""]
+    if snapshot["research"]:
+        lines += ["## Deep Research", "", snapshot["research"].get("combined_summary", ""), ""]
+        for title, link, summary in _research_items(snapshot):
+            lines += [f"- [{title}]({link}): {summary}"]
+        lines.append("")
+    return "\n".join(lines).encode()
+
+
+def render_json(snapshot: dict) -> bytes:
+    return json.dumps(snapshot, indent=2, ensure_ascii=False).encode()
+
+
+def _latin1(text) -> str:
+    # The built-in PDF fonts only cover Latin-1
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+
+def render_pdf(snapshot: dict) -> bytes:
+    pdf = FPDF()
+    pdf.add_page()
+
+    def heading(text, size=12):
+        pdf.set_font("Helvetica", "B", size)
+        pdf.multi_cell(0, 10, _latin1(text), new_x="LMARGIN", new_y="NEXT")
+
+    def body(text, size=12):
+        pdf.set_font("Helvetica", "", size)
+        pdf.multi_cell(0, 8, _latin1(text), new_x="LMARGIN", new_y="NEXT")
+
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, "Multi-Perspective Analysis", new_x="LMARGIN", new_y="NEXT", align="C")
+    heading(f"Article: {snapshot['title']}")
+    heading(f"Date: {snapshot['date']}")
+
+    heading("Summary:")
+    body(snapshot["summary"])
+
+    heading("Perspectives:")
+    for perspective in snapshot["perspectives"]:
+        heading(f"- {perspective['name']}:", 11)
+        body(perspective["content"], 11)
+
+    if snapshot["topics"]:
+        heading("Related Topics:")
+        body(_topics_text(snapshot["topics"]), 11)
+    if snapshot["reliability"]:
+        reliability = snapshot["reliability"]
+        heading("Fact Check:")
+        body(f"True: {reliability['true_percentage']}%   Fake: {reliability['fake_percentage']}%", 11)
+    if snapshot["research"]:
+        heading("Deep Research:")
+        body(snapshot["research"].get("combined_summary", ""), 11)
+
+    return bytes(pdf.output())
+
+
+def render_docx(snapshot: dict) -> bytes:
+    doc = Document()
+
+    doc.add_heading("Multi-Perspective Analysis", 0)
+    doc.add_heading(f"Article: {snapshot['title']}", 1)
+    doc.add_paragraph(f"Date: {snapshot['date']}")
+
+    doc.add_heading("Summary:", 2)
+    doc.add_paragraph(snapshot["summary"])
+
+    doc.add_heading("Perspectives:", 2)
+    for perspective in snapshot["perspectives"]:
+        p = doc.add_paragraph()
+        p.add_run(f"{perspective['name']}:").bold = True
+        doc.add_paragraph(perspective["content"])
+
+    if snapshot["topics"]:
+        doc.add_heading("Related Topics:", 2)
+        doc.add_paragraph(_topics_text(snapshot["topics"]))
+    if snapshot["reliability"]:
+        reliability = snapshot["reliability"]
+        doc.add_heading("Fact Check:", 2)
+        doc.add_paragraph(f"True: {reliability['true_percentage']}%   Fake: {reliability['fake_percentage']}%")
+    if snapshot["research"]:
+        doc.add_heading("Deep Research:", 2)
+        doc.add_paragraph(snapshot["research"].get("combined_summary", ""))
+        for title, link, summary in _research_items(snapshot):
+            p = doc.add_paragraph(style="List Bullet")
+            p.add_run(f"{title} ({link}): ").bold = True
+            p.add_run(summary)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+# format -> (media type, file extension, renderer)
+FORMATS = {
+    "pdf": ("application/pdf", "pdf", render_pdf),
+    "docx": ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", "docx", render_docx),
+    "md": ("text/markdown; charset=utf-8", "md", render_markdown),
+    "json": ("application/json", "json", render_json),
+}
+
+
+class RenderCache:
+    """LRU of rendered documents keyed by (analysis ID, content version, format), bounded in bytes."""
+
+    def __init__(self, max_bytes: int = config.EXPORT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        content = self._entries.get(key)
+        if content is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return content
+
+    def put(self, key: tuple, content: bytes):
+        if len(content) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        self._entries[key] = content
+        self._bytes += len(content)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, unseekable target for ZipFile; the bytes written so far are collected with drain()."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
 class ExportService:
+    render_cache = RenderCache()
+
     @staticmethod
-    async def generate_pdf(analysis_id: str):
-        """Generate a PDF file from an analysis"""
+    async def export(analysis_id: str, fmt: str) -> Optional[RenderedExport]:
+        """
+        Renders an analysis as `fmt` (see FORMATS) in the worker pool, fully in memory.
+        Returns None if the analysis does not exist; raises ValueError for an unknown format.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        analysis = await Analysis.get(analysis_id)
+        if not analysis:
+            return None
+        media_type, extension, renderer = FORMATS[fmt]
+        snapshot = analysis_snapshot(analysis)
+        key = (analysis_id, content_version(snapshot), fmt)
+
+        content = ExportService.render_cache.get(key)
+        if content is None:
+            content = await run_sync(renderer, snapshot)
+            ExportService.render_cache.put(key, content)
+        return RenderedExport(content, media_type, f"analysis_{analysis_id}.{extension}")
+
+    @staticmethod
+    async def generate_pdf(analysis_id: str) -> Optional[bytes]:
+        """Generate a PDF document from an analysis"""
         try:
-            # Get analysis from DB
-            analysis = await Analysis.get(analysis_id)
-            if not analysis:
-                return None
-            
-            # Create PDF
-            pdf = FPDF()
-            pdf.add_page()
-            
-            # Set font
-            pdf.set_font("Arial", "B", 16)
-            
-            # Title
-            pdf.cell(200, 10, "Multi-Perspective Analysis", ln=True, align="C")
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(200, 10, f"Article: {analysis.article_title}", ln=True)
-            pdf.cell(200, 10, f"Date: {datetime.now().strftime('%Y-%m-%d')}", ln=True)
-            
-            # Content
-            pdf.set_font("Arial", "", 12)
-            
-            # Summary
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(200, 10, "Summary:", ln=True)
-            pdf.set_font("Arial", "", 12)
-            pdf.multi_cell(0, 10, analysis.summary)
-            
-            # Perspectives
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(200, 10, "Perspectives:", ln=True)
-            
-            for perspective in analysis.perspectives:
-                pdf.set_font("Arial", "B", 11)
-                pdf.cell(200, 10, f"- {perspective.name}:", ln=True)
-                pdf.set_font("Arial", "", 11)
-                pdf.multi_cell(0, 10, perspective.content)
-            
-            # Save to temp file
-            filename = f"analysis_{analysis_id}.pdf"
-            filepath = os.path.join("/tmp", filename)
-            pdf.output(filepath)
-            
-            return filepath
+            rendered = await ExportService.export(analysis_id, "pdf")
+            return rendered.content if rendered else None
         except Exception as e:
             logger.error(f"Error generating PDF: {str(e)}")
             return None
-    
+
     @staticmethod
-    async def generate_docx(analysis_id: str):
-        """Generate a DOCX file from an analysis"""
+    async def generate_docx(analysis_id: str) -> Optional[bytes]:
+        """Generate a DOCX document from an analysis"""
         try:
-            # Get analysis from DB
-            analysis = await Analysis.get(analysis_id)
-            if not analysis:
-                return None
-            
-            # Create DOCX
-            doc = Document()
-            
-            # Title
-            doc.add_heading("Multi-Perspective Analysis", 0)
-            doc.add_heading(f"Article: {analysis.article_title}", 1)
-            doc.add_paragraph(f"Date: {datetime.now().strftime('%Y-%m-%d')}")
-            
-            # Summary
-            doc.add_heading("Summary:", 2)
-            doc.add_paragraph(analysis.summary)
-            
-            # Perspectives
-            doc.add_heading("Perspectives:", 2)
-            
-            for perspective in analysis.perspectives:
-                p = doc.add_paragraph()
-                p.add_run(f"{perspective.name}:").bold = True
-                doc.add_paragraph(perspective.content)
-            
-            # Save to temp file
-            filename = f"analysis_{analysis_id}.docx"
-            filepath = os.path.join("/tmp", filename)
-            doc.save(filepath)
-            
-            return filepath
+            rendered = await ExportService.export(analysis_id, "docx")
+            return rendered.content if rendered else None
         except Exception as e:
             logger.error(f"Error generating DOCX: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    @staticmethod
+    async def stream_zip(analysis_ids: Iterable[str], fmt: str) -> AsyncIterator[bytes]:
+        """
+        Yields a ZIP archive of the analyses as `fmt`, one document at a time, so only
+        the document being added is held in memory. IDs that cannot be exported are
+        listed in a `missing.txt` entry.
+        """
+        # PDF and DOCX are already compressed; deflating them again only costs CPU
+        compression = zipfile.ZIP_STORED if fmt in ("pdf", "docx") else zipfile.ZIP_DEFLATED
+        sink = _ZipSink()
+        archive = zipfile.ZipFile(sink, "w")
+        missing = []
+        for analysis_id in dict.fromkeys(analysis_ids):  # each analysis once, in request order
+            try:
+                rendered = await ExportService.export(analysis_id, fmt)
+            except Exception as e:
+                logger.error(f"Error exporting analysis {analysis_id}: {str(e)}")
+                rendered = None
+            if rendered is None:
+                missing.append(analysis_id)
+                continue
+            await run_sync(archive.writestr, rendered.filename, rendered.content, compression)
+            yield sink.drain()
+        if missing:
+            archive.writestr("missing.txt", "\n".join(missing) + "\n")
+        archive.close()
+        yield sink.drain()
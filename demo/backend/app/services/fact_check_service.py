@@ -1,130 +1,231 @@
 
+import asyncio
 import json
+import logging
+import re
+import uuid
+from typing import Optional
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
-from dotenv import load_dotenv
-import os
 
+from app.core.config import (
+    CHARS_PER_TOKEN,
+    FACT_CHECK_CONCURRENCY,
+    FACT_CHECK_EVIDENCE_RESULTS,
+    FACT_CHECK_MAX_CLAIMS,
+)
+from app.models.schemas import FactCheckResult
+from app.prompts.budget import PromptBudget
 # Import our custom free LLM
 from app.services.chat_deepseek import ChatDeepseek
-# Import our Tavily helper (if you want to use it when available)
-from app.services.tavily_helper import tavily_search
+from app.services.checkpoints import get_checkpointer
+from app.services.model_router import get_model_router
+from app.services.search import SearchError, get_search_service
+from app.utils.chunking import leading_sentences
 
-load_dotenv()
-TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+logger = logging.getLogger("uvicorn.error")
+
+# Scores used when the whole-article comparison gives no readable answer
+NEUTRAL_RELIABILITY = {"true_percentage": 50, "fake_percentage": 50}
+
+# Tavily rejects longer queries
+SEARCH_QUERY_MAX_CHARS = 400
+
+
+FACT, MISINFORMATION, UNVERIFIED = "FACT", "MISINFORMATION", "UNVERIFIED"
+VERDICTS = (FACT, MISINFORMATION, UNVERIFIED)
 
 
 class State(TypedDict):
     article_text: str
     resources: list
     reliability: dict
+    claims: list  # checkable claims extracted from the article
+    claim_results: list  # one FactCheckResult dict per claim
 
 
 graph_builder = StateGraph(State)
 
-def collect_resources(state: State) -> State:
+async def collect_resources(state: State) -> State:
     """
-    Node 1: Call the Tavily API via our helper to gather external resources.
-    If Tavily returns an error (e.g. query too long), set resources to an empty list.
+    Node 1: Search the web for external resources on the article (see app/services/search.py).
+    If every search provider fails, set resources to an empty list.
     """
-    query = state["article_text"]
- 
-    if len(query) > 400:
-        query = query[:400]
-    
-
-    search_results = tavily_search(query, TAVILY_API_KEY, max_results=5)
-    
-    resources = []
-    if not search_results or "HTTPError" in search_results or "RequestException" in search_results:
-        print(f"Error in search results: {search_results}")
-        resources = []
-    else:
+    # The article's lead, cut at a sentence boundary rather than mid-word
+    query = leading_sentences(state["article_text"], SEARCH_QUERY_MAX_CHARS)
+
+    try:
+        results = await get_search_service().search(query, max_results=5)
+    except SearchError as e:
+        logger.warning("Fact-check search failed: %s", e)
+        results = []
+    state["resources"] = [result.to_dict() for result in results]
+    return state
+
+
+
+TASK = "fact_check"  # model route, see app/services/model_router.py
+llm = ChatDeepseek(task=TASK)
+
+
+def _extract_json(response, opening="{", closing="}"):
+    """The JSON value in an LLM response, also when it is wrapped in prose or code fences; None if there is none."""
+    try:
+        return json.loads(response)
+    except (json.JSONDecodeError, TypeError):
+        pass
+    match = re.search(re.escape(opening) + r".*" + re.escape(closing), response or "", re.DOTALL)
+    if match:
         try:
-         
-            if isinstance(search_results, str):
-                search_results = json.loads(search_results)
-
-            resources = search_results.get("results", [])
-            if not isinstance(resources, list):
-                print(f"Unexpected 'results' type: {type(resources)}")
-                resources = []
-        except Exception as e:
-            print(f"Error parsing Tavily response: {e}")
-            resources = []
+            return json.loads(match.group(0))
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+async def extract_claims(state: State) -> State:
+    """
+    Node 1: Ask the LLM for the article's main checkable factual claims (at most
+    FACT_CHECK_MAX_CLAIMS). No usable claims sends the article down the whole-article path.
+    """
+    article = leading_sentences(state["article_text"], get_model_router().token_budget(TASK) * CHARS_PER_TOKEN)
+    response = await llm.ainvoke([
+        {"role": "system", "content": "You extract factual claims from news articles and respond only with JSON."},
+        {"role": "user", "content": (
+            f"List the {FACT_CHECK_MAX_CLAIMS} most important factual claims in the article below that "
+            "could be checked against other sources (names, numbers, dates, events). Each claim must be a single "
+            "self-contained sentence. Output ONLY a JSON array of strings.\n\n"
+            f"Article text:\n{article}"
+        )},
+    ])
+    claims = _extract_json(response, "[", "]")
+    if not isinstance(claims, list):
+        logger.warning("No claims could be read from the LLM response: %.200s", response)
+        claims = []
+    state["claims"] = [c.strip() for c in claims if isinstance(c, str) and c.strip()][:FACT_CHECK_MAX_CLAIMS]
+    return state
+
+
+async def verify_claim(claim: str):
+    """Searches for evidence on one claim and asks the LLM for a verdict; returns (FactCheckResult, evidence)."""
+    try:
+        evidence = await get_search_service().search(
+            leading_sentences(claim, SEARCH_QUERY_MAX_CHARS), max_results=FACT_CHECK_EVIDENCE_RESULTS
+        )
+    except SearchError as e:
+        logger.warning("Evidence search failed for claim %r: %s", claim, e)
+        evidence = []
+    sources = "\n".join(f"- {r.title} ({r.url}): {r.snippet}" for r in evidence) or "No external sources found."
+    response = await llm.ainvoke([
+        {"role": "system", "content": "You are an expert fact-checker who responds only with JSON."},
+        {"role": "user", "content": (
+            "Judge the claim below against the sources. Output ONLY a JSON object with the keys 'verdict' "
+            f"(one of {', '.join(VERDICTS)}; {UNVERIFIED} if the sources neither confirm nor contradict it) "
+            "and 'evidence' (one sentence on what decided the verdict).\n\n"
+            f"Claim: {claim}\n\nSources:\n{sources}"
+        )},
+    ])
+    parsed = _extract_json(response)
+    if not isinstance(parsed, dict) or str(parsed.get("verdict", "")).upper() not in VERDICTS:
+        result = FactCheckResult(claim=claim, verdict="ERROR: unreadable verdict", evidence=str(response)[:300])
+    else:
+        result = FactCheckResult(claim=claim, verdict=str(parsed["verdict"]).upper(),
+                                 evidence=str(parsed.get("evidence", "")))
+    return result, evidence
+
+
+async def verify_claims(state: State) -> State:
+    """
+    Node 2: Verify every claim concurrently, at most FACT_CHECK_CONCURRENCY at a time,
+    so the node takes about as long as its slowest claim. The evidence found for all
+    claims, without duplicates, becomes the resources.
+    """
+    semaphore = asyncio.Semaphore(FACT_CHECK_CONCURRENCY)
+
+    async def verify(claim):
+        async with semaphore:
+            try:
+                return await verify_claim(claim)
+            except Exception as e:
+                logger.error("Verifying claim %r failed: %s", claim, e, exc_info=True)
+                return FactCheckResult(claim=claim, verdict=f"ERROR: {e}", evidence=""), []
+
+    outcomes = await asyncio.gather(*(verify(claim) for claim in state["claims"]))
+    resources, seen = [], set()
+    for _, evidence in outcomes:
+        for result in evidence:
+            if result.url not in seen:
+                seen.add(result.url)
+                resources.append(result.to_dict())
+    state["claim_results"] = [result.model_dump() for result, _ in outcomes]
     state["resources"] = resources
     return state
 
 
+def aggregate_verdicts(state: State) -> State:
+    """
+    Node 3: Overall score from the per-claim verdicts: facts count fully, unverified
+    claims half, and claims that could not be judged are left out.
+    """
+    verdicts = [r["verdict"] for r in state["claim_results"] if r["verdict"] in VERDICTS]
+    true_share = (verdicts.count(FACT) + 0.5 * verdicts.count(UNVERIFIED)) / len(verdicts)
+    state["reliability"] = {"true_percentage": round(100 * true_share),
+                            "fake_percentage": 100 - round(100 * true_share)}
+    return state
+
+
+def after_extract(state: State):
+    return "verify_claims" if state["claims"] else "collect_resources"
+
+
+def after_verify(state: State):
+    # Without a single usable verdict, judge the article as a whole against the evidence found
+    if any(r["verdict"] in VERDICTS for r in state["claim_results"]):
+        return "aggregate_verdicts"
+    return "compare_article"
+
+COMPARE_ARTICLE_PROMPT = (
+    "You are an expert fact-checking assistant. "
+    "Evaluate the reliability of the following article by comparing its content to the external resources provided. "
+    "Output ONLY a valid JSON object with two keys: 'true_percentage' and 'fake_percentage'. "
+    "These keys should have integer values between 0 and 100 that sum up to 100, reflecting the article's reliability "
+    "(a higher true_percentage indicates more reliability). "
+    "Do not include any explanations or additional text before or after the JSON. "
+    "Just return the raw JSON object.\n\n"
+    "Article text:\n{article}\n\n"
+    "External resources (title, site and snippet):\n{resources}\n\n"
+    "Example output format: {{\"true_percentage\": 75, \"fake_percentage\": 25}}\n"
+    "Remember: Provide ONLY the JSON object, nothing else."
+)
 
-llm = ChatDeepseek(model="deepseek/deepseek-r1-zero:free")
 
-def compare_article(state: State) -> State:
+async def compare_article(state: State) -> State:
+    """
+    Node: Judge the article as a whole against the collected resources. The article and
+    the resources (most relevant first) are compacted to fit the model's token budget.
+    """
     article = state["article_text"]
-    resources = state.get("resources", [])
-    
-    prompt = (
-        "You are an expert fact-checking assistant. "
-        "Evaluate the reliability of the following article by comparing its content to the external resources provided. "
-        "Output ONLY a valid JSON object with two keys: 'true_percentage' and 'fake_percentage'. "
-        "These keys should have integer values between 0 and 100 that sum up to 100, reflecting the article's reliability "
-        "(a higher true_percentage indicates more reliability). "
-        "Do not include any explanations or additional text before or after the JSON. "
-        "Just return the raw JSON object.\n\n"
-        "Article text:\n" + article + "\n\n"
-    )
-    
-    if resources and len(resources) > 0:
-        prompt += "External resources:\n" + json.dumps(resources, indent=2) + "\n\n"
-    else:
-        prompt += "No external resources available; base your evaluation solely on the article text.\n\n"
-    
-    prompt += "Example output format: {\"true_percentage\": 75, \"fake_percentage\": 25}\n"
-    prompt += "Remember: Provide ONLY the JSON object, nothing else."
-    
+    budget = (PromptBudget(budget=get_model_router().token_budget(TASK))
+              .text("article", article)
+              .resources("resources", state.get("resources", []), query=article,
+                         empty="None available; base your evaluation solely on the article text."))
+    prompt = budget.fill(COMPARE_ARTICLE_PROMPT)
+    logger.info("compare_article prompt tokens: %s", budget.report())
+
     # Invoke the LLM with the prompt.
-    response = llm.invoke([
+    response = await llm.ainvoke([
         {"role": "system", "content": "You are an expert fact-checker who responds only with JSON."},
         {"role": "user", "content": prompt}
     ])
-    print(response)
-    
-   
-    try:
-        
-        reliability = json.loads(response)
-    except json.JSONDecodeError:
-        try:
-          
-            import re
-            json_pattern = r'\{.*?\}'
-            match = re.search(json_pattern, response, re.DOTALL)
-            
-            if match:
-                json_str = match.group(0)
-                reliability = json.loads(json_str)
-            else:
-                
-                print(f"No JSON pattern found in response: {response}")
-                reliability = {"true_percentage": 50, "fake_percentage": 50}
-        except Exception as e:
-            print(f"Error extracting JSON: {e}, response: {response}")
-            reliability = {"true_percentage": 50, "fake_percentage": 50}
-    
-   
-    if "true_percentage" not in reliability or "fake_percentage" not in reliability:
-        print(f"Missing required keys in reliability object: {reliability}")
-        reliability = {"true_percentage": 50, "fake_percentage": 50}
-    
- 
+    logger.debug("compare_article response: %s", response)
+
+    reliability = _extract_json(response)
     try:
-        reliability["true_percentage"] = int(reliability["true_percentage"])
-        reliability["fake_percentage"] = int(reliability["fake_percentage"])
-    except (ValueError, TypeError):
-        print(f"Error converting reliability values to integers: {reliability}")
-        reliability = {"true_percentage": 50, "fake_percentage": 50}
-    
+        reliability = {key: int(reliability[key]) for key in ("true_percentage", "fake_percentage")}
+    except (KeyError, TypeError, ValueError):
+        logger.warning("No reliability scores could be read from the LLM response: %.200s", response)
+        reliability = dict(NEUTRAL_RELIABILITY)
+
     state["reliability"] = reliability
     return state
 
@@ -132,30 +233,61 @@ def compare_article(state: State) -> State:
 
 
 
+# extract_claims -> verify_claims -> aggregate_verdicts; the whole-article comparison
+# (collect_resources -> compare_article) remains the fallback when claims do not work out
+graph_builder.add_node("extract_claims", extract_claims)
+graph_builder.add_node("verify_claims", verify_claims)
+graph_builder.add_node("aggregate_verdicts", aggregate_verdicts)
 graph_builder.add_node("collect_resources", collect_resources)
 graph_builder.add_node("compare_article", compare_article)
 
-graph_builder.add_edge(START, "collect_resources")
+graph_builder.add_edge(START, "extract_claims")
+graph_builder.add_conditional_edges("extract_claims", after_extract, ["verify_claims", "collect_resources"])
+graph_builder.add_conditional_edges("verify_claims", after_verify, ["aggregate_verdicts", "compare_article"])
+graph_builder.add_edge("aggregate_verdicts", END)
 graph_builder.add_edge("collect_resources", "compare_article")
 graph_builder.add_edge("compare_article", END)
 
 
-memory = MemorySaver()
-graph = graph_builder.compile(checkpointer=memory)
+_graph = None
+
+
+async def get_fact_check_graph():
+    """The graph compiled against the current checkpointer (see app/services/checkpoints.py)."""
+    global _graph
+    checkpointer = await get_checkpointer()
+    if _graph is None or _graph.checkpointer is not checkpointer:
+        _graph = graph_builder.compile(checkpointer=checkpointer)
+    return _graph
 
-def run_fact_check(article_text: str) -> State:
+
+async def run_fact_check(article_text: str, thread_id: Optional[str] = None) -> State:
     """
     Executes the LangGraph pipeline:
-      1. Collects external resources.
-      2. Compares the article with these resources (or uses training data if none).
-      3. Returns a reliability metric as a JSON object.
+      1. Extracts the article's checkable claims.
+      2. Searches and verifies every claim in parallel (claim_results holds the verdicts).
+      3. Aggregates the verdicts into a reliability metric as a JSON object.
+    If no claims can be extracted or judged, the article is compared as a whole with
+    search results instead, as before.
+
+    Each run is checkpointed on its own thread (`thread_id`, random by default). If that
+    thread holds an unfinished run, for example a job that failed or was interrupted by
+    a restart, the run resumes after its last finished node. A finished run's checkpoints
+    are deleted.
     """
-    initial_state: State = {
-        "article_text": article_text,
-        "resources": [],
-        "reliability": {}
-    }
-    config = {"configurable": {"thread_id": "default"}}
-    final_state = graph.invoke(initial_state, config)
-    print("end")
+    graph = await get_fact_check_graph()
+    config = {"configurable": {"thread_id": thread_id or uuid.uuid4().hex}}
+    if thread_id and (await graph.aget_state(config)).next:
+        logger.info("Resuming fact-check %s", thread_id)
+        final_state = await graph.ainvoke(None, config)
+    else:
+        initial_state: State = {
+            "article_text": article_text,
+            "resources": [],
+            "reliability": {},
+            "claims": [],
+            "claim_results": [],
+        }
+        final_state = await graph.ainvoke(initial_state, config)
+    await graph.checkpointer.adelete_thread(config["configurable"]["thread_id"])
     return final_state
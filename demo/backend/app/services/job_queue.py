@@ -0,0 +1,300 @@
+# backend/app/services/job_queue.py
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+
+from app.core import config
+from app.core.executor import run_sync
+
+logger = logging.getLogger("uvicorn.error")
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+TERMINAL_STATUSES = {SUCCEEDED, FAILED, CANCELLED}
+
+# A handler gets the job params, a progress(fraction, message) callback and the job id (stable across
+# restarts, so handlers can key resumable state on it) and returns the result
+ProgressCallback = Callable[[float, str], None]
+JobHandler = Callable[[dict, ProgressCallback, str], Awaitable[Any]]
+
+
+class QueueFullError(Exception):
+    """Raised by submit() when the queue is at JOB_QUEUE_MAX_DEPTH."""
+
+
+class UnknownJobKindError(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: dict
+    status: str = QUEUED
+    progress: float = 0.0
+    message: str = ""
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def snapshot(self) -> dict:
+        return asdict(self)
+
+
+class _JobStore:
+    """SQLite persistence so job status and results survive restarts."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, params TEXT NOT NULL, status TEXT NOT NULL, "
+            "progress REAL NOT NULL, message TEXT NOT NULL, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._db.commit()
+
+    def save(self, job: Job):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.kind, json.dumps(job.params), job.status, job.progress, job.message,
+                 json.dumps(job.result), job.error, job.created_at, job.updated_at),
+            )
+            self._db.commit()
+
+    def _row_to_job(self, row) -> Job:
+        return Job(
+            id=row[0], kind=row[1], params=json.loads(row[2]), status=row[3], progress=row[4],
+            message=row[5], result=json.loads(row[6]) if row[6] else None, error=row[7],
+            created_at=row[8], updated_at=row[9],
+        )
+
+    def load(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def unfinished(self):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue: a fixed pool of worker tasks pulls from an
+    asyncio.Queue of at most `max_depth` jobs, so overload shows up as
+    QueueFullError at submit time instead of unbounded concurrency.
+    """
+
+    def __init__(self, workers: int = config.JOB_WORKERS, max_depth: int = config.JOB_QUEUE_MAX_DEPTH,
+                 db_path: Optional[str] = config.JOB_DB_PATH, memory_max: int = config.JOB_MEMORY_MAX):
+        self.workers = workers
+        self.memory_max = memory_max
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_depth)
+        self._handlers: Dict[str, JobHandler] = {}
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._watchers: Dict[str, Set[asyncio.Queue]] = {}
+        self._worker_tasks = []
+        self._stopping = False
+        self._store = _JobStore(db_path) if db_path else None
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    async def start(self):
+        """Starts the workers and re-queues jobs left unfinished by the previous process."""
+        if self._store is not None:
+            for job in await run_sync(self._store.unfinished):
+                job.status, job.progress, job.message = QUEUED, 0.0, "re-queued after restart"
+                if self._queue.full():
+                    job.status, job.error = FAILED, "Interrupted by restart and the queue is full"
+                else:
+                    self._queue.put_nowait(job.id)
+                self._remember(job)
+                await self._persist(job)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        self._stopping = True
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._store is not None:
+            self._store.close()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, kind: str, params: dict) -> Job:
+        if kind not in self._handlers:
+            raise UnknownJobKindError(kind)
+        if self._queue.full():
+            raise QueueFullError(f"Job queue is full ({self._queue.maxsize} waiting)")
+        job = Job(id=uuid.uuid4().hex, kind=kind, params=params)
+        self._remember(job)
+        await self._persist(job)
+        self._queue.put_nowait(job.id)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None and self._store is not None:
+            job = await run_sync(self._store.load, job_id)
+        return job
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        job = await self.get(job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return job
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()  # the worker records the cancellation
+        else:
+            await self._update(job, status=CANCELLED, message="cancelled before start")
+        return job
+
+    async def watch(self, job_id: str) -> AsyncIterator[dict]:
+        """Yields the job's snapshot now and after every change, until it reaches a terminal status."""
+        job = await self.get(job_id)
+        if job is None:
+            return
+        updates: asyncio.Queue = asyncio.Queue()
+        self._watchers.setdefault(job_id, set()).add(updates)
+        try:
+            snapshot = job.snapshot()
+            while True:
+                yield snapshot
+                if snapshot["status"] in TERMINAL_STATUSES:
+                    return
+                snapshot = await updates.get()
+        finally:
+            watchers = self._watchers.get(job_id)
+            if watchers is not None:
+                watchers.discard(updates)
+                if not watchers:
+                    del self._watchers[job_id]
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "depth": self.depth, "max_depth": self._queue.maxsize,
+                "running": len(self._running)}
+
+    def _remember(self, job: Job):
+        self._jobs[job.id] = job
+        self._jobs.move_to_end(job.id)
+        # Only finished jobs are dropped from memory; SQLite still has them
+        while len(self._jobs) > self.memory_max:
+            oldest = next(iter(self._jobs.values()))
+            if oldest.status not in TERMINAL_STATUSES:
+                break
+            self._jobs.popitem(last=False)
+
+    async def _persist(self, job: Job):
+        if self._store is not None:
+            await run_sync(self._store.save, job)
+
+    async def _update(self, job: Job, **changes):
+        for key, value in changes.items():
+            setattr(job, key, value)
+        job.updated_at = time.time()
+        await self._persist(job)
+        snapshot = job.snapshot()
+        for watcher in self._watchers.get(job.id, ()):
+            watcher.put_nowait(snapshot)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await self.get(job_id)
+                if job is None or job.status != QUEUED:
+                    continue
+                await self._run(job)
+            except Exception:
+                logger.exception("Job worker failed on %s", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        # Progress writes run as tasks; holding them here keeps them from being garbage-collected
+        # mid-write, and they are awaited before the final status so none can overwrite it
+        writes: Set[asyncio.Task] = set()
+
+        def progress(fraction: float, message: str = ""):
+            job.progress, job.message = max(0.0, min(1.0, fraction)), message
+            write = asyncio.create_task(self._update(job))
+            writes.add(write)
+            write.add_done_callback(writes.discard)
+
+        async def finish(**changes):
+            await asyncio.gather(*writes, return_exceptions=True)
+            await self._update(job, **changes)
+
+        # Registered before the first await, so a cancel() from here on cancels the handler
+        # instead of finding nothing running and marking the job cancelled behind its back
+        task = asyncio.create_task(self._handlers[job.kind](job.params, progress, job.id))
+        self._running[job.id] = task
+        try:
+            await self._update(job, status=RUNNING, message="started")
+            result = await task
+            await finish(status=SUCCEEDED, progress=1.0, message="done", result=result)
+        except asyncio.CancelledError:
+            if self._stopping or not task.cancelled():
+                raise  # the worker itself is shutting down; the job stays "running" and is re-queued on start
+            await finish(status=CANCELLED, message="cancelled")
+        except Exception as e:
+            logger.error("Job %s (%s) failed: %s", job.id, job.kind, e, exc_info=True)
+            await finish(status=FAILED, error=str(e), message="failed")
+        finally:
+            for write in writes:
+                write.cancel()
+            self._running.pop(job.id, None)
+            self._remember(job)
+
+
+_queue: Optional[JobQueue] = None
+
+
+async def init_job_queue(handlers: Dict[str, JobHandler], **kwargs) -> JobQueue:
+    """Creates the queue, registers the job kinds and starts the workers; called from the lifespan."""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue(**kwargs)
+        for kind, handler in handlers.items():
+            _queue.register(kind, handler)
+        await _queue.start()
+    return _queue
+
+
+async def close_job_queue():
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue = None
+
+
+def get_job_queue() -> JobQueue:
+    if _queue is None:
+        raise RuntimeError("Job queue is not running; it is started by the app lifespan")
+    return _queue
@@ -0,0 +1,37 @@
+# backend/app/services/jobs.py
+"""Job kinds served by the background queue (see job_queue.py and the /jobs routes)."""
+from app.core.executor import run_sync
+from app.scrapers.article_scraper import scrape_website
+from app.scrapers.clean_data import clean_scraped_data
+from app.services.deep_research import do_deep_research
+from app.services.fact_check_service import run_fact_check
+from app.services.analysis_store import save_analysis
+
+
+async def deep_research_job(params, progress, job_id):
+    progress(0.0, "fetching article")
+    research = await do_deep_research(params["url"], max_results=params["max_results"], progress=progress)
+    if research is None:
+        raise Exception("Error fetching the article")
+    await save_analysis(params["url"], research=research, research_max_results=params["max_results"])
+    return {"research": research}
+
+
+async def fact_check_job(params, progress, job_id):
+    progress(0.0, "fetching article")
+    raw_data = await scrape_website(params["url"])
+    if raw_data is None:
+        raise Exception("Error scraping the article")
+    clean_text = await run_sync(clean_scraped_data, raw_data)
+    progress(0.3, "checking against external resources")
+    # Keyed on the job, so a job re-queued after a restart picks up from its last checkpoint
+    result = await run_fact_check(clean_text, thread_id=f"fact-check-job:{job_id}")
+    await save_analysis(params["url"], text=clean_text, reliability=result["reliability"],
+                        resources=result["resources"], claims=result["claim_results"])
+    return result
+
+
+JOB_HANDLERS = {
+    "deep-research": deep_research_job,
+    "fact-check": fact_check_job,
+}
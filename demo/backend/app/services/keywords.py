@@ -0,0 +1,242 @@
+# backend/app/services/keywords.py
+import hashlib
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core import config
+
+# Words, plus the punctuation that ends a phrase (so bigrams never span a sentence or clause)
+TOKEN_RE = re.compile(r"[^\W\d_]+|[.!?;:,()\"]")
+MIN_WORD_CHARS = 3
+
+STOPWORDS = frozenset("""
+a about above according across actually after afterwards again against ago all almost alone along already also
+although always am among amongst an and another any anybody anyone anything anyway anywhere are around as at
+away back be became because become becomes been before beforehand behind being below beside besides between
+beyond both but by can cannot could did do does doing done down due during each either else elsewhere enough
+even ever every everyone everything everywhere except few first for former formerly from further get gets got
+had has have having he her here hereafter hereby herein hers herself him himself his how however i if in
+including indeed instead into is it its itself just last later latter least less like made make makes many may
+me meanwhile might mine more moreover most mostly much must my myself namely near nearly neither never
+nevertheless new next no nobody none noone nor not nothing now nowhere of off often on once one only onto or
+other others otherwise our ours ourselves out over own per perhaps please put rather re really said same say
+says see seem seemed seeming seems several she should show since so some somehow someone something sometime
+sometimes somewhere still such than that the their theirs them themselves then thence there thereafter thereby
+therefore therein thereupon these they this those though through throughout thru thus to together too toward
+towards under until up upon us use used using very via was we well were what whatever when whence whenever
+where whereafter whereas whereby wherein whereupon wherever whether which while whither who whoever whole whom
+whose why will with within without would yet you your yours yourself yourselves
+also amid news today yesterday tomorrow year years week weeks month months day days time times told tell
+people percent including reported report reports according mr mrs ms dr
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def extract_terms(text: str) -> List[str]:
+    """
+    Content unigrams plus bigrams of adjacent content words. Stopwords, short words,
+    and punctuation break adjacency, so "bank of england" yields no "bank england".
+    """
+    terms, previous = [], None
+    for token in tokenize(text):
+        if len(token) < MIN_WORD_CHARS or token in STOPWORDS:
+            previous = None
+            continue
+        terms.append(token)
+        if previous is not None and previous != token:
+            terms.append(f"{previous} {token}")
+        previous = token
+    return terms
+
+
+class KeywordIndex:
+    """
+    Document-frequency index over the articles processed so far, scoring terms with BM25.
+
+    DF counts live in a NumPy array indexed by term id and grow as documents are added;
+    with a `path` they are also written through to SQLite so the IDF table survives
+    restarts. A document (by content hash) is only counted once.
+    """
+
+    def __init__(self, path: Optional[str] = config.KEYWORD_INDEX_PATH,
+                 k1: float = config.BM25_K1, b: float = config.BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()  # the in-memory DF table; never held across SQLite I/O
+        self._db_lock = threading.Lock()
+        self._vocab: Dict[str, int] = {}
+        self._df = np.zeros(1024, dtype=np.int64)
+        self.n_docs = 0
+        self.total_terms = 0
+        self._seen = set()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS df (term TEXT PRIMARY KEY, df INTEGER NOT NULL)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS documents (hash TEXT PRIMARY KEY, terms INTEGER NOT NULL)")
+            self._db.commit()
+            self._load()
+
+    def _load(self):
+        rows = self._db.execute("SELECT term, df FROM df").fetchall()
+        self._grow(len(rows))
+        for term_id, (term, df) in enumerate(rows):
+            self._vocab[term] = term_id
+            self._df[term_id] = df
+        for digest, terms in self._db.execute("SELECT hash, terms FROM documents"):
+            self._seen.add(digest)
+            self.n_docs += 1
+            self.total_terms += terms
+
+    def _grow(self, size: int):
+        if size > len(self._df):
+            grown = np.zeros(max(size, 2 * len(self._df)), dtype=np.int64)
+            grown[:len(self._df)] = self._df
+            self._df = grown
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._vocab.get(term)
+        if term_id is None:
+            term_id = self._vocab[term] = len(self._vocab)
+            self._grow(term_id + 1)
+        return term_id
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._vocab)
+
+    def add_document(self, text: str) -> bool:
+        """Counts the document's distinct terms; returns False if it was already indexed."""
+        return self.add_documents([text]) == 1
+
+    def add_documents(self, texts: Iterable[str]) -> int:
+        """Incrementally updates DF with every new document; returns how many were new."""
+        new_documents, new_terms = [], []
+        with self._lock:
+            for text in texts:
+                digest = hashlib.sha256(text.encode()).hexdigest()
+                if digest in self._seen:
+                    continue
+                self._seen.add(digest)
+                terms = extract_terms(text)
+                distinct = set(terms)
+                ids = np.fromiter((self._term_id(t) for t in distinct), dtype=np.int64, count=len(distinct))
+                self._df[ids] += 1
+                self.n_docs += 1
+                self.total_terms += len(terms)
+                new_documents.append((digest, len(terms)))
+                new_terms.extend(distinct)
+        # Written through outside _lock, so scoring (which runs on the event loop) never waits on a commit;
+        # the increments commute, so concurrent writers need no particular order
+        if new_documents:
+            with self._db_lock:
+                if self._db is not None:
+                    self._db.executemany("INSERT OR IGNORE INTO documents (hash, terms) VALUES (?, ?)",
+                                         new_documents)
+                    self._db.executemany(
+                        "INSERT INTO df (term, df) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                        ((term,) for term in new_terms),
+                    )
+                    self._db.commit()
+        return len(new_documents)
+
+    def idf(self, term_ids: np.ndarray) -> np.ndarray:
+        """BM25 IDF; terms never seen get the IDF of a term in no document."""
+        df = np.where(term_ids >= 0, self._df[np.maximum(term_ids, 0)], 0)
+        return np.log1p((self.n_docs - df + 0.5) / (df + 0.5))
+
+    def score_batch(self, texts: Sequence[str], top_k: int = 5) -> List[List[Tuple[str, float]]]:
+        """
+        Top `top_k` (term, BM25 score) pairs per text. The batch is one sparse
+        document-term matrix (CSR-style NumPy arrays) scored in a single vectorized pass.
+        """
+        local_vocab: Dict[str, int] = {}
+        indptr, indices = [0], []
+        for text in texts:
+            for term in extract_terms(text):
+                indices.append(local_vocab.setdefault(term, len(local_vocab)))
+            indptr.append(len(indices))
+        if not indices:
+            return [[] for _ in texts]
+        local_terms = list(local_vocab)
+        indptr = np.asarray(indptr)
+        doc_lengths = np.diff(indptr)
+        rows = np.repeat(np.arange(len(texts)), doc_lengths)
+
+        # Collapse (row, term) repeats into term frequencies: the sparse matrix's data array
+        keys = rows * len(local_terms) + np.asarray(indices)
+        keys, tf = np.unique(keys, return_counts=True)
+        rows, cols = keys // len(local_terms), keys % len(local_terms)
+
+        with self._lock:
+            global_ids = np.fromiter((self._vocab.get(t, -1) for t in local_terms), dtype=np.int64,
+                                     count=len(local_terms))
+            idf = self.idf(global_ids)
+            avg_length = self.total_terms / self.n_docs if self.n_docs else float(doc_lengths.mean() or 1)
+
+        norm = self.k1 * (1 - self.b + self.b * doc_lengths[rows] / avg_length)
+        scores = idf[cols] * tf * (self.k1 + 1) / (tf + norm)
+
+        # Best first within each row, then keep each row's leading candidates (a few more
+        # than top_k, since _prefer_phrases drops words already covered by a phrase)
+        is_phrase = np.fromiter((" " in term for term in local_terms), dtype=bool, count=len(local_terms))
+        order = np.lexsort((~is_phrase[cols], -scores, rows))  # a phrase wins a tie with its words
+        sorted_rows = rows[order]
+        rank = np.arange(len(order)) - np.searchsorted(sorted_rows, sorted_rows)
+        kept = order[rank < top_k * 3]
+        results: List[List[Tuple[str, float]]] = [[] for _ in texts]
+        for row, col, score in zip(rows[kept].tolist(), cols[kept].tolist(), scores[kept].tolist()):
+            results[row].append((local_terms[col], score))
+        return [_prefer_phrases(candidates, top_k) for candidates in results]
+
+    def top_terms(self, text: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        return self.score_batch([text], top_k)[0]
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def _prefer_phrases(candidates: List[Tuple[str, float]], top_k: int) -> List[Tuple[str, float]]:
+    """Keeps the best terms, dropping a word once a chosen phrase already contains it (and vice versa)."""
+    chosen, covered = [], set()
+    for term, score in candidates:
+        words = set(term.split())
+        if words & covered:
+            continue
+        chosen.append((term, score))
+        covered |= words
+        if len(chosen) == top_k:
+            break
+    return chosen
+
+
+_index: Optional[KeywordIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_keyword_index() -> KeywordIndex:
+    """Returns the process-wide index, loading it from KEYWORD_INDEX_PATH on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = KeywordIndex()
+        return _index
+
+
+def close_keyword_index():
+    global _index
+    with _index_lock:
+        if _index is not None:
+            _index.close()
+            _index = None
@@ -0,0 +1,230 @@
+# backend/app/services/llm_cache.py
+import abc
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core import config
+from app.core.executor import run_sync
+
+
+def prompt_hash(payload: dict) -> str:
+    """Stable hash of a chat-completion payload (model, messages and sampling parameters)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CacheBackend(abc.ABC):
+    """Storage behind LLMCache. Values are JSON-serializable; expired entries read as missing."""
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """The value stored under `key`, or None if it is missing or expired."""
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: Any):
+        """Stores `value` under `key`, replacing any previous value."""
+
+    @abc.abstractmethod
+    async def clear(self):
+        """Drops every entry."""
+
+    def close(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU with a TTL."""
+
+    def __init__(self, ttl: float = config.LLM_CACHE_TTL, max_entries: int = config.LLM_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.time() - stored_at >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key, value):
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self):
+        self._entries.clear()
+
+
+class SQLiteBackend(CacheBackend):
+    """SQLite file shared across workers and restarts; least recently used rows go past max_entries."""
+
+    def __init__(self, path: str = config.LLM_CACHE_PATH, ttl: float = config.LLM_CACHE_TTL,
+                 max_entries: int = config.LLM_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_responses_accessed_at ON llm_responses (accessed_at)")
+        self._db.commit()
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM llm_responses WHERE key = ? AND stored_at > ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        return json.loads(row[0])
+
+    def _set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._db.execute("DELETE FROM llm_responses WHERE stored_at <= ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def _clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM llm_responses")
+            self._db.commit()
+
+    async def get(self, key):
+        return await run_sync(self._get, key)
+
+    async def set(self, key, value):
+        await run_sync(self._set, key, value)
+
+    async def clear(self):
+        await run_sync(self._clear)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class LLMCache:
+    """
+    Response cache in front of the LLM calls, keyed by prompt_hash(payload).
+
+    Concurrent identical requests are coalesced: the first caller makes the upstream
+    call and everyone else awaits its result. Failed calls are not cached.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend]):
+        self.backend = backend
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def lookup(self, payload: dict) -> Optional[Any]:
+        """Returns the cached response for `payload`, or None; counts towards hits/misses."""
+        if self.backend is None:
+            return None
+        value = await self.backend.get(prompt_hash(payload))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def store(self, payload: dict, value: Any):
+        if self.backend is not None:
+            await self.backend.set(prompt_hash(payload), value)
+
+    async def get_or_compute(self, payload: dict, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if self.backend is None:
+            return await compute()
+        key = prompt_hash(payload)
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._compute(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._compute_done(key, t))
+        return await asyncio.shield(task)
+
+    async def _compute(self, key, compute):
+        value = await compute()
+        await self.backend.set(key, value)
+        return value
+
+    def _compute_done(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark as retrieved even if every waiter has gone away
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        if self.backend is not None:
+            self.backend.close()
+
+
+def _backend_from_config() -> Optional[CacheBackend]:
+    if config.LLM_CACHE_BACKEND == "sqlite":
+        return SQLiteBackend()
+    if config.LLM_CACHE_BACKEND == "memory":
+        return MemoryBackend()
+    return None
+
+
+_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Returns the process-wide LLM cache, built from LLM_CACHE_* settings on first use."""
+    global _cache
+    if _cache is None:
+        _cache = LLMCache(_backend_from_config())
+    return _cache
+
+
+def close_llm_cache():
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
@@ -0,0 +1,193 @@
+# backend/app/services/llm_gateway.py
+import json
+import logging
+from typing import AsyncIterator, List, Optional
+
+import httpx
+
+from app.core import config
+from app.core.http_client import get_http_client
+from app.core.resilience import (Upstream, UpstreamError, UpstreamResponseError, api_request, check_response,
+                                 typed_errors)
+from app.services.llm_cache import LLMCache, get_llm_cache
+from app.services.model_router import get_model_router, model_upstream
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class LLMGateway:
+    """
+    Single entry point for chat completions against OpenRouter.
+
+    Builds the payload and auth headers, goes through the shared HTTP client and the
+    LLM response cache, and offers both a blocking `complete` and an SSE-backed
+    `stream` that yields content tokens as they arrive. Each model is its own
+    upstream (see resilience.py); failures raise UpstreamError. Calls made for a
+    `task` rather than a model go to the model the router picks and fall back along
+    the task's chain (see model_router.py).
+    """
+
+    def __init__(self, url: str = config.OPENROUTER_URL, api_key: Optional[str] = config.API_KEY,
+                 default_model: str = config.LLM_DEFAULT_MODEL, cache: Optional[LLMCache] = None,
+                 fallback_model: str = config.LLM_FALLBACK_MODEL):
+        self.url = url
+        self.default_model = default_model
+        self.fallback_model = fallback_model
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        self._cache = cache
+
+    @property
+    def cache(self) -> LLMCache:
+        return self._cache or get_llm_cache()
+
+    def build_payload(self, messages: List[dict], model: Optional[str] = None, **params) -> dict:
+        return {"model": model or self.default_model, "messages": messages, **params}
+
+    def upstream(self, model: str) -> Upstream:
+        return model_upstream(model)
+
+    async def _request(self, payload: dict) -> str:
+        upstream = self.upstream(payload["model"]).name
+        response = await api_request("POST", self.url, upstream, headers=self.headers, json=payload)
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise UpstreamResponseError(f"{upstream} sent a body that is not JSON", upstream) from e
+        if isinstance(body, dict) and "error" in body:  # OpenRouter relays a failed provider as a 200 with an error object
+            raise UpstreamResponseError(f"{upstream} failed: {body['error']}", upstream)
+        try:
+            content = body["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise UpstreamResponseError(f"{upstream} sent no completion: {str(body)[:200]}", upstream) from e
+        if not content:
+            raise UpstreamResponseError(f"{upstream} sent an empty completion", upstream)
+        return content
+
+    async def _call(self, payload: dict, fallback_model: Optional[str] = None) -> str:
+        """The completion through the model's upstream, hedged on `fallback_model` (default LLM_FALLBACK_MODEL)."""
+        fallback_model = fallback_model or self.fallback_model
+        fallback = None
+        if fallback_model and fallback_model != payload["model"]:
+            fallback_payload = {**payload, "model": fallback_model}
+
+            async def fallback():
+                return await self.upstream(fallback_model).call(lambda: self._request(fallback_payload), hedge=False)
+
+        return await self.upstream(payload["model"]).call(lambda: self._request(payload), fallback=fallback)
+
+    async def _routed(self, task: str, payload: dict) -> str:
+        """Tries the task's models in the router's order; each call is hedged on the next one."""
+        models = get_model_router().route(task)
+        for index, model in enumerate(models):
+            following = models[index + 1] if index + 1 < len(models) else None
+            try:
+                return await self._call({**payload, "model": model}, following)
+            except UpstreamError as e:
+                if following is None:
+                    raise
+                logger.warning("%s failed for %s, falling back to %s: %s", model, task, following, e)
+
+    def _key(self, messages: List[dict], model: Optional[str], task: Optional[str], **params) -> dict:
+        # Routed calls are cached per task, so an answer is reused whichever model gave it
+        routed = model is None and task is not None
+        return self.build_payload(messages, f"task:{task}" if routed else model, **params)
+
+    async def complete(self, messages: List[dict], model: Optional[str] = None, task: Optional[str] = None,
+                       **params) -> str:
+        """
+        Returns the full completion text from `model`, or the model routed to for `task`;
+        identical requests are served from the cache.
+        """
+        payload = self._key(messages, model, task, **params)
+        if model is None and task is not None:
+            return await self.cache.get_or_compute(payload, lambda: self._routed(task, payload))
+        return await self.cache.get_or_compute(payload, lambda: self._call(payload))
+
+    async def stream(self, messages: List[dict], model: Optional[str] = None, task: Optional[str] = None,
+                     **params) -> AsyncIterator[str]:
+        """
+        Yields completion tokens as the upstream produces them (OpenRouter `stream=True`).
+        A cached answer is yielded in one piece; a completed stream is written to the cache.
+        A stream that ends without a token raises UpstreamResponseError, like complete().
+        Streams go through the model's breaker but are not retried or hedged; a routed
+        stream falls back to the next model only if the failing one sent no token yet.
+        """
+        payload = self._key(messages, model, task, **params)
+        cached = await self.cache.lookup(payload)
+        if cached is not None:
+            yield cached
+            return
+
+        models = get_model_router().route(task) if model is None and task is not None else [payload["model"]]
+        parts = []
+        for index, candidate in enumerate(models):
+            try:
+                async for token in self._stream({**payload, "model": candidate}):
+                    parts.append(token)
+                    yield token
+                break
+            except UpstreamError as e:
+                if parts or index + 1 == len(models):
+                    raise
+                logger.warning("%s failed for %s, falling back to %s: %s", candidate, task, models[index + 1], e)
+        text = "".join(parts)
+        if text.strip():
+            await self.cache.store(payload, text)
+        else:
+            logger.warning("%s streamed only whitespace; not caching it", payload["model"])
+
+    async def _stream(self, payload: dict) -> AsyncIterator[str]:
+        upstream = self.upstream(payload["model"])
+        async with upstream.guard():
+            with typed_errors(upstream.name):
+                async with get_http_client().stream(
+                    "POST", self.url, headers=self.headers, json={**payload, "stream": True}
+                ) as response:
+                    if not response.is_success:
+                        await response.aread()
+                        check_response(response, upstream.name)
+                    sent = False
+                    async for token in parse_sse_tokens(response, upstream.name):
+                        sent = True
+                        yield token
+                    if not sent:  # raised inside the guard, so it counts against the model and can fall back
+                        raise UpstreamResponseError(f"{upstream.name} streamed an empty completion", upstream.name)
+
+
+async def parse_sse_tokens(response: httpx.Response, upstream: str = "") -> AsyncIterator[str]:
+    """
+    Parses an OpenAI-style server-sent event stream into content tokens.
+    Comment lines (OpenRouter's ": OPENROUTER PROCESSING" keep-alives) are skipped
+    and `data: [DONE]` ends the stream.
+    """
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            logger.warning("Skipping malformed SSE chunk: %s", data[:200])
+            continue
+        if "error" in chunk:
+            raise UpstreamResponseError(f"{upstream or 'upstream'} failed: {chunk['error']}", upstream)
+        choices = chunk.get("choices") or [{}]
+        token = (choices[0].get("delta") or {}).get("content")
+        if token:
+            yield token
+
+
+_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Returns the process-wide gateway."""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway()
+    return _gateway
@@ -0,0 +1,108 @@
+# backend/app/services/model_router.py
+"""
+Which model answers each kind of LLM call.
+
+Every task (summary, perspective, related_topics, fact_check) has a preference list
+of models and the lowest quality tier it accepts (LLM_TASK_ROUTES, with tiers from
+LLM_MODEL_TIERS). For each call, route() orders the task's qualifying models:
+
+- Healthy models come first. A healthy model's breaker is not open and its error
+  rate over the last LLM_ROUTER_ERROR_WINDOW seconds is at most
+  LLM_ROUTER_MAX_ERROR_RATE.
+- Healthy models are ordered fastest p50 latency first. A model with fewer than
+  LLM_ROUTER_MIN_SAMPLES measured calls goes ahead of the measured ones, so every
+  model gets measured.
+- Unhealthy models come last.
+
+The gateway tries the models in that order, so the list is also the fallback chain.
+Latencies and errors are the per-model ones kept by resilience.py.
+"""
+import time
+from typing import Dict, List, Optional
+
+from app.core import config
+from app.core.resilience import Upstream, get_upstream
+from app.utils.chunking import token_budget
+
+TIERS = ("light", "standard", "reasoning")
+
+
+def model_upstream(model: str) -> Upstream:
+    """The resilience Upstream (breaker, latencies, errors) of one OpenRouter model."""
+    return get_upstream(f"openrouter:{model}")
+
+
+class ModelRouter:
+    """Orders each task's models by health and measured latency; see the module docstring."""
+
+    def __init__(self, routes: Optional[Dict[str, dict]] = None, tiers: Optional[Dict[str, str]] = None,
+                 min_samples: int = config.LLM_ROUTER_MIN_SAMPLES,
+                 max_error_rate: float = config.LLM_ROUTER_MAX_ERROR_RATE,
+                 error_window: float = config.LLM_ROUTER_ERROR_WINDOW):
+        self.routes = config.LLM_TASK_ROUTES if routes is None else routes
+        self.tiers = config.LLM_MODEL_TIERS if tiers is None else tiers
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.error_window = error_window
+
+    def candidates(self, task: str) -> List[str]:
+        """The task's models that meet its tier, in preference order; LLM_DEFAULT_MODEL for an unknown task."""
+        route = self.routes.get(task)
+        if not route:
+            return [config.LLM_DEFAULT_MODEL]
+        floor = TIERS.index(route.get("tier", TIERS[0]))
+        qualified = [model for model in route["models"]
+                     if model not in self.tiers or TIERS.index(self.tiers[model]) >= floor]
+        return qualified or [config.LLM_DEFAULT_MODEL]
+
+    def healthy(self, model: str) -> bool:
+        upstream = model_upstream(model)
+        if upstream.breaker.is_open(time.monotonic()):
+            return False
+        outcomes = upstream.recent_outcomes(self.error_window)
+        return len(outcomes) < self.min_samples or sum(outcomes) / len(outcomes) <= self.max_error_rate
+
+    def _measured_p50(self, model: str) -> Optional[float]:
+        upstream = model_upstream(model)
+        return upstream.latency(0.5) if len(upstream.latencies) >= self.min_samples else None
+
+    def route(self, task: str) -> List[str]:
+        """The task's models in the order to try them: healthy ones fastest first, then the rest."""
+        candidates = self.candidates(task)
+        healthy = [model for model in candidates if self.healthy(model)]
+        p50 = {model: self._measured_p50(model) for model in healthy}
+        # Unmeasured models first (in preference order), then by p50; sorted() keeps preference order on ties
+        ranked = sorted(healthy, key=lambda model: (p50[model] is not None, p50[model] or 0.0))
+        return ranked + [model for model in candidates if model not in p50]
+
+    def token_budget(self, task: str) -> int:
+        """Input tokens a prompt for `task` may carry: the smallest budget along its chain, so any fallback fits."""
+        return min(token_budget(model) for model in self.candidates(task))
+
+    def stats(self) -> dict:
+        tasks = {}
+        for task, route in self.routes.items():
+            models = {}
+            for model in self.candidates(task):
+                upstream = model_upstream(model)
+                p50, p95 = upstream.latency(0.5), upstream.latency(0.95)
+                models[model] = {
+                    "tier": self.tiers.get(model),
+                    "healthy": self.healthy(model),
+                    "measured": len(upstream.latencies),
+                    "error_rate": round(upstream.error_rate(self.error_window), 3),
+                    "p50_seconds": round(p50, 3) if p50 is not None else None,
+                    "p95_seconds": round(p95, 3) if p95 is not None else None,
+                }
+            tasks[task] = {"tier": route.get("tier"), "route": self.route(task), "models": models}
+        return tasks
+
+
+_router: Optional[ModelRouter] = None
+
+
+def get_model_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        _router = ModelRouter()
+    return _router
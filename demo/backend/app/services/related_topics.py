@@ -1,39 +1,50 @@
 
-import requests
-import os
-import json
-from dotenv import load_dotenv
+import logging
+from app.core.executor import run_sync
+from app.core.resilience import UpstreamError
+from app.prompts.budget import PromptBudget
+from app.services.llm_gateway import get_llm_gateway
+from app.services.model_router import get_model_router
+from app.services.vector_store import search_corpus
 
-load_dotenv()
-API_KEY = os.getenv("API_KEY")
+logger = logging.getLogger("uvicorn.error")
 
-def generate_related_topics(summary: str):
-    url = "https://openrouter.ai/api/v1/chat/completions"
-    
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
+RELATED_TOPICS_COUNT = 5
+TASK = "related_topics"  # model route, see app/services/model_router.py
 
-    payload = json.dumps({
-        "model": "deepseek/deepseek-r1-zero:free",
-        "messages": [
-            {
-                "role": "system", 
-                "content": "You are an AI that only generates relevant links to topics based on a given summary."
-            },
-            {
-                "role": "user",
-                "content": f"Generate a list of 5 relevant online links based on this summary:\n{summary}"
-            }
-        ],
-    })
+async def generate_related_topics(summary: str, url: str = None):
+    """
+    Links related to the summary. Articles already analyzed (local vector store) come
+    first, leaving out `url` (the summarized article itself); the LLM is only asked for
+    the links still missing, if any.
+    """
+    local = await run_sync(search_corpus, summary, RELATED_TOPICS_COUNT, exclude_url=url, include_duplicates=False)
+    known = "\n".join(f"{match.title or match.url}: {match.url}" for match in local)
+    missing = RELATED_TOPICS_COUNT - len(local)
+    if not missing:
+        return known
 
-    response = requests.post(url, data=payload, headers=headers)
-    print(response)
-    if response.status_code == 200:
-        data = response.json()
-        ai_response = data["choices"][0]["message"]["content"]
-        return ai_response
-    else:
-        return ["Error fetching related topics"]
+    messages = [
+        {
+            "role": "system", 
+            "content": "You are an AI that only generates relevant links to topics based on a given summary."
+        },
+        {
+            "role": "user",
+            "content": PromptBudget(budget=get_model_router().token_budget(TASK)).text("summary", summary).fill(
+                f"Generate a list of {missing} relevant online links based on this summary:\n{{summary}}"
+            )
+        }
+    ]
+
+    try:
+        topics = await get_llm_gateway().complete(messages, task=TASK)
+        return f"{known}\n{topics}" if known else topics
+    except UpstreamError:
+        if not known:
+            raise  # nothing to show; the route answers 503
+        logger.warning("Related topics: the LLM is unavailable, returning %d local articles only", len(local))
+        return known
+    except Exception as e:
+        logger.error("Error in related topics service: %s", e)
+        return known or ["Error fetching related topics"]
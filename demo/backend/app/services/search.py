@@ -0,0 +1,325 @@
+# backend/app/services/search.py
+"""
+Web search behind one interface, shared by deep research and fact-checking.
+
+Each provider turns a query into typed SearchResults or raises SearchError. The
+SearchService queries every configured provider concurrently, either taking the
+first useful answer ("first") or merging all answers round-robin without duplicate
+URLs ("merge"). Results are cached with a TTL, and concurrent identical queries
+share one upstream call.
+"""
+import abc
+import asyncio
+import hashlib
+import logging
+import time
+import urllib.parse
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+from app.core import config
+from app.core.executor import run_sync
+from app.core.http_client import get_http_client
+from app.core.resilience import UpstreamError, UpstreamResponseError, api_request, get_upstream
+from app.scrapers.extraction import make_soup
+from app.scrapers.page_cache import normalize_url
+
+logger = logging.getLogger("uvicorn.error")
+
+MODES = ("first", "merge")
+
+
+class SearchError(Exception):
+    """A provider (or every provider) failed to answer a query."""
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    title: str
+    url: str
+    snippet: str = ""
+    score: Optional[float] = None
+    provider: str = ""
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SearchProvider(abc.ABC):
+    name = "provider"
+
+    @property
+    def available(self) -> bool:
+        """False when the provider cannot be used at all (e.g. a missing API key)."""
+        return True
+
+    @abc.abstractmethod
+    async def search(self, query: str, max_results: int) -> List[SearchResult]:
+        """Up to `max_results` results for `query`; raises SearchError when the search itself failed."""
+
+
+def parse_duckduckgo_results(html: str, limit: int = 5) -> List[SearchResult]:
+    """Parses result titles, target links and snippets out of a DuckDuckGo HTML results page."""
+    soup = make_soup(html)
+    results = []
+    for result in soup.find_all("a", class_="result__a"):
+        link = urllib.parse.parse_qs(urllib.parse.urlparse(result["href"]).query).get("uddg", [None])[0]
+        if not link:
+            continue
+        container = result.find_parent(class_="result")
+        snippet = container.find(class_="result__snippet") if container is not None else None
+        results.append(SearchResult(
+            title=result.get_text(strip=True),
+            url=link,
+            snippet=snippet.get_text(" ", strip=True) if snippet is not None else "",
+            provider=DuckDuckGoProvider.name,
+        ))
+        if len(results) == limit:
+            break
+    return results
+
+
+class DuckDuckGoProvider(SearchProvider):
+    """Scrapes DuckDuckGo's HTML results page; needs no API key."""
+    name = "duckduckgo"
+
+    def __init__(self, url: str = config.DUCKDUCKGO_URL):
+        self.url = url
+
+    async def search(self, query, max_results):
+        search_url = httpx.URL(self.url).copy_merge_params({"q": query})
+        try:
+            response = await get_http_client().get(search_url, headers={"User-Agent": "Mozilla/5.0"})
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise SearchError(f"DuckDuckGo search failed: {e!r}") from e
+        return await run_sync(parse_duckduckgo_results, response.text, max_results)
+
+
+class TavilyProvider(SearchProvider):
+    """Tavily's /search API, retried and broken by resilience.py; results carry a snippet and a relevance score."""
+    name = "tavily"
+
+    def __init__(self, api_key: Optional[str] = config.TAVILY_API_KEY, url: str = config.TAVILY_URL):
+        self.api_key = api_key
+        self.url = url
+
+    @property
+    def available(self):
+        return bool(self.api_key)
+
+    async def search(self, query, max_results):
+        payload = {
+            "query": query,
+            "topic": "general",
+            "search_depth": "basic",
+            "max_results": max_results,
+            "days": 3,
+            "include_answer": False,
+            "include_raw_content": False,
+            "include_images": False,
+        }
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+        async def attempt():
+            response = await api_request("POST", self.url, self.name, json=payload, headers=headers)
+            try:
+                return response.json().get("results", [])
+            except (ValueError, AttributeError) as e:
+                raise UpstreamResponseError(f"Tavily sent no results: {response.text[:200]}", self.name) from e
+
+        try:
+            results = await get_upstream(self.name).call(attempt)
+        except UpstreamError as e:
+            raise SearchError(f"Tavily search failed: {e}") from e
+        return [
+            SearchResult(
+                title=item.get("title", ""),
+                url=item["url"],
+                snippet=item.get("content", ""),
+                score=item.get("score"),
+                provider=self.name,
+            )
+            for item in results if isinstance(item, dict) and item.get("url")
+        ][:max_results]
+
+
+class FakeProvider(SearchProvider):
+    """
+    Offline provider with deterministic results derived from the query, for tests,
+    benchmarks and running without network access. `delay` simulates latency and
+    `fail` makes every search raise SearchError.
+    """
+
+    def __init__(self, name: str = "fake", base_url: str = "https://example.com", delay: float = 0.0,
+                 fail: bool = False):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def search(self, query, max_results):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise SearchError(f"{self.name} is failing")
+        slug = hashlib.sha1(query.encode()).hexdigest()[:8]
+        return [
+            SearchResult(title=f"{query} ({i + 1})", url=f"{self.base_url}/{slug}/{i}",
+                         snippet=f"Result {i + 1} for {query}.", score=1 - i / max_results, provider=self.name)
+            for i in range(max_results)
+        ]
+
+
+PROVIDERS = {
+    "duckduckgo": DuckDuckGoProvider,
+    "tavily": TavilyProvider,
+    "fake": FakeProvider,
+}
+
+
+def merge_results(answers: Sequence[List[SearchResult]], max_results: int) -> List[SearchResult]:
+    """Interleaves the providers' rankings (best of each first), skipping URLs already taken."""
+    merged, seen = [], set()
+    for rank in range(max((len(answer) for answer in answers), default=0)):
+        for answer in answers:
+            if rank < len(answer):
+                key = normalize_url(answer[rank].url)
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(answer[rank])
+                    if len(merged) == max_results:
+                        return merged
+    return merged
+
+
+class SearchService:
+    """Concurrent querying over `providers` (in preference order) with a TTL cache in front."""
+
+    def __init__(self, providers: Sequence[SearchProvider], mode: str = config.SEARCH_MODE,
+                 timeout: float = config.SEARCH_TIMEOUT, cache_ttl: float = config.SEARCH_CACHE_TTL,
+                 cache_max_entries: int = config.SEARCH_CACHE_MAX_ENTRIES):
+        if mode not in MODES:
+            raise ValueError(f"Unknown search mode {mode!r}; use one of {MODES}")
+        self.providers = [provider for provider in providers if provider.available]
+        self.mode = mode
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def search(self, query: str, max_results: int = 5, mode: Optional[str] = None) -> List[SearchResult]:
+        """
+        Results for `query`, at most `max_results`. Raises SearchError only when every
+        provider failed; a provider that times out or errors is otherwise skipped.
+        """
+        mode = mode or self.mode
+        key = (mode, " ".join(query.lower().split()), max_results)
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.cache_ttl:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._search_uncached(key, query, max_results, mode))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._search_done(key, t))
+        return list(await asyncio.shield(task))
+
+    async def _search_uncached(self, key, query, max_results, mode):
+        if not self.providers:
+            raise SearchError("No search provider is configured")
+        if mode == "first":
+            results = await self._first(query, max_results)
+        else:
+            results = await self._merged(query, max_results)
+        self._cache[key] = (time.monotonic(), results)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+        return results
+
+    def _search_done(self, key, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark as retrieved even if every waiter has gone away
+
+    async def _query(self, provider: SearchProvider, query: str, max_results: int) -> List[SearchResult]:
+        try:
+            async with asyncio.timeout(self.timeout):
+                return await provider.search(query, max_results)
+        except TimeoutError:
+            raise SearchError(f"{provider.name} did not answer within {self.timeout}s")
+
+    async def _first(self, query, max_results):
+        """The first provider to return any results wins; the others are cancelled."""
+        tasks = {asyncio.create_task(self._query(p, query, max_results)): p for p in self.providers}
+        errors = []
+        try:
+            for finished in asyncio.as_completed(tasks):
+                try:
+                    results = await finished
+                except SearchError as e:
+                    errors.append(str(e))
+                    continue
+                if results:
+                    return results
+        finally:
+            for task in tasks:
+                task.cancel()
+        if len(errors) == len(tasks):
+            raise SearchError("; ".join(errors))
+        return []
+
+    async def _merged(self, query, max_results):
+        answers = await asyncio.gather(*(self._query(p, query, max_results) for p in self.providers),
+                                       return_exceptions=True)
+        errors = [a for a in answers if isinstance(a, BaseException)]
+        for error in errors:
+            if not isinstance(error, SearchError):
+                raise error
+            logger.warning("Search provider failed: %s", error)
+        if len(errors) == len(answers):
+            raise SearchError("; ".join(map(str, errors)))
+        return merge_results([a for a in answers if not isinstance(a, BaseException)], max_results)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "providers": [provider.name for provider in self.providers],
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+
+_service: Optional[SearchService] = None
+
+
+def get_search_service() -> SearchService:
+    """Returns the process-wide service over SEARCH_PROVIDERS (unknown names are skipped with a warning)."""
+    global _service
+    if _service is None:
+        providers = []
+        for name in config.SEARCH_PROVIDERS:
+            if name not in PROVIDERS:
+                logger.warning("Unknown search provider %r in SEARCH_PROVIDERS", name)
+                continue
+            providers.append(PROVIDERS[name]())
+        _service = SearchService(providers)
+    return _service
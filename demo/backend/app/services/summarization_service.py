@@ -1,52 +1,86 @@
 
-import requests
-import os
-import json
-from dotenv import load_dotenv
+import asyncio
 import logging
+from app.core.config import SUMMARY_MAP_CONCURRENCY
+from app.core.resilience import UpstreamError
+from app.services.llm_gateway import get_llm_gateway
+from app.services.model_router import get_model_router
+from app.utils.chunking import chunk_text, estimate_tokens
 
-load_dotenv()
-openrouter_token = os.getenv("API_KEY")
+logger = logging.getLogger("uvicorn.error")
 
-Summarization_URL = "https://openrouter.ai/api/v1/chat/completions"
-headers = {
-    "Authorization": f"Bearer {openrouter_token}",
-    "Content-Type": "application/json",
-}
+TASK = "summary"  # model route, see app/services/model_router.py
 
-logger = logging.getLogger("uvicorn.error")
+# Reduce rounds before giving up on shrinking the partial summaries any further
+MAX_REDUCE_LEVELS = 4
+
+def build_summary_messages(text):
+    return [
+        {
+            "role": "system",
+            "content": "You are a helpful assistant that provides concise and accurate summaries."
+        },
+        {
+            "role": "user",
+            "content": f"Please provide a concise summary of the following text:\n\n{text}"
+        }
+    ]
+
+def build_chunk_messages(chunk, index, total):
+    return [
+        {
+            "role": "system",
+            "content": "You are a helpful assistant that provides concise and accurate summaries."
+        },
+        {
+            "role": "user",
+            "content": (f"This is part {index} of {total} of a longer article. Summarize the key facts, "
+                        f"claims and names in this part concisely:\n\n{chunk}")
+        }
+    ]
+
+async def _summarize_chunks(chunks):
+    """Map step: summarizes every chunk in parallel, at most SUMMARY_MAP_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(SUMMARY_MAP_CONCURRENCY)
+    gateway = get_llm_gateway()
 
-def summarize_text(payload):
-    print("h")
+    async def summarize(index, chunk):
+        async with semaphore:
+            return await gateway.complete(build_chunk_messages(chunk, index, len(chunks)), task=TASK)
+
+    return await asyncio.gather(*(summarize(i, chunk) for i, chunk in enumerate(chunks, 1)))
+
+async def reduce_to_budget(text, budget=None):
+    """
+    Returns `text` unchanged if it fits the model's prompt budget; otherwise splits it at
+    sentence boundaries, summarizes the chunks in parallel and repeats on the joined
+    partial summaries until they fit. Latency grows with the number of levels, not chunks.
+    """
+    budget = budget or get_model_router().token_budget(TASK)
+    for level in range(MAX_REDUCE_LEVELS):
+        if estimate_tokens(text) <= budget:
+            return text
+        chunks = chunk_text(text, budget)
+        logger.info("Summarizing %d chunks (level %d, ~%d tokens)", len(chunks), level + 1, estimate_tokens(text))
+        text = "\n\n".join(await _summarize_chunks(chunks))
+    return text
+
+async def summarize_text(payload):
     try:
-        openrouter_payload = json.dumps({
-            "model": "deepseek/deepseek-r1-zero:free",
-            "messages": [
-                {
-                    "role": "system", 
-                    "content": "You are a helpful assistant that provides concise and accurate summaries."
-                },
-                {
-                    "role": "user", 
-                    "content": f"Please provide a concise summary of the following text:\n\n{payload['inputs']}"
-                }
-            ],
-        })
-        print(openrouter_payload)
-        
-        response = requests.post(Summarization_URL, headers=headers, data=openrouter_payload)
-        
-        print("Summarization API response status: %s", response.status_code)
-        print("Summarization API response text: %s", response.text)
-        
-        if response.status_code != 200 or not response.text:
-            raise Exception(f"Summarization API error, status code {response.status_code}")
-        
-        summary_response = response.json()
-        summary = summary_response['choices'][0]['message']['content']
-        
-        return summary
-    
+        text = await reduce_to_budget(payload['inputs'])
+        return await get_llm_gateway().complete(build_summary_messages(text), task=TASK)
+
+    except UpstreamError:
+        raise
     except Exception as e:
-        print("Error in summarization service: %s", e)
+        logger.error("Error in summarization service: %s", e)
         raise Exception("Error in summarization service: " + str(e))
+
+async def stream_summary(text):
+    """
+    Yields the summary of `text` token by token as the model produces it.
+    Long text is reduced first (see reduce_to_budget); only the final summary streams.
+    """
+    text = await reduce_to_budget(text)
+    async for token in get_llm_gateway().stream(build_summary_messages(text), task=TASK):
+        yield token
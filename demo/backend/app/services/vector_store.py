@@ -0,0 +1,315 @@
+# backend/app/services/vector_store.py
+"""
+Local vector index of every analyzed article, used to spot near-duplicates (the same
+wire story on several outlets) and to find related articles without a web search.
+
+Embeddings are hashed word and bigram counts, so they need no model and are stable
+across processes. Vectors sit in a memory-mapped float32 file that grows by doubling,
+and metadata is kept in SQLite beside it. Small stores are searched exactly. Once a
+store reaches VECTOR_ANN_MIN_ROWS, an IVF index (k-means buckets, only the closest
+VECTOR_ANN_NPROBE buckets are scanned) takes over, and it is rebuilt each time the
+store doubles. Training runs on the offload pool, off the write that triggered it;
+searches use the exact scan (or the previous index) until the new index is swapped in.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core import config
+from app.core.executor import get_executor
+from app.scrapers.page_cache import cache_key, normalize_url
+from app.services.keywords import extract_terms
+from app.utils.chunking import leading_sentences
+
+logger = logging.getLogger("uvicorn.error")
+
+VECTORS_FILE = "vectors.f32"
+ENTRIES_FILE = "entries.sqlite3"
+IVF_FILE = "ivf.npz"
+SNIPPET_CHARS = 500
+INITIAL_CAPACITY = 1024
+
+
+def embed(text: str, dim: int = config.VECTOR_DIM) -> np.ndarray:
+    """
+    Unit-length hashed feature vector of the text's content words and bigrams
+    (signed feature hashing, log-scaled counts); all zeros for text without any.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    terms = extract_terms(text)
+    if not terms:
+        return vector
+    hashes = np.fromiter((zlib.crc32(term.encode()) for term in terms), dtype=np.uint32, count=len(terms))
+    hashes, counts = np.unique(hashes, return_counts=True)
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+    vector += np.bincount(hashes % dim, weights=signs * (1 + np.log(counts)), minlength=dim).astype(np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@dataclass
+class Match:
+    url: str
+    title: str
+    snippet: str
+    score: float
+
+
+class IVFIndex:
+    """Rows bucketed by their nearest (spherical) k-means centroid, stored CSR-style: `order` sliced by `offsets`."""
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+
+    @property
+    def size(self) -> int:
+        return len(self.order)
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, iterations: int = 8, sample: int = 20000, seed: int = 0) -> "IVFIndex":
+        rng = np.random.default_rng(seed)
+        n_lists = max(1, int(np.sqrt(len(vectors))))
+        training = vectors[np.sort(rng.choice(len(vectors), min(sample, len(vectors)), replace=False))]
+        centroids = training[rng.choice(len(training), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = (training @ centroids.T).argmax(axis=1)
+            for bucket in range(n_lists):
+                members = training[assignment == bucket]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[bucket] = centroid / (np.linalg.norm(centroid) or 1)
+        assignment = np.concatenate([
+            (vectors[start:start + 16384] @ centroids.T).argmax(axis=1)
+            for start in range(0, len(vectors), 16384)
+        ])
+        order = np.argsort(assignment, kind="stable")
+        offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+        return cls(centroids, order, offsets)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        scores = self.centroids @ query
+        probed = np.argpartition(-scores, min(nprobe, len(scores)) - 1)[:nprobe]
+        return np.concatenate([self.order[self.offsets[b]:self.offsets[b + 1]] for b in probed])
+
+    def save(self, path: str):
+        np.savez(path, centroids=self.centroids, order=self.order, offsets=self.offsets)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path) as data:
+            return cls(data["centroids"], data["order"], data["offsets"])
+
+
+class VectorStore:
+    """
+    One vector per article (normalized URL). `directory` holds the memory-mapped
+    vectors, the metadata and the IVF index; without one the store lives in memory.
+    Thread-safe; callers on the event loop go through run_sync.
+    """
+
+    def __init__(self, directory: Optional[str] = config.VECTOR_STORE_DIR, dim: int = config.VECTOR_DIM,
+                 ann_min_rows: int = config.VECTOR_ANN_MIN_ROWS, nprobe: int = config.VECTOR_ANN_NPROBE):
+        self.directory = directory
+        self.dim = dim
+        self.ann_min_rows = ann_min_rows
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+        self._building = False
+        self._build: Optional[Future] = None
+        self._ivf: Optional[IVFIndex] = None
+        self._stale = set()  # rows overwritten since the IVF index was built
+        self._rewritten = set()  # rows overwritten while the next IVF index is being trained
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, ENTRIES_FILE) if directory else ":memory:",
+                                   check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (row INTEGER PRIMARY KEY, url_hash TEXT UNIQUE NOT NULL, "
+            "url TEXT NOT NULL, title TEXT, snippet TEXT, added_at REAL)"
+        )
+        self._db.commit()
+        self._rows = dict(self._db.execute("SELECT url_hash, row FROM entries"))
+        self.size = len(self._rows)
+        self._vectors = self._open_vectors(max(INITIAL_CAPACITY, self.size))
+        if directory and os.path.exists(os.path.join(directory, IVF_FILE)):
+            ivf = IVFIndex.load(os.path.join(directory, IVF_FILE))
+            if ivf.size <= self.size and ivf.centroids.shape[1] == dim:
+                self._ivf = ivf
+
+    def _open_vectors(self, capacity: int) -> np.ndarray:
+        if not self.directory:
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            if self.size:
+                vectors[:len(self._vectors)] = self._vectors
+            return vectors
+        path = os.path.join(self.directory, VECTORS_FILE)
+        existing = os.path.getsize(path) // (4 * self.dim) if os.path.exists(path) else 0
+        if existing < capacity:
+            with open(path, "ab") as f:
+                f.truncate(capacity * 4 * self.dim)  # sparse file; pages are only allocated as rows are written
+        return np.memmap(path, dtype=np.float32, mode="r+", shape=(max(existing, capacity), self.dim))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, url: str, text: str, title: str = "") -> int:
+        """Indexes (or re-indexes) the article at `url`; returns its row."""
+        return self.add_vectors([(url, embed(text, self.dim), title, leading_sentences(text, SNIPPET_CHARS))])[0]
+
+    def add_vectors(self, items: Iterable[Tuple[str, np.ndarray, str, str]]) -> List[int]:
+        """Stores (url, unit vector, title, snippet) items in one transaction; returns their rows."""
+        rows = []
+        with self._lock:
+            for url, vector, title, snippet in items:
+                url_hash = cache_key(url)
+                row = self._rows.get(url_hash)
+                if row is None:
+                    row = self._rows[url_hash] = self.size
+                    self.size += 1
+                    if row >= len(self._vectors):
+                        if isinstance(self._vectors, np.memmap):
+                            self._vectors.flush()
+                        self._vectors = self._open_vectors(2 * len(self._vectors))
+                else:
+                    if self._ivf is not None and row < self._ivf.size:
+                        self._stale.add(row)
+                    if self._building:
+                        self._rewritten.add(row)  # the index being trained may have its old vector
+                self._vectors[row] = vector
+                self._db.execute(
+                    "INSERT INTO entries (row, url_hash, url, title, snippet, added_at) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(url_hash) DO UPDATE SET title = excluded.title, snippet = excluded.snippet, "
+                    "added_at = excluded.added_at",
+                    (row, url_hash, normalize_url(url), title, snippet, time.time()),
+                )
+                rows.append(row)
+            self._db.commit()
+            rebuild = self._needs_rebuild()
+            if rebuild:
+                self._building = True
+        if rebuild:
+            self._build = get_executor().submit(self._build_in_background)
+        return rows
+
+    def _build_in_background(self):
+        try:
+            self.build_ann_index()
+        except Exception:
+            logger.exception("Building the IVF index failed; searches stay on the previous one")
+
+    def _needs_rebuild(self) -> bool:
+        if self._building or self.size < self.ann_min_rows:
+            return False
+        return self._ivf is None or self.size >= 2 * self._ivf.size
+
+    def build_ann_index(self):
+        """(Re)trains the IVF index over every stored vector; searches keep running meanwhile."""
+        with self._lock:
+            size, vectors = self.size, self._vectors
+            self._rewritten = set()
+            self._building = True
+        try:
+            started = time.perf_counter()
+            ivf = IVFIndex.train(np.asarray(vectors[:size]))
+            if self.directory:
+                ivf.save(os.path.join(self.directory, IVF_FILE))
+            with self._lock:
+                self._ivf = ivf
+                self._stale = {row for row in self._stale if row >= size} | self._rewritten
+            logger.info("Built IVF index over %d vectors (%d lists) in %.1fs",
+                        size, len(ivf.centroids), time.perf_counter() - started)
+        finally:
+            self._building = False
+
+    def search(self, query: np.ndarray, k: int = 5, min_score: float = 0.0, max_score: float = 1.01,
+               exclude_url: Optional[str] = None) -> List[Match]:
+        """Up to `k` stored articles by cosine similarity to `query`, best first, within [min_score, max_score)."""
+        with self._lock:
+            size, vectors, ivf = self.size, self._vectors, self._ivf
+            stale = np.fromiter(self._stale, dtype=np.int64, count=len(self._stale))
+        if not size or not query.any():
+            return []
+        if ivf is None or size < self.ann_min_rows:
+            rows = np.arange(size)
+            scores = vectors[:size] @ query
+        else:
+            rows = np.unique(np.concatenate([ivf.candidates(query, self.nprobe), np.arange(ivf.size, size), stale]))
+            scores = vectors[rows] @ query
+        in_range = (scores >= min_score) & (scores < max_score)
+        rows, scores = rows[in_range], scores[in_range]
+        exclude_row = self._rows.get(cache_key(exclude_url)) if exclude_url else None
+        keep = min(k + 1, len(scores))
+        if not keep:
+            return []
+        top = np.argpartition(-scores, keep - 1)[:keep]
+        top = top[np.argsort(-scores[top])]
+        matches = []
+        for position in top:
+            row = int(rows[position])
+            if row == exclude_row:
+                continue
+            with self._lock:
+                url, title, snippet = self._db.execute(
+                    "SELECT url, title, snippet FROM entries WHERE row = ?", (row,)
+                ).fetchone()
+            matches.append(Match(url, title or "", snippet or "", float(scores[position])))
+        return matches[:k]
+
+    def close(self):
+        if self._build is not None:
+            self._build.result()  # let a running build finish before its files are closed
+        with self._lock:
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            self._db.close()
+
+
+_store: Optional[VectorStore] = None
+_store_lock = threading.Lock()
+
+
+def get_vector_store() -> VectorStore:
+    """Returns the process-wide store, opening VECTOR_STORE_DIR on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = VectorStore()
+        return _store
+
+
+def close_vector_store():
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+
+def index_article(url: str, text: str, title: str = ""):
+    get_vector_store().add(url, text, title)
+
+
+def find_near_duplicate(url: str, text: str) -> Optional[Match]:
+    """The most similar other stored article if it is at least NEAR_DUPLICATE_THRESHOLD similar, else None."""
+    matches = get_vector_store().search(embed(text), k=1, min_score=config.NEAR_DUPLICATE_THRESHOLD, exclude_url=url)
+    return matches[0] if matches else None
+
+
+def search_corpus(text: str, k: int, exclude_url: Optional[str] = None, include_duplicates: bool = True) -> List[Match]:
+    """
+    Stored articles related to `text` (at least VECTOR_RELATED_MIN_SCORE similar), best first.
+    `include_duplicates=False` leaves out near-duplicates, which add nothing as extra sources.
+    """
+    max_score = 1.01 if include_duplicates else config.NEAR_DUPLICATE_THRESHOLD
+    return get_vector_store().search(embed(text), k=k, min_score=config.VECTOR_RELATED_MIN_SCORE,
+                                     max_score=max_score, exclude_url=exclude_url)
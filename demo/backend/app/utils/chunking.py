@@ -0,0 +1,90 @@
+# backend/app/utils/chunking.py
+import logging
+import math
+import re
+from typing import List
+
+from app.core import config
+
+logger = logging.getLogger("uvicorn.error")
+
+# Fallback when the punkt data is not installed: split after . ! ? followed by whitespace
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+_punkt_available = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (CHARS_PER_TOKEN characters per token); good enough for budgeting prompts."""
+    return math.ceil(len(text) / config.CHARS_PER_TOKEN)
+
+
+def token_budget(model: str = None) -> int:
+    """Input tokens one prompt may carry for `model` (LLM_MODEL_TOKEN_BUDGETS, else LLM_CHUNK_TOKENS)."""
+    return config.LLM_MODEL_TOKEN_BUDGETS.get(model or config.LLM_DEFAULT_MODEL, config.LLM_CHUNK_TOKENS)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentence-splits with nltk's punkt model (see download_nltk_resources.py), or a regex if it is missing."""
+    global _punkt_available
+    if _punkt_available is not False:
+        try:
+            from nltk.tokenize import sent_tokenize
+            sentences = sent_tokenize(text)
+            _punkt_available = True
+            return sentences
+        except (ImportError, LookupError):
+            logger.warning("nltk punkt data not found; splitting sentences with a regex")
+            _punkt_available = False
+    return [s for s in SENTENCE_END_RE.split(text.strip()) if s]
+
+
+def _split_long_sentence(sentence: str, max_tokens: int) -> List[str]:
+    max_chars = max_tokens * config.CHARS_PER_TOKEN
+    pieces, current = [], ""
+    words = (word[i:i + max_chars] for word in sentence.split() for i in range(0, len(word), max_chars))
+    for word in words:
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Packs whole sentences into chunks of at most `max_tokens` (estimated) each.
+    A sentence that alone exceeds the budget is split at word boundaries.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for sentence in split_sentences(text):
+        sentence_tokens = estimate_tokens(sentence) + 1
+        if sentence_tokens > max_tokens:
+            pieces = _split_long_sentence(sentence, max_tokens)
+        else:
+            pieces = [sentence]
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece) + 1
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def leading_sentences(text: str, max_chars: int) -> str:
+    """As many whole leading sentences of `text` as fit in `max_chars` (cut at a word if the first does not)."""
+    result = ""
+    for sentence in split_sentences(text):
+        candidate = f"{result} {sentence}" if result else sentence
+        if len(candidate) > max_chars:
+            break
+        result = candidate
+    if not result:
+        result = text[:max_chars].rsplit(" ", 1)[0] if " " in text[:max_chars] else text[:max_chars]
+    return result
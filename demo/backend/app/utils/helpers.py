@@ -0,0 +1,16 @@
+# backend/app/utils/helpers.py
+import json
+
+
+def format_sse(data, event=None):
+    """Formats one server-sent event; `data` is JSON-encoded unless it is already a string."""
+    if not isinstance(data, str):
+        data = json.dumps(data)
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def format_ndjson(data):
+    """One newline-delimited JSON record."""
+    return json.dumps(data) + "\n"
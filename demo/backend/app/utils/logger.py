@@ -0,0 +1,7 @@
+# backend/app/utils/logger.py
+import logging
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Child of uvicorn's error logger, so module logs share the server's handlers and level."""
+    return logging.getLogger("uvicorn.error").getChild(name)
@@ -0,0 +1,131 @@
+# backend/benchmarks/bench_batch.py
+"""
+Ingestion throughput: N articles through /scrape-and-summarize as one HTTP call per
+URL (one at a time, and with many calls in flight) against a single NDJSON call to
+/scrape-and-summarize/batch. The app runs as one uvicorn worker. Articles are spread
+over several stub sites, each a stub server on its own loopback address, and some
+URLs are repeated. The output gives throughput, time to the first result, and the
+most requests any one site saw at once (the batch keeps this within
+BATCH_PER_HOST_CONCURRENCY).
+
+    python -m benchmarks.bench_batch [--articles 200] [--sites 8] [--in-flight 32]
+                                     [--page-delay 0.05] [--llm-delay 0.2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.load_concurrency import _free_port, start_app
+from benchmarks.stub_server import StubServer
+
+
+def article_urls(sites, count, run, page_delay, repeat_share, rng):
+    urls = [f"{sites[i % len(sites)].url}/article?delay={page_delay}&run={run}&n={i}" for i in range(count)]
+    urls += rng.sample(urls, int(count * repeat_share))
+    rng.shuffle(urls)
+    return urls
+
+
+async def one_call_per_url(base_url, urls, in_flight):
+    first = None
+    semaphore = asyncio.Semaphore(in_flight)
+    limits = httpx.Limits(max_connections=in_flight, max_keepalive_connections=in_flight)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        async def call(url):
+            nonlocal first
+            async with semaphore:
+                response = await client.post("/scrape-and-summarize", json={"url": url})
+                response.raise_for_status()
+                first = first or time.perf_counter()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(call(url) for url in urls))
+        return time.perf_counter() - start, first - start, len(urls)
+
+
+async def batch_call(base_url, urls):
+    first, records = None, 0
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        start = time.perf_counter()
+        async with client.stream("POST", "/scrape-and-summarize/batch", json={"urls": urls}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                record = json.loads(line)
+                if "summary" in record and "url" not in record:
+                    summary = record["summary"]
+                    continue
+                if record["status"] != "ok":
+                    raise RuntimeError(f"{record['url']}: {record['error']}")
+                first = first or time.perf_counter()
+                records += 1
+        elapsed = time.perf_counter() - start
+    assert summary["succeeded"] == records
+    return elapsed, first - start, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--sites", type=int, default=8)
+    parser.add_argument("--in-flight", type=int, default=32, help="client-side concurrency for one call per URL")
+    parser.add_argument("--repeat-share", type=float, default=0.1, help="extra URLs that repeat earlier ones")
+    parser.add_argument("--page-delay", type=float, default=0.05)
+    parser.add_argument("--llm-delay", type=float, default=0.2)
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    sites = [StubServer(host=f"127.0.0.{i + 1}").__enter__() for i in range(args.sites)]
+    tmp = tempfile.TemporaryDirectory()
+    try:
+        env = dict(
+            os.environ,
+            OPENROUTER_URL=f"{sites[0].url}/chat/completions?delay={args.llm_delay}",
+            SEARCH_PROVIDERS="fake",
+            HTTP2_ENABLED="false",
+            RATE_LIMIT_ENABLED="false",  # measures the batch scheduler alone
+            LLM_CACHE_BACKEND="none",  # every stub article reads the same, so cached summaries would flatter
+            NEAR_DUPLICATE_THRESHOLD="1.01",  # ...and so would reusing another article's analysis
+            VECTOR_STORE_DIR="",
+            KEYWORD_INDEX_PATH="",
+            DATABASE_URL=f"sqlite+aiosqlite:///{tmp.name}/deeplens.sqlite3",
+            JOB_DB_PATH=os.path.join(tmp.name, "jobs.sqlite3"),
+        )
+        port = _free_port()
+        process = start_app(port, env)
+        base_url = f"http://127.0.0.1:{port}"
+        modes = [("one call per URL, sequential", lambda urls: one_call_per_url(base_url, urls, 1)),
+                 (f"one call per URL, {args.in_flight} in flight",
+                  lambda urls: one_call_per_url(base_url, urls, args.in_flight)),
+                 ("one batch call (NDJSON)", lambda urls: batch_call(base_url, urls))]
+        if args.skip_sequential:
+            modes = modes[1:]
+        try:
+            print(f"{args.articles} articles (+{args.repeat_share:.0%} repeats) on {args.sites} sites, "
+                  f"page {args.page_delay}s, llm {args.llm_delay}s")
+            print(f"{'mode':34} {'seconds':>8} {'urls/s':>7} {'first':>7} {'results':>7} {'max/site':>8}")
+            for run, (label, measure) in enumerate(modes):
+                for site in sites:
+                    site.httpd.max_in_flight = 0
+                urls = article_urls(sites, args.articles, run, args.page_delay, args.repeat_share, rng)
+                elapsed, first, results = asyncio.run(measure(urls))
+                busiest = max(site.max_in_flight for site in sites)
+                print(f"{label:34} {elapsed:8.2f} {len(urls) / elapsed:7.1f} {first:6.2f}s {results:>7} "
+                      f"{busiest:>8}")
+        finally:
+            process.terminate()
+            process.wait()
+    finally:
+        for site in sites:
+            site.__exit__(None, None, None)
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# backend/benchmarks/bench_cleaning.py
+"""
+Text cleaning throughput in MB/s over a corpus built from the saved fixture pages
+(plus non-English text), comparing the original two uncompiled re.sub passes with
+TextCleaner in each mode, one document at a time and as a batch.
+
+    python -m benchmarks.bench_cleaning [--mb 20] [--docs 2000]
+"""
+import argparse
+import os
+import re
+import time
+
+from app.scrapers.clean_data import TextCleaner
+from app.scrapers.extraction import make_soup
+from benchmarks.bench_extraction import FIXTURES_DIR
+
+MULTILINGUAL = (
+    "Le gouvernement a présenté mercredi un plan d'économies d'énergie ; les syndicats dénoncent « une réforme précipitée ». "
+    "Die Regierung kündigte an, die Strompreise bis März zu deckeln – Kritiker sprechen von Symbolpolitik. "
+    "सरकार ने बुधवार को नई ऊर्जा नीति की घोषणा की, जिससे बिजली की कीमतें कम होने की उम्मीद है। "
+    "政府は水曜日、新たなエネルギー政策を発表した。​ "
+)
+
+
+def legacy_clean(raw_text):
+    clean_text = re.sub(r'\s+', ' ', raw_text).strip()
+    clean_text = re.sub(r'[^a-zA-Z0-9\s.,!?]', '', clean_text)
+    return clean_text.lower()
+
+
+def build_corpus(total_mb, docs):
+    # Whole-page text, so the cleaner sees the messy whitespace and symbols it does in production
+    pages = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            pages.append(make_soup(f.read()).get_text())
+    sample = "\n".join(pages) + "\n" + MULTILINGUAL * 20
+    doc_chars = int(total_mb * 1024 * 1024 / docs)
+    text = sample * (doc_chars // len(sample) + 1)
+    return [text[i % len(sample):][:doc_chars] for i in range(docs)]
+
+
+def throughput(label, func, corpus, megabytes):
+    start = time.perf_counter()
+    func(corpus)
+    elapsed = time.perf_counter() - start
+    print(f"{label:36} {elapsed:7.3f}s {megabytes / elapsed:9.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=20)
+    parser.add_argument("--docs", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.mb, args.docs)
+    megabytes = sum(len(doc.encode()) for doc in corpus) / 1024 / 1024
+    print(f"{len(corpus)} documents, {megabytes:.1f} MB")
+    ascii_lower = TextCleaner("ascii", lowercase=True)
+    unicode_cleaner = TextCleaner("unicode")
+    throughput("original re.sub x2 + lower", lambda c: [legacy_clean(d) for d in c], corpus, megabytes)
+    throughput("ascii + lowercase, per document", lambda c: [ascii_lower.clean(d) for d in c], corpus, megabytes)
+    throughput("ascii + lowercase, batch", ascii_lower.clean_batch, corpus, megabytes)
+    throughput("unicode, per document", lambda c: [unicode_cleaner.clean(d) for d in c], corpus, megabytes)
+    throughput("unicode, batch", unicode_cleaner.clean_batch, corpus, megabytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_document.py
+"""
+Parse count and CPU time for reading one fetched page the way the three call sites
+need it (scrape_website's text, fetch_article_details' title and paragraphs,
+summarize_page's date and first paragraphs):
+
+  * per call site - each call site parses the HTML itself, as before the shared page model
+  * shared        - one ParsedDocument built per fetch, read by all three
+
+    python -m benchmarks.bench_document [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import time
+
+import bs4
+
+from app.scrapers import extraction
+from benchmarks.bench_extraction import FIXTURE_URLS, FIXTURES_DIR
+
+PARSES = 0
+
+
+class CountingSoup(bs4.BeautifulSoup):
+    def __init__(self, *args, **kwargs):
+        global PARSES
+        PARSES += 1
+        super().__init__(*args, **kwargs)
+
+
+def per_call_site(html, url):
+    # scrape_website
+    text = CountingSoup(html, "html.parser").get_text(separator=' ', strip=True)
+    # fetch_article_details
+    soup = CountingSoup(html, "html.parser")
+    title = soup.find("title").get_text().strip()
+    paragraphs = [p.get_text() for p in soup.find_all("p")]
+    # summarize_page
+    soup = CountingSoup(html, "html.parser")
+    date = extraction.extract_date(soup)
+    first = [p.get_text() for p in soup.find_all("p")][:5]
+    return text, title, paragraphs, date, first
+
+
+def shared(html, url):
+    document = extraction.ParsedDocument(html, url)
+    return document.text, document.title, document.paragraphs, document.date, document.paragraphs[:5]
+
+
+def measure(func, html, url, repeat):
+    global PARSES
+    PARSES = 0
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func(html, url)
+        samples.append(time.process_time() - start)
+    return statistics.median(samples), PARSES / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    extraction.BeautifulSoup = CountingSoup  # count the parses ParsedDocument makes as well
+    print(f"{'fixture':24} {'html KB':>8}  {'variant':14} {'parses':>7} {'CPU ms':>8}")
+    for name, url in FIXTURE_URLS.items():
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            html = f.read()
+        for label, func in (("per call site", per_call_site), ("shared", shared)):
+            seconds, parses = measure(func, html, url, args.repeat)
+            print(f"{name:24} {len(html) / 1024:8.0f}  {label:14} {parses:7.0f} {seconds * 1000:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
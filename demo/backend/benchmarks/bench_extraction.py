@@ -0,0 +1,75 @@
+# backend/benchmarks/bench_extraction.py
+"""
+Main-content extraction over the saved pages in benchmarks/fixtures, compared with
+the previous behaviour of returning ``soup.get_text()`` for the whole document.
+Reports the median extraction time and the size of the text handed to the LLM.
+
+    python -m benchmarks.bench_extraction [--repeat 20] [--show]
+"""
+import argparse
+import os
+import statistics
+import time
+
+from bs4 import BeautifulSoup
+
+from app.scrapers import extraction
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+# fixture -> URL it is extracted as (domain rules are picked by URL)
+FIXTURE_URLS = {
+    "news_wire.html": "https://news.example.com/politics/energy-price-plan",
+    "indiatimes_story.html": "https://timesofindia.indiatimes.com/city/metro-extension/articleshow/1.cms",
+    "blog_post.html": "https://blog.example.org/2024/03/why-the-metro-plan-matters/",
+    "liveblog_heavy.html": "https://news.example.com/live/budget-day",
+}
+
+
+def legacy_extract(html, url):
+    return {"text": BeautifulSoup(html, "html.parser").get_text(separator=' ', strip=True)}
+
+
+def extract_with(parser):
+    def run(html, url):
+        previous, extraction.PARSER = extraction.PARSER, parser
+        try:
+            return extraction.extract_page(html, url)
+        finally:
+            extraction.PARSER = previous
+    return run
+
+
+def timed(func, html, url, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html, url)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--show", action="store_true", help="print the start of each extracted text")
+    args = parser.parse_args()
+
+    variants = [
+        ("whole page, html.parser", legacy_extract),
+        ("extractor, html.parser", extract_with("html.parser")),
+        ("extractor, lxml", extract_with("lxml")),
+    ]
+    print(f"{'fixture':24} {'html KB':>8}  {'variant':26} {'ms':>8} {'text chars':>11}")
+    for name, url in FIXTURE_URLS.items():
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            html = f.read()
+        for label, func in variants:
+            seconds, result = timed(func, html, url, args.repeat)
+            print(f"{name:24} {len(html) / 1024:8.0f}  {label:26} {seconds * 1000:8.2f} {len(result['text']):11}")
+        print(f"{'':34}title={result['title']!r} author={result['author']!r} date={result['date']!r}")
+        if args.show:
+            print(f"{'':34}{result['text'][:300]!r}")
+
+
+if __name__ == "__main__":
+    main()
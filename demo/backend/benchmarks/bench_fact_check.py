@@ -0,0 +1,65 @@
+# backend/benchmarks/bench_fact_check.py
+"""
+Fact-check latency against the stub server (each LLM call and search takes a
+fixed delay). It compares the whole-article check (one search, one LLM call) with
+the per-claim graph as the number of claims grows, with claims verified one at
+a time and in parallel.
+
+    python -m benchmarks.bench_fact_check [--llm-delay 0.5] [--search-delay 0.3] [--claims 1 2 4 8]
+"""
+import argparse
+import asyncio
+import time
+
+from app.core import http_client
+from app.core.http_client import HTTPClient
+from app.services import fact_check_service, llm_gateway, search
+from app.services.fact_check_service import run_fact_check
+from app.services.llm_cache import LLMCache
+from app.services.llm_gateway import LLMGateway
+from app.services.search import DuckDuckGoProvider, SearchService
+from benchmarks.stub_server import StubServer
+
+ARTICLE = " ".join(f"Sentence {i} of an article about the national energy plan." for i in range(40))
+
+
+async def timed_check(base, llm_delay, claims, concurrency):
+    llm_gateway._gateway = LLMGateway(url=f"{base}/chat/completions?delay={llm_delay}&claims={claims}",
+                                      cache=LLMCache(None))
+    fact_check_service.FACT_CHECK_CONCURRENCY = concurrency
+    start = time.perf_counter()
+    result = await run_fact_check(ARTICLE)
+    return time.perf_counter() - start, result
+
+
+async def main_async(base, llm_delay, search_delay, claim_counts):
+    http_client._client = HTTPClient(http2=False, retries=0, rate_limited=False)
+    try:
+        print(f"llm call {llm_delay}s, search {search_delay}s")
+        print(f"{'claims':>6} {'sequential':>11} {'parallel':>9}  overall")
+        for claims in claim_counts:
+            # Fresh service per run so cached searches do not flatter the later runs
+            search._service = SearchService([DuckDuckGoProvider(f"{base}/html/?delay={search_delay}")], cache_ttl=0)
+            sequential, _ = await timed_check(base, llm_delay, claims, 1)
+            search._service = SearchService([DuckDuckGoProvider(f"{base}/html/?delay={search_delay}")], cache_ttl=0)
+            parallel, result = await timed_check(base, llm_delay, claims, claims or 1)
+            label = "whole article" if not claims else f"{len(result['claim_results'])} claims judged"
+            print(f"{claims:>6} {sequential:>10.2f}s {parallel:>8.2f}s  {result['reliability']} ({label})")
+    finally:
+        llm_gateway._gateway = None
+        search._service = None
+        await http_client.close_http_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-delay", type=float, default=0.5)
+    parser.add_argument("--search-delay", type=float, default=0.3)
+    parser.add_argument("--claims", type=int, nargs="+", default=[0, 1, 2, 4, 8])
+    args = parser.parse_args()
+    with StubServer() as stub:
+        asyncio.run(main_async(stub.url, args.llm_delay, args.search_delay, args.claims))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# backend/benchmarks/bench_fetch_limits.py
+"""
+Streaming page fetch against misbehaving pages from the stub server: a huge body,
+a body that trickles in, a server that stalls before answering and a PDF. Shows
+where fetch_html stops, how long it took and the peak memory, next to a plain
+buffered GET (the previous behaviour) where that finishes at all.
+
+    python -m benchmarks.bench_fetch_limits [--huge-mb 50]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from app.core.http_client import HTTPClient
+from app.core import http_client
+from app.scrapers.html_fetcher import FetchError, fetch_html
+from benchmarks.stub_server import StubServer
+
+
+async def run(label, coro_factory):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = await coro_factory()
+        outcome = f"{len(result.html if hasattr(result, 'html') else result.text) / 1024:9.0f} KB"
+        outcome += f"  stopped: {getattr(result, 'truncated', None) or 'end of body'}"
+    except (FetchError, asyncio.TimeoutError) as e:
+        outcome = f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:38} {elapsed:7.2f}s  peak {peak / 1024 / 1024:7.1f} MB  {outcome}")
+
+
+async def main_async(base, huge_mb):
+    client = HTTPClient(http2=False, retries=0, rate_limited=False)
+    http_client._client = client  # fetch_html goes through the shared client
+    try:
+        await run("article", lambda: fetch_html(f"{base}/article"))
+        await run(f"huge {huge_mb} MB, default limits", lambda: fetch_html(f"{base}/huge?mb={huge_mb}"))
+        await run(f"huge {huge_mb} MB, byte cap only", lambda: fetch_html(f"{base}/huge?mb={huge_mb}",
+                                                                        enough_text=10 ** 12))
+        await run(f"huge {huge_mb} MB, buffered GET", lambda: client.get(f"{base}/huge?mb={huge_mb}"))
+        await run("trickle 20s, deadline 3s", lambda: fetch_html(f"{base}/slow?interval=0.5&chunks=40", deadline=3))
+        await run("trickle 20s, buffered GET (3s cap)",
+                  lambda: asyncio.wait_for(client.get(f"{base}/slow?interval=0.5&chunks=40"), 3))
+        await run("stalls 5s, deadline 2s", lambda: fetch_html(f"{base}/article?delay=5", deadline=2))
+        await run("pdf", lambda: fetch_html(f"{base}/binary"))
+    finally:
+        http_client._client = None
+        await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--huge-mb", type=int, default=50)
+    args = parser.parse_args()
+    with StubServer() as server:
+        asyncio.run(main_async(server.url, args.huge_mb))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# backend/benchmarks/bench_http_client.py
+"""
+Throughput of the shared pooled HTTPClient versus a fresh ``requests`` call per
+request (the previous behaviour), against the local stub server. The stub serves
+HTTPS by default so the per-call TCP+TLS handshake cost is part of the picture.
+
+    python -m benchmarks.bench_http_client --requests 2000 --concurrency 50 [--plain-http]
+"""
+import argparse
+import asyncio
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app.core.http_client import HTTPClient
+from benchmarks.stub_server import StubServer
+
+
+def bench_requests_per_call(url, total, concurrency):
+    def fetch(_):
+        return requests.get(url, timeout=10, verify=False).status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        statuses = list(pool.map(fetch, range(total)))
+    elapsed = time.perf_counter() - start
+    assert all(s == 200 for s in statuses)
+    return elapsed
+
+
+async def bench_shared_client(url, total, concurrency):
+    client = HTTPClient(max_connections_per_host=concurrency, http2=False, verify=False, rate_limited=False)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch():
+        async with semaphore:
+            return (await client.get(url)).status_code
+
+    start = time.perf_counter()
+    statuses = await asyncio.gather(*(fetch() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    assert all(s == 200 for s in statuses)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--plain-http", action="store_true", help="serve plain HTTP instead of HTTPS")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", message="Unverified HTTPS request")
+
+    rows = []
+    with StubServer(tls=not args.plain_http) as server:
+        url = f"{server.url}/article"
+        baseline = bench_requests_per_call(url, args.requests, args.concurrency)
+        rows.append(("requests (per call)", baseline, server.connections))
+        opened = server.connections
+        pooled = asyncio.run(bench_shared_client(url, args.requests, args.concurrency))
+        rows.append(("HTTPClient (pooled)", pooled, server.connections - opened))
+
+    print(f"{'client':<24}{'seconds':>10}{'req/s':>12}{'connections':>14}")
+    for name, elapsed, connections in rows:
+        print(f"{name:<24}{elapsed:>10.2f}{args.requests / elapsed:>12.0f}{connections:>14}")
+    print(f"speedup: {baseline / pooled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
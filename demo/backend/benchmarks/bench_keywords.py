@@ -0,0 +1,102 @@
+# backend/benchmarks/bench_keywords.py
+"""
+Keyword extraction over a synthetic corpus of thousands of articles: paragraphs from
+the saved fixture pages mixed with a few topic words per article, drawn Zipf-style so
+some are common across the corpus and some are specific to one story.
+
+Reports DF index build throughput (in memory and persisted to SQLite), the reload
+time, per-article latency of the old Counter-based extract_keywords against BM25
+one at a time and as a batch, and the keywords both pick for a few articles.
+
+    python -m benchmarks.bench_keywords [--docs 5000] [--samples 3]
+"""
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+from collections import Counter
+
+from app.scrapers.extraction import ParsedDocument
+from app.services.keywords import KeywordIndex
+from benchmarks.bench_extraction import FIXTURE_URLS, FIXTURES_DIR
+
+SYLLABLES = ["ka", "lo", "mer", "dan", "tri", "vos", "pel", "zu", "ran", "ost", "qui", "bel"]
+
+
+def legacy_extract_keywords(text, article_title="", num_keywords=5):
+    words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
+    common_words = {"the", "with", "this", "that", "from", "about", "have", "more"}
+    filtered_words = [word for word in words if word not in common_words]
+    keyword_string = " ".join(word for word, _ in Counter(filtered_words).most_common(num_keywords))
+    return f"{article_title} {keyword_string}" if article_title else keyword_string
+
+
+def build_corpus(docs, seed=7):
+    rng = random.Random(seed)
+    paragraphs = []
+    for name, url in FIXTURE_URLS.items():
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            paragraphs.extend(ParsedDocument(f.read(), url).paragraphs)
+    topics = ["".join(rng.choice(SYLLABLES) for _ in range(3)) for _ in range(2000)]
+    corpus = []
+    for _ in range(docs):
+        story = [topics[min(int(rng.paretovariate(1.1)) - 1, len(topics) - 1)] for _ in range(3)]
+        story.append(rng.choice(topics))
+        sentences = []
+        for paragraph in rng.sample(paragraphs, min(8, len(paragraphs))):
+            sentences.append(paragraph)
+            sentences.append(f"The {story[0]} {story[1]} case drew reaction from {rng.choice(story)} officials.")
+        corpus.append(" ".join(sentences))
+    return corpus
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.docs)
+    mb = sum(map(len, corpus)) / 1024 / 1024
+    print(f"corpus: {len(corpus)} articles, {mb:.1f} MB")
+
+    memory_index = KeywordIndex(path=None)
+    _, elapsed = timed(memory_index.add_documents, corpus)
+    print(f"index build, memory      {elapsed:7.2f}s  {len(corpus) / elapsed:8.0f} docs/s  "
+          f"{memory_index.vocabulary_size} terms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "keywords.sqlite3")
+        index = KeywordIndex(path=path)
+        _, elapsed = timed(index.add_documents, corpus)
+        print(f"index build, sqlite      {elapsed:7.2f}s  {len(corpus) / elapsed:8.0f} docs/s")
+        _, elapsed = timed(index.add_documents, corpus[:100])
+        print(f"re-adding 100 known docs {elapsed * 1000:7.1f}ms (skipped by content hash)")
+        index.close()
+        index, elapsed = timed(KeywordIndex, path)
+        print(f"reload from sqlite       {elapsed:7.2f}s  {index.n_docs} docs")
+        index.close()
+
+    queries = corpus[:500]
+    _, elapsed = timed(lambda: [legacy_extract_keywords(text) for text in queries])
+    print(f"\nlegacy Counter           {elapsed / len(queries) * 1000:7.2f} ms/article")
+    _, elapsed = timed(lambda: [memory_index.top_terms(text) for text in queries])
+    print(f"BM25, one at a time      {elapsed / len(queries) * 1000:7.2f} ms/article")
+    _, elapsed = timed(memory_index.score_batch, queries)
+    print(f"BM25, batch of {len(queries)}       {elapsed / len(queries) * 1000:7.2f} ms/article")
+
+    for text in corpus[:args.samples]:
+        print(f"\nlegacy: {legacy_extract_keywords(text)}")
+        print(f"bm25:   {' | '.join(term for term, _ in memory_index.top_terms(text))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# backend/benchmarks/bench_llm_streaming.py
+"""
+Time to first byte of LLMGateway.complete versus LLMGateway.stream against the
+stub server's fake OpenRouter SSE endpoint.
+
+    python -m benchmarks.bench_llm_streaming --first-token-delay 1.0 --token-delay 0.05 --runs 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.http_client import HTTPClient
+from app.core import http_client
+from app.services.llm_cache import LLMCache
+from app.services.llm_gateway import LLMGateway
+from benchmarks.stub_server import StubServer
+
+MESSAGES = [{"role": "user", "content": "Summarize the stub article."}]
+
+
+async def measure(gateway, streaming):
+    start = time.perf_counter()
+    first = None
+    if streaming:
+        async for _ in gateway.stream(MESSAGES):
+            if first is None:
+                first = time.perf_counter() - start
+    else:
+        await gateway.complete(MESSAGES)
+        first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+async def run(url, runs):
+    http_client._client = HTTPClient(http2=False, rate_limited=False)
+    gateway = LLMGateway(url=url, cache=LLMCache(None))  # no cache: every run hits the stub
+    results = {}
+    for name, streaming in (("complete", False), ("stream", True)):
+        samples = [await measure(gateway, streaming) for _ in range(runs)]
+        results[name] = (statistics.median(s[0] for s in samples), statistics.median(s[1] for s in samples))
+    await http_client.close_http_client()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--first-token-delay", type=float, default=1.0)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with StubServer() as stub:
+        url = f"{stub.url}/chat/completions?delay={args.first_token_delay}&token_delay={args.token_delay}"
+        results = asyncio.run(run(url, args.runs))
+
+    print(f"{'mode':<10}{'TTFB (s)':>10}{'total (s)':>12}")
+    for name, (ttfb, total) in results.items():
+        print(f"{name:<10}{ttfb:>10.3f}{total:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
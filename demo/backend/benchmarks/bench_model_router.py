@@ -0,0 +1,112 @@
+# backend/benchmarks/bench_model_router.py
+"""
+Latency per endpoint task with every call on LLM_DEFAULT_MODEL (the slow reasoning
+model) versus routed by task (see app/services/model_router.py). The calls go to the
+stub OpenRouter, where each model of the default routes gets its own latency. The
+second part takes a task's fastest model down and shows the router falling back
+along the chain and then routing around the failed model.
+
+    python -m benchmarks.bench_model_router [--calls 40] [--concurrency 4] [--scale 0.25]
+"""
+import argparse
+import asyncio
+import time
+from urllib.parse import urlencode
+
+from app.core import config, http_client, resilience
+from app.core.http_client import HTTPClient
+from app.core.resilience import UpstreamError
+from app.services.llm_cache import LLMCache
+from app.services.llm_gateway import LLMGateway
+from app.services.model_router import get_model_router
+from benchmarks.stub_server import StubServer
+
+# Seconds per completion at scale 1, roughly what the free models take on a summary
+MODEL_LATENCY = {
+    "deepseek/deepseek-r1-zero:free": 12.0,
+    "deepseek/deepseek-r1:free": 10.0,
+    "deepseek/deepseek-chat-v3-0324:free": 3.0,
+    "meta-llama/llama-3.3-70b-instruct:free": 2.5,
+    "mistralai/mistral-small-3.1-24b-instruct:free": 1.2,
+    "google/gemma-3-12b-it:free": 1.5,
+}
+TASKS = ("related_topics", "summary", "perspective", "fact_check")
+
+
+def stub_url(stub, scale, down=()):
+    params = {f"delay@{model}": round(seconds * scale, 3) for model, seconds in MODEL_LATENCY.items()}
+    params.update({f"fail@{model}": 1 for model in down})
+    params.update(slow=0.05, slow_delay=round(4 * scale, 3))  # an occasional slow answer
+    return f"{stub.url}/chat/completions?{urlencode(params)}"
+
+
+async def run_task(gateway, task, routed, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def call(i):
+        nonlocal failures
+        messages = [{"role": "user", "content": f"{task} request {i}"}]
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if routed:
+                    await gateway.complete(messages, task=task)
+                else:
+                    await gateway.complete(messages, model=config.LLM_DEFAULT_MODEL)
+            except UpstreamError:
+                failures += 1
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(call(i) for i in range(calls)))
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], failures
+
+
+async def compare(url, calls, concurrency):
+    http_client._client = HTTPClient(http2=False, rate_limited=False)
+    try:
+        for routed in (False, True):
+            resilience._upstreams.clear()
+            gateway = LLMGateway(url=url, api_key="stub", cache=LLMCache(None))
+            for task in TASKS:
+                p50, p95, failures = await run_task(gateway, task, routed, calls, concurrency)
+                model = get_model_router().route(task)[0] if routed else config.LLM_DEFAULT_MODEL
+                print(f"{'routed' if routed else 'default model':14} {task:15} {p50:7.2f}s {p95:7.2f}s "
+                      f"{failures:8}  {model}")
+    finally:
+        await http_client.close_http_client()
+
+
+async def outage(url, calls, concurrency, task):
+    http_client._client = HTTPClient(http2=False, rate_limited=False)
+    gateway = LLMGateway(url=url, api_key="stub", cache=LLMCache(None))
+    try:
+        for wave in range(3):
+            p50, p95, failures = await run_task(gateway, task, True, calls // 2, concurrency)
+            print(f"{task} wave {wave + 1}: p50 {p50:.2f}s p95 {p95:.2f}s, {failures} failed, "
+                  f"route now {get_model_router().route(task)}")
+    finally:
+        await http_client.close_http_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--scale", type=float, default=0.25, help="multiplies every model latency")
+    args = parser.parse_args()
+
+    with StubServer(seed=3) as stub:
+        print(f"{args.calls} calls per task, {args.concurrency} at a time, latencies x{args.scale}")
+        print(f"{'mode':14} {'task':15} {'p50':>8} {'p95':>8} {'failures':>8}  first choice")
+        asyncio.run(compare(stub_url(stub, args.scale), args.calls, args.concurrency))
+
+        fastest = get_model_router().route("related_topics")[0]
+        print(f"\n{fastest} goes down:")
+        asyncio.run(outage(stub_url(stub, args.scale, down=[fastest]), args.calls, args.concurrency,
+                           "related_topics"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# backend/benchmarks/bench_prompt_budget.py
+"""
+Size of the compare_article prompt before and after budgeting. Each fixture article
+is judged against a growing number of search results with Tavily-sized snippets,
+including repeated URLs and syndicated copies. The old prompt embedded the whole
+article plus json.dumps(resources, indent=2). The budgeted prompt shows the tokens
+per section, how many results fit, and how long assembly took.
+
+    python -m benchmarks.bench_prompt_budget [--results 5 20 50] [--budget 3000]
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from app.prompts.budget import PromptBudget
+from app.scrapers.extraction import ParsedDocument
+from app.services.fact_check_service import COMPARE_ARTICLE_PROMPT
+from app.utils.chunking import estimate_tokens
+from benchmarks.bench_extraction import FIXTURE_URLS, FIXTURES_DIR
+
+OFF_TOPIC = "The stadium will host the final next spring after renovation works on the roof are completed. " * 6
+
+
+def search_results(paragraphs, count, rng):
+    """Results quoting the article, a few off-topic ones, repeated URLs and copies on other sites."""
+    results = []
+    for i in range(count):
+        if i % 5 == 4:
+            content = OFF_TOPIC
+        else:
+            content = " ".join(rng.sample(paragraphs, min(3, len(paragraphs))))
+        results.append({"title": f"Result {i}", "url": f"https://news{i % 7}.example.com/story/{i}",
+                        "snippet": content, "score": round(1 - i / count, 3), "provider": "tavily"})
+        if i % 6 == 5:
+            results.append(dict(results[-1]))  # the same URL from the other provider
+        if i % 8 == 7:
+            results.append(dict(results[-1], url=f"https://mirror.example.org/story/{i}"))
+    return results
+
+
+def old_prompt(article, resources):
+    return COMPARE_ARTICLE_PROMPT.format(article=article, resources=json.dumps(resources, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--budget", type=int, default=None, help="tokens; default token_budget() for the model")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    print(f"{'article':24} {'results':>7} {'old tokens':>10} {'new tokens':>10}  sections")
+    for name, url in FIXTURE_URLS.items():
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            paragraphs = ParsedDocument(f.read(), url).paragraphs
+        article = "\n".join(paragraphs)
+        for count in args.results:
+            resources = search_results(paragraphs, count, rng)
+            start = time.perf_counter()
+            budget = PromptBudget(budget=args.budget).text("article", article).resources(
+                "resources", resources, query=article)
+            prompt = budget.fill(COMPARE_ARTICLE_PROMPT)
+            elapsed = (time.perf_counter() - start) * 1000
+            report = budget.report()
+            kept = prompt.count("\n- ") + prompt.startswith("- ")
+            print(f"{name:24} {len(resources):>7} {estimate_tokens(old_prompt(article, resources)):>10} "
+                  f"{estimate_tokens(prompt):>10}  instructions {report['instructions']}, article "
+                  f"{report['article']}, resources {report['resources']} ({kept} kept), {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# backend/benchmarks/bench_rate_limit.py
+"""
+Fetching from a rate-limited site: many concurrent page fetches against the stub's
+/limited endpoint, which answers 429 with Retry-After once a second's quota is used.
+It compares no limiter, a limiter set to the site's rate, and a limiter set too
+high, which has to rely on Retry-After. Each run reports the 429s the site sent,
+the fetches that still failed, and the time spent waiting in the limiter. Threads
+calling acquire_sync share the same budget.
+
+    python -m benchmarks.bench_rate_limit [--fetches 40] [--site-rps 5] [--retries 3]
+"""
+import argparse
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+from app.core import http_client
+from app.core.http_client import HTTPClient
+from app.core.rate_limit import RateLimiter
+from app.scrapers.html_fetcher import fetch_html
+from benchmarks.stub_server import StubServer
+
+
+async def fetch_all(client, url, fetches):
+    async def fetch(i):
+        try:
+            await fetch_html(f"{url}&n={i}", deadline=120)
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(fetch(i) for i in range(fetches)))
+    return time.perf_counter() - start, results.count(False)
+
+
+async def run(label, stub, site_rps, fetches, retries, budget):
+    url = f"{stub.url}/limited?rps={site_rps}"
+    client = HTTPClient(http2=False, retries=retries, backoff=0.2, rate_limited=False)
+    if budget is not None:
+        client.rate_limiter = RateLimiter({urlsplit(stub.url).netloc: budget}, default=budget)
+    http_client._client = client
+    rejected = stub.rejected
+    try:
+        elapsed, failed = await fetch_all(client, url, fetches)
+    finally:
+        http_client._client = None
+        await client.aclose()
+    stats = client.rate_limiter.stats() if client.rate_limiter else {}
+    print(f"{label:34} {elapsed:7.2f}s {stub.rejected - rejected:6} {failed:7} "
+          f"{stats.get('wait_seconds', 0):10.1f}s {stats.get('max_wait_seconds', 0):8.2f}s "
+          f"{stats.get('retry_after', 0):6}")
+
+
+def sync_callers(threads, calls, rate):
+    limiter = RateLimiter({}, default=(rate, 1))
+
+    def worker():
+        for _ in range(calls):
+            limiter.acquire_sync("https://news.example.com/story")
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stats = limiter.stats()
+    print(f"\n{threads} threads x {calls} acquire_sync at {rate}/s: {elapsed:.2f}s "
+          f"(ideal {(threads * calls - 1) / rate:.2f}s), waited {stats['wait_seconds']}s in total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fetches", type=int, default=40)
+    parser.add_argument("--site-rps", type=float, default=5)
+    parser.add_argument("--retries", type=int, default=3)
+    args = parser.parse_args()
+
+    with StubServer() as stub:
+        print(f"{args.fetches} concurrent fetches, site allows {args.site_rps:g}/s, {args.retries} retries")
+        print(f"{'limiter':34} {'elapsed':>8} {'429s':>6} {'failed':>7} {'waited':>11} {'max wait':>9} "
+              f"{'paused':>6}")
+        for label, budget in [
+            ("none", None),
+            (f"site's rate ({args.site_rps:g}/s, burst 1)", (args.site_rps, 1)),
+            (f"too high ({args.site_rps * 4:g}/s, burst 5)", (args.site_rps * 4, 5)),
+        ]:
+            time.sleep(1.1)  # let the site's window empty between runs
+            asyncio.run(run(label, stub, args.site_rps, args.fetches, args.retries, budget))
+    sync_callers(threads=4, calls=10, rate=20)
+
+
+if __name__ == "__main__":
+    main()
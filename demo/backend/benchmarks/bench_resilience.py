@@ -0,0 +1,118 @@
+# backend/benchmarks/bench_resilience.py
+"""
+LLM calls against a fault-injecting stub OpenRouter (see stub_server.py), with and
+without the resilience layer:
+
+- flaky: some calls fail with 503 or return an error body. Measures the share of calls
+  that succeed with no retries and with jittered retries.
+- down: every call fails after a delay. Measures the time callers spend and the requests
+  sent, with retries alone and with the circuit breaker failing fast.
+- tail: a few calls are very slow. Measures p50/p95/p99 without hedging, with a hedge on
+  the same model, and with a hedge on a fallback model.
+
+    python -m benchmarks.bench_resilience [--calls 200] [--concurrency 10]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core import http_client, resilience
+from app.core.http_client import HTTPClient
+from app.core.resilience import CircuitBreaker, Upstream, UpstreamError
+from app.services.llm_cache import LLMCache
+from app.services.llm_gateway import LLMGateway
+from benchmarks.stub_server import StubServer
+
+
+async def run_calls(gateway, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def call(i):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await gateway.complete([{"role": "user", "content": f"Summarize article {i}."}])
+            except UpstreamError:
+                failures += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(calls)))
+    return time.perf_counter() - start, latencies, failures
+
+
+def quantile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def scenario(stub, faults, upstreams, calls, concurrency, fallback=None):
+    """Runs `calls` completions with the upstreams set up as given ({model: Upstream})."""
+    http_client._client = HTTPClient(http2=False, rate_limited=False)
+    resilience._upstreams.clear()
+    resilience._upstreams.update({f"openrouter:{model}": upstream for model, upstream in upstreams.items()})
+    model = next(iter(upstreams))
+    gateway = LLMGateway(url=f"{stub.url}/chat/completions?{faults}", api_key="stub", default_model=model,
+                         cache=LLMCache(None), fallback_model=fallback or "")
+    try:
+        elapsed, latencies, failures = await run_calls(gateway, calls, concurrency)
+    finally:
+        await http_client.close_http_client()
+    sent = sum(u.calls + u.retried + u.hedged for u in upstreams.values()) - sum(
+        u.rejected for u in upstreams.values())
+    return elapsed, latencies, failures, sent, upstreams[model]
+
+
+def no_breaker():
+    return CircuitBreaker(failure_threshold=10 ** 9)
+
+
+def report(label, result, calls):
+    elapsed, latencies, failures, sent, upstream = result
+    print(f"{label:32} {100 * (calls - failures) / calls:6.1f}% {statistics.mean(latencies):7.3f}s "
+          f"{quantile(latencies, 0.5):6.3f}s {quantile(latencies, 0.95):6.3f}s {quantile(latencies, 0.99):6.3f}s "
+          f"{sent:6} {upstream.retried:7} {upstream.rejected:8} {upstream.hedged:6} {upstream.hedge_wins:5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    calls, concurrency = args.calls, args.concurrency
+
+    with StubServer(seed=1) as stub:
+        print(f"{calls} completions, {concurrency} at a time")
+        print(f"{'scenario / mode':32} {'ok':>7} {'mean':>8} {'p50':>7} {'p95':>7} {'p99':>7} "
+              f"{'sent':>6} {'retries':>7} {'rejected':>8} {'hedged':>6} {'wins':>5}")
+        flaky = "delay=0.05&fail=0.2&error=0.1"
+        for label, upstream in [
+            ("flaky: no retries", Upstream("m", retries=0, backoff=0.05, breaker=no_breaker(), hedge=False)),
+            ("flaky: 2 jittered retries", Upstream("m", retries=2, backoff=0.05, breaker=no_breaker(), hedge=False)),
+        ]:
+            report(label, asyncio.run(scenario(stub, flaky, {"m": upstream}, calls, concurrency)), calls)
+
+        down = "delay=0.3&fail=1"
+        for label, upstream in [
+            ("down: retries, no breaker", Upstream("m", retries=2, backoff=0.2, breaker=no_breaker(), hedge=False)),
+            ("down: retries + breaker", Upstream("m", retries=2, backoff=0.2, hedge=False,
+                                                 breaker=CircuitBreaker(failure_threshold=5, reset_after=30))),
+        ]:
+            report(label, asyncio.run(scenario(stub, down, {"m": upstream}, calls, concurrency)), calls)
+
+        tail = "delay=0.05&slow=0.05&slow_delay=2"
+        for label, upstreams, fallback in [
+            ("tail: no hedging", {"m": Upstream("m", breaker=no_breaker(), hedge=False)}, None),
+            ("tail: hedged, same model", {"m": Upstream("m", breaker=no_breaker(), hedge=True)}, None),
+            ("tail: hedged on fallback model", {"m": Upstream("m", breaker=no_breaker(), hedge=True),
+                                                "fallback": Upstream("fallback", breaker=no_breaker(), hedge=False)},
+             "fallback"),
+        ]:
+            report(label, asyncio.run(scenario(stub, tail, upstreams, calls, concurrency, fallback)), calls)
+
+
+if __name__ == "__main__":
+    main()
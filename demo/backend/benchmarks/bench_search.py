@@ -0,0 +1,89 @@
+# backend/benchmarks/bench_search.py
+"""
+Search latency through SearchService against the stub server's DuckDuckGo and
+Tavily endpoints, with added latency. It compares each provider alone, both
+queried in sequence, "first" mode and "merge" mode. It also measures a failing
+provider, one that times out, cached repeats, and many concurrent identical
+queries.
+
+    python -m benchmarks.bench_search [--ddg-delay 0.3] [--tavily-delay 0.8] [--repeat 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core import http_client
+from app.core.http_client import HTTPClient
+from app.services.search import DuckDuckGoProvider, FakeProvider, SearchError, SearchService, TavilyProvider
+from benchmarks.stub_server import StubServer
+
+
+async def timed(service, query, repeat, mode=None, fresh=True):
+    latencies, results = [], []
+    for i in range(repeat):
+        start = time.perf_counter()
+        try:
+            results = await service.search(f"{query} {i}" if fresh else query, max_results=5, mode=mode)
+        except SearchError as e:
+            results = [str(e)]
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies), results
+
+
+def row(label, latency, results):
+    providers = sorted({getattr(r, "provider", "error") for r in results})
+    print(f"{label:38} {latency * 1000:8.1f} ms  {len(results):2} results  {', '.join(providers)}")
+
+
+async def main_async(base, ddg_delay, tavily_delay, repeat):
+    client = HTTPClient(http2=False, retries=0, rate_limited=False)
+    http_client._client = client
+    ddg = DuckDuckGoProvider(f"{base}/html/?delay={ddg_delay}")
+    tavily = TavilyProvider("stub", f"{base}/search?delay={tavily_delay}")
+    try:
+        for label, providers in [("duckduckgo", [ddg]), ("tavily", [tavily])]:
+            row(label, *await timed(SearchService(providers, cache_ttl=0), "energy prices", repeat))
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            await SearchService([ddg], cache_ttl=0).search("energy prices")
+            await SearchService([tavily], cache_ttl=0).search("energy prices")
+        print(f"{'both, one after the other':38} {(time.perf_counter() - start) / repeat * 1000:8.1f} ms")
+
+        both = SearchService([ddg, tavily], cache_ttl=0)
+        row("both, mode=first", *await timed(both, "energy prices", repeat, mode="first"))
+        row("both, mode=merge", *await timed(both, "energy prices", repeat, mode="merge"))
+
+        failing = SearchService([ddg, FakeProvider("broken", fail=True)], cache_ttl=0)
+        row("merge with a failing provider", *await timed(failing, "energy prices", repeat))
+        hanging = SearchService([ddg, TavilyProvider("stub", f"{base}/search?delay=5")], timeout=1, cache_ttl=0)
+        row("merge with a hanging provider (1s cap)", *await timed(hanging, "energy prices", 1))
+
+        cached = SearchService([ddg, tavily])
+        await cached.search("energy prices")
+        row("merge, cached repeat", *await timed(cached, "energy prices", repeat, fresh=False))
+
+        fake = FakeProvider(delay=0.2)
+        coalescing = SearchService([fake])
+        start = time.perf_counter()
+        await asyncio.gather(*(coalescing.search("energy prices") for _ in range(100)))
+        print(f"{'100 concurrent identical queries':38} {(time.perf_counter() - start) * 1000:8.1f} ms  "
+              f"{fake.calls} upstream call(s)  {coalescing.stats()}")
+    finally:
+        http_client._client = None
+        await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ddg-delay", type=float, default=0.3)
+    parser.add_argument("--tavily-delay", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with StubServer() as server:
+        asyncio.run(main_async(server.url, args.ddg_delay, args.tavily_delay, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# backend/benchmarks/bench_vector_store.py
+"""
+Local vector store: how well hashed embeddings separate near-duplicates from other
+articles, and how exact search compares with the IVF index as the store grows.
+
+1. Similarity of each fixture article to rewritten copies of itself (the same wire
+   story with another headline, a dropped or added paragraph, reordered paragraphs)
+   and to the other fixtures and some unrelated stories, next to the thresholds.
+2. Clustered synthetic vectors at several store sizes: bulk insert rate, exact and
+   IVF query latency, IVF recall@10 against exact search, and reopen time of the
+   memory-mapped files.
+
+    python -m benchmarks.bench_vector_store [--sizes 5000 20000 100000] [--queries 200]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from app.core import config
+from app.scrapers.extraction import ParsedDocument
+from app.services.vector_store import VectorStore, embed
+from benchmarks.bench_extraction import FIXTURE_URLS, FIXTURES_DIR
+
+
+OTHER_STORIES = [
+    "The national football team secured a late win on Saturday after a penalty in stoppage time. The coach praised "
+    "the defence but said the squad still had work to do before the qualifiers. Fans celebrated outside the stadium.",
+    "A new study of sleep patterns among teenagers found that later school start times improved attendance and "
+    "grades. Researchers followed students at twelve schools over three years and recommend further trials.",
+    "The smartphone maker unveiled a folding handset with a larger battery and a faster chip. Reviewers noted the "
+    "hinge felt sturdier than last year's model, though the price remains well above most competitors.",
+]
+
+
+def rewrites(paragraphs, rng):
+    yield "new headline", ["Markets react: " + paragraphs[0]] + paragraphs[1:]
+    yield "last paragraph dropped", paragraphs[:-1]
+    yield "outlet paragraph added", paragraphs + ["Sign up for our newsletter to get the day's top stories."]
+    shuffled = paragraphs[:]
+    rng.shuffle(shuffled)
+    yield "paragraphs reordered", shuffled
+
+
+def similarity_report():
+    rng = random.Random(3)
+    articles = {}
+    for name, url in FIXTURE_URLS.items():
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            articles[name] = ParsedDocument(f.read(), url).paragraphs
+    vectors = {name: embed(" ".join(paragraphs)) for name, paragraphs in articles.items()}
+    stories = [embed(story) for story in OTHER_STORIES]
+    print(f"near-duplicate threshold {config.NEAR_DUPLICATE_THRESHOLD}, related from {config.VECTOR_RELATED_MIN_SCORE}")
+    for name, paragraphs in articles.items():
+        variants = ", ".join(f"{label} {float(embed(' '.join(text)) @ vectors[name]):.3f}"
+                             for label, text in rewrites(paragraphs, rng))
+        # The fixtures are built from one pool of sentences, so they are close to each other too
+        fixtures = max(float(vectors[other] @ vectors[name]) for other in articles if other != name)
+        other = max(float(story @ vectors[name]) for story in stories)
+        print(f"  {name:24} {variants}\n  {'':24} other fixture {fixtures:.3f}, unrelated story {other:.3f}")
+
+
+def clustered_vectors(centers, count, rng):
+    """Unit vectors scattered around random topic centers, like articles around a few hundred stories."""
+    vectors = centers[rng.integers(0, len(centers), count)]
+    vectors = vectors + 0.8 * rng.standard_normal(vectors.shape).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def scale_report(size, queries, dim):
+    rng = np.random.default_rng(size)
+    centers = rng.standard_normal((max(50, size // 40), dim)).astype(np.float32)
+    vectors = clustered_vectors(centers, size, rng)
+    query_vectors = clustered_vectors(centers, queries, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        # ann_min_rows above the size keeps the store on exact search until the index is built below
+        store = VectorStore(tmp, dim=dim, ann_min_rows=size + 1)
+        start = time.perf_counter()
+        for first in range(0, size, 5000):
+            store.add_vectors((f"https://example.com/{i}", vectors[i], "", "")
+                              for i in range(first, min(first + 5000, size)))
+        insert = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exact = [[m.url for m in store.search(q, k=10)] for q in query_vectors]
+        exact_ms = (time.perf_counter() - start) / queries * 1000
+
+        start = time.perf_counter()
+        store.build_ann_index()
+        build = time.perf_counter() - start
+        store.ann_min_rows = 0
+        start = time.perf_counter()
+        approximate = [[m.url for m in store.search(q, k=10)] for q in query_vectors]
+        ivf_ms = (time.perf_counter() - start) / queries * 1000
+        recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approximate, exact)])
+        store.close()
+
+        start = time.perf_counter()
+        reopened = VectorStore(tmp, dim=dim)
+        reopened.search(query_vectors[0], k=10)
+        reopen = time.perf_counter() - start
+        reopened.close()
+
+    print(f"{size:>8} {size / insert:10.0f}/s {exact_ms:9.2f}ms {build:8.1f}s {ivf_ms:9.2f}ms "
+          f"{recall:9.3f} {reopen:9.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=config.VECTOR_DIM)
+    args = parser.parse_args()
+
+    similarity_report()
+    print(f"\n{'vectors':>8} {'insert':>12} {'exact':>11} {'ivf build':>9} {'ivf':>11} {'recall@10':>9} {'reopen':>10}")
+    for size in args.sizes:
+        scale_report(size, args.queries, args.dim)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# backend/benchmarks/load_concurrency.py
+"""
+Concurrency scaling of a single uvicorn worker against stubbed upstreams.
+
+Every upstream call (article fetch, OpenRouter, Tavily, DuckDuckGo) is served by
+the local stub server with an artificial delay. With a non-blocking request path,
+throughput should grow roughly linearly with the number of in-flight clients and
+latency should stay close to the sum of upstream delays.
+
+    python -m benchmarks.load_concurrency --endpoint /scrape-and-summarize --levels 1 10 50 100 200
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.stub_server import StubServer
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(port, env):
+    """Runs the app as a single uvicorn worker in its own process (own GIL, own event loop)."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", "1", "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/")
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def run_level(base_url, endpoint, body, concurrency, rounds):
+    latencies = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def worker():
+            for _ in range(rounds):
+                start = time.perf_counter()
+                response = await client.post(endpoint, json=body)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    return len(latencies) / elapsed, statistics.median(latencies), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", default="/scrape-and-summarize",
+                        choices=["/scrape-and-summarize", "/fact-check", "/deep-research", "/related-topics"])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--rounds", type=int, default=3, help="requests per client at each level")
+    parser.add_argument("--page-delay", type=float, default=0.2, help="seconds per article/search fetch")
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="seconds per OpenRouter/Tavily call")
+    args = parser.parse_args()
+
+    with StubServer() as stub:
+        env = dict(
+            os.environ,
+            OPENROUTER_URL=f"{stub.url}/chat/completions?delay={args.llm_delay}",
+            TAVILY_URL=f"{stub.url}/search?delay={args.llm_delay}",
+            TAVILY_API_KEY="stub",
+            DUCKDUCKGO_URL=f"{stub.url}/html/?delay={args.page_delay}",
+            HTTP2_ENABLED="false",
+            RATE_LIMIT_ENABLED="false",  # the stub plays every upstream on one host, which the site budget would throttle
+        )
+        article_url = f"{stub.url}/article?delay={args.page_delay}"
+        body = {"summary": "stub summary"} if args.endpoint == "/related-topics" else {"url": article_url}
+
+        port = _free_port()
+        process = start_app(port, env)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            print(f"{args.endpoint}  page delay {args.page_delay}s, llm delay {args.llm_delay}s")
+            print(f"{'in-flight':>10}{'req/s':>10}{'p50 (s)':>10}{'p95 (s)':>10}")
+            for level in args.levels:
+                throughput, p50, p95 = asyncio.run(run_level(base_url, args.endpoint, body, level, args.rounds))
+                print(f"{level:>10}{throughput:>10.1f}{p50:>10.2f}{p95:>10.2f}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
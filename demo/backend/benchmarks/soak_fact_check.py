@@ -0,0 +1,169 @@
+# backend/benchmarks/soak_fact_check.py
+"""
+Fact-check memory soak: runs the graph many times in-process with a canned LLM and
+the offline search provider, and reports memory and stored checkpoint threads as
+it goes. Every --fail-every'th run is interrupted after its search, so it leaves
+checkpoints behind the way a crashed job would.
+
+    python -m benchmarks.soak_fact_check [--runs 10000] [--concurrency 20] [--fail-every 10]
+                                         [--checkpointer bounded|sqlite|shared-thread]
+
+"bounded" and "sqlite" are the per-run threads of app/services/checkpoints.py.
+"shared-thread" is the old setup, where every run wrote to one "default" thread on
+an unbounded MemorySaver. The script ends by interrupting one run and resuming it,
+and checks that the resumed run makes no new search call.
+"""
+import argparse
+import asyncio
+import gc
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.core import config
+from app.services import checkpoints, fact_check_service, search
+from app.services.checkpoints import BoundedMemorySaver
+from app.services.fact_check_service import run_fact_check
+from app.services.search import FakeProvider, SearchService
+from benchmarks.stub_server import _completion_text
+
+ARTICLE = " ".join(f"Sentence {i} of an article about the national energy plan." for i in range(40))
+WHOLE_ARTICLE = "[whole article]"  # the canned LLM finds no claims, so the run searches once and compares
+INTERRUPT = "[interrupt]"  # ...and then fails in the comparison
+
+
+class InterruptedRun(Exception):
+    pass
+
+
+class CannedLLM:
+    """Stands in for ChatDeepseek: the stub server's answers, without the HTTP round trip."""
+
+    def __init__(self, claims: int, interrupt: bool = True):
+        self.claims = claims
+        self.interrupt = interrupt
+
+    async def ainvoke(self, messages):
+        prompt = " ".join(m["content"] for m in messages)
+        if WHOLE_ARTICLE in prompt and "extract factual claims" in prompt:
+            return "[]"
+        if self.interrupt and INTERRUPT in prompt and "extract factual claims" not in prompt:
+            raise InterruptedRun("interrupted before the comparison finished")
+        return _completion_text({"messages": messages}, {"claims": [str(self.claims)]})
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:  # not Linux: peak instead of current
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def shared_thread_check(article_text):
+    """The old run_fact_check: one thread for every run on an unbounded saver."""
+    graph = await fact_check_service.get_fact_check_graph()
+    initial_state = {"article_text": article_text, "resources": [], "reliability": {}, "claims": [],
+                     "claim_results": []}
+    return await graph.ainvoke(initial_state, {"configurable": {"thread_id": "default"}})
+
+
+async def stored(saver):
+    """(threads, checkpoints) held by the saver."""
+    if isinstance(saver, InMemorySaver):
+        return (sum(1 for t in saver.storage.values() if any(t.values())),
+                sum(len(c) for t in saver.storage.values() for c in t.values()))
+    async with saver.conn.execute("SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints") as cursor:
+        return await cursor.fetchone()
+
+
+async def report(done, started, saver):
+    gc.collect()
+    traced, _ = tracemalloc.get_traced_memory()
+    threads, checkpoints_stored = await stored(saver)
+    print(f"{done:>7} {time.perf_counter() - started:8.1f}s {rss_mb():9.1f}MB {traced / 2**20:10.1f}MB "
+          f"{threads:>8} {checkpoints_stored:>12}")
+
+
+async def soak(runs, concurrency, fail_every, mode, samples):
+    check = shared_thread_check if mode == "shared-thread" else run_fact_check
+    saver = await checkpoints.get_checkpointer()
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def one(i):
+        nonlocal failed
+        interrupted = fail_every and i % fail_every == 0
+        text = f"{ARTICLE} {WHOLE_ARTICLE} {INTERRUPT}" if interrupted else f"{ARTICLE} Run {i}."
+        async with semaphore:
+            try:
+                await check(text)
+            except InterruptedRun:
+                failed += 1
+
+    print(f"{'runs':>7} {'elapsed':>9} {'rss':>11} {'traced':>12} {'threads':>8} {'checkpoints':>12}")
+    started = time.perf_counter()
+    step = max(1, runs // samples)
+    for first in range(0, runs, step):
+        await asyncio.gather(*(one(i) for i in range(first, min(first + step, runs))))
+        await report(min(first + step, runs), started, saver)
+    print(f"{failed} interrupted runs left checkpoints behind"
+          + (f"; {saver.evicted} threads evicted" if isinstance(saver, BoundedMemorySaver) else ""))
+
+
+async def resume_check():
+    provider = search._service.providers[0]
+    text = f"{ARTICLE} {WHOLE_ARTICLE} {INTERRUPT}"
+    calls = provider.calls
+    try:
+        await run_fact_check(text, thread_id="soak-resume")
+    except InterruptedRun:
+        pass
+    searched = provider.calls - calls
+    graph = await fact_check_service.get_fact_check_graph()
+    pending = (await graph.aget_state({"configurable": {"thread_id": "soak-resume"}})).next
+    fact_check_service.llm = CannedLLM(0, interrupt=False)  # the comparison goes through this time
+    result = await run_fact_check(text, thread_id="soak-resume")
+    print(f"\nresume: interrupted run made {searched} search call(s) and stopped before {list(pending)}; "
+          f"the resumed run made {provider.calls - calls - searched} more and returned {result['reliability']}")
+
+
+async def main_async(args):
+    fact_check_service.llm = CannedLLM(args.claims)
+    search._service = SearchService([FakeProvider()], cache_ttl=0)
+    if args.checkpointer == "shared-thread":
+        checkpoints._saver = InMemorySaver()
+    elif args.checkpointer == "bounded":
+        checkpoints._saver = BoundedMemorySaver(max_threads=args.max_threads)
+    try:
+        await soak(args.runs, args.concurrency, args.fail_every, args.checkpointer, args.samples)
+        if args.checkpointer != "shared-thread":
+            await resume_check()
+    finally:
+        await checkpoints.close_checkpointer()
+        search._service = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--fail-every", type=int, default=10, help="0 for no interrupted runs")
+    parser.add_argument("--claims", type=int, default=4)
+    parser.add_argument("--checkpointer", choices=["bounded", "sqlite", "shared-thread"], default="bounded")
+    parser.add_argument("--max-threads", type=int, default=config.FACT_CHECK_CHECKPOINT_MAX_THREADS)
+    parser.add_argument("--samples", type=int, default=10)
+    args = parser.parse_args()
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        config.FACT_CHECK_CHECKPOINTER = "sqlite" if args.checkpointer == "sqlite" else "memory"
+        config.FACT_CHECK_CHECKPOINT_PATH = os.path.join(tmp, "checkpoints.sqlite3")
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+# backend/benchmarks/stub_server.py
+"""
+Local stand-in for the upstreams the backend talks to (news sites, DuckDuckGo,
+Tavily and OpenRouter) so benchmarks run offline and deterministically.
+
+Every route accepts an optional ``?delay=<seconds>`` query parameter to simulate
+upstream latency; completions also take ``?token_delay=<seconds>`` per generated token.
+Completions answer per-claim fact-check prompts with ``?claims=<n>`` claims (default 4)
+and FACT verdicts; every other prompt gets the reliability JSON.
+
+Misbehaving pages for the fetch limits:
+``/huge?mb=<n>``                 the article followed by <n> MB of filler paragraphs and scripts
+``/slow?interval=<s>&chunks=<n>`` the article trickled out in <n> chunks, <s> seconds apart
+``/binary``                      a PDF download
+
+``/limited?rps=<n>`` is the article from a site that answers 429 with ``Retry-After: 1``
+once it has served <n> requests within the last second.
+
+Faults for the API routes (completions, /search), each drawn per request with the given
+probability from a seeded generator:
+``?fail=<p>``                    503 with ``Retry-After`` of ``?retry_after=<s>`` if given
+``?error=<p>``                   200 carrying an OpenRouter-style error object instead of a completion
+``?slow=<p>&slow_delay=<s>``     an extra <s> seconds (default 2) before answering (tail latency)
+
+A completion parameter written ``<name>@<model>`` applies only to requests for that model and
+overrides ``<name>`` for them, e.g. ``?delay=0.2&delay@deepseek/deepseek-r1-zero:free=2&fail@x=1``.
+"""
+import json
+import os
+import random
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ARTICLE_HTML = """<html><head><title>Stub article</title>
+<meta property="article:published_time" content="2024-01-01T00:00:00Z"></head>
+<body><nav>Home News Sport</nav><article>{paragraphs}</article><footer>Footer links</footer></body></html>
+""".format(paragraphs="".join(
+    f"<p>Paragraph {i} of the stub article about climate policy and energy markets.</p>" for i in range(20)
+))
+
+ARTICLE_ETAG = '"stub-article-v1"'
+COMPLETION_TEXT = '{"true_percentage": 80, "fake_percentage": 20}'
+
+
+def _search_html(base_url):
+    links = "".join(
+        f'<a class="result__a" href="//duckduckgo.com/l/?uddg={base_url}/article/{i}">Result {i}</a>'
+        for i in range(10)
+    )
+    return f"<html><body>{links}</body></html>"
+
+
+def _completion_text(body, query):
+    """Canned answer for the prompt: claims and verdicts for per-claim fact-checks, else the reliability JSON."""
+    prompt = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+    if "extract factual claims" in prompt:
+        claims = int(query.get("claims", ["4"])[0])
+        return json.dumps([f"Claim {i} about the energy plan." for i in range(claims)])
+    if "Judge the claim" in prompt:
+        return '{"verdict": "FACT", "evidence": "Source 0 reports the same."}'
+    return COMPLETION_TEXT
+
+
+def _for_model(query, model):
+    """The query with ``<name>@<model>`` parameters of `model` in place of ``<name>``."""
+    suffix = f"@{model}"
+    overrides = {name[:-len(suffix)]: value for name, value in query.items() if model and name.endswith(suffix)}
+    return {**query, **overrides}
+
+
+def _completion(content):
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients can reuse connections
+
+    def setup(self):
+        if self.server.ssl_context is not None:
+            # Handshake in the connection's own thread rather than in accept()
+            self.request = self.server.ssl_context.wrap_socket(self.request, server_side=True)
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _delay(self, query):
+        delay = float(query.get("delay", ["0"])[0])
+        if delay:
+            time.sleep(delay)
+
+    def _send(self, status, body, content_type, headers=None):
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up waiting (deadline, cancelled search)
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        try:
+            self._get()
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def _over_limit(self, rps):
+        now = time.monotonic()
+        with self.server.lock:
+            served = self.server.served
+            while served and served[0] <= now - 1:
+                served.popleft()
+            if len(served) >= rps:
+                self.server.rejected += 1
+                return True
+            served.append(now)
+            return False
+
+    def _get(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        self._delay(query)
+        if parts.path.startswith("/html"):
+            base_url = f"http://{self.headers['Host']}"
+            self._send(200, _search_html(base_url), "text/html")
+        elif parts.path.startswith("/huge"):
+            self._send_huge(float(query.get("mb", ["20"])[0]))
+        elif parts.path.startswith("/slow"):
+            self._send_chunked(ARTICLE_HTML.encode(), int(query.get("chunks", ["20"])[0]),
+                               float(query.get("interval", ["0.5"])[0]))
+        elif parts.path.startswith("/limited") and self._over_limit(float(query.get("rps", ["5"])[0])):
+            self._send(429, "Too Many Requests", "text/plain", {"Retry-After": "1"})
+        elif parts.path.startswith("/binary"):
+            self._send(200, b"%PDF-1.4\n" + b"\0" * 1024 * 1024, "application/pdf")
+        elif self.headers.get("If-None-Match") == ARTICLE_ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ARTICLE_ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send(200, ARTICLE_HTML, "text/html", {"ETag": ARTICLE_ETAG})
+
+    def _roll(self, query, name):
+        chance = float(query.get(name, ["0"])[0])
+        with self.server.lock:
+            hit = chance > 0 and self.server.random.random() < chance
+            self.server.faults += hit
+        return hit
+
+    def _fault(self, query):
+        """Sends an injected failure and returns True, or returns False to answer normally."""
+        if self._roll(query, "slow"):
+            time.sleep(float(query.get("slow_delay", ["2"])[0]))
+        if self._roll(query, "fail"):
+            retry_after = query.get("retry_after")
+            self._send(503, "Service Unavailable", "text/plain", {"Retry-After": retry_after[0]} if retry_after else None)
+        elif self._roll(query, "error"):
+            error = {"error": {"code": 502, "message": "Provider returned error"}}
+            self._send(200, json.dumps(error), "application/json")
+        else:
+            return False
+        return True
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        query = _for_model(query, body.get("model"))
+        self._delay(query)
+        if self._fault(query):
+            return
+        if parts.path.startswith("/search"):
+            results = [
+                {"title": f"Source {i}", "url": f"https://example.com/{i}", "content": "Supporting evidence.", "score": 0.9}
+                for i in range(body.get("max_results", 5))
+            ]
+            self._send(200, json.dumps({"query": body.get("query"), "results": results}), "application/json")
+        elif body.get("stream"):
+            self._stream_completion(_completion_text(body, query), float(query.get("token_delay", ["0"])[0]))
+        else:
+            # A non-streamed completion only returns once every token has been generated
+            text = _completion_text(body, query)
+            time.sleep(float(query.get("token_delay", ["0"])[0]) * len(text.split(" ")))
+            self._send(200, json.dumps(_completion(text)), "application/json")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_chunked(self, data, chunks, interval):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        size = max(1, -(-len(data) // chunks))
+        try:
+            for start in range(0, len(data), size):
+                self._write_chunk(data[start:start + size])
+                time.sleep(interval)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up, which is what the slow page is for
+
+    def _send_huge(self, megabytes):
+        """The stub article, then filler streamed in 64 KB chunks up to `megabytes` MB, without a length header."""
+        filler_paragraph = b"<p>Filler paragraph with plenty of words, commas, and sentences to keep a parser busy.</p>"
+        filler_script = b"<script>var x = '" + b"x" * 4000 + b"';</script>"
+        chunk = (filler_paragraph * 40 + filler_script) * 10
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            self._write_chunk(ARTICLE_HTML.replace("</body></html>", "").encode())
+            sent = 0
+            while sent < megabytes * 1024 * 1024:
+                self._write_chunk(chunk)
+                sent += len(chunk)
+            self._write_chunk(b"</body></html>")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _stream_completion(self, content, token_delay):
+        """OpenRouter-style SSE: a keep-alive comment, one chunk per word, then [DONE]."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write(event):
+            self._write_chunk(event.encode())
+
+        write(": OPENROUTER PROCESSING\n\n")
+        for i, word in enumerate(content.split(" ")):
+            token = word if i == 0 else " " + word
+            write("data: " + json.dumps({"choices": [{"delta": {"content": token}}]}) + "\n\n")
+            if token_delay:
+                time.sleep(token_delay)
+        write("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def _self_signed_context():
+    """Builds a TLS context from a throwaway self-signed certificate (needs the openssl CLI)."""
+    directory = tempfile.mkdtemp()
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # load tests open hundreds of connections at once
+
+
+class StubServer:
+    """
+    Runs the stub upstream in a background thread: ``with StubServer() as server: server.url``
+    ``tls=True`` serves HTTPS so handshake costs show up like they do against real upstreams.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, handler=StubHandler, tls=False, seed=0):
+        self.httpd = _Server((host, port), handler)
+        self.httpd.connections = 0
+        self.httpd.in_flight = self.httpd.max_in_flight = 0
+        self.httpd.served, self.httpd.rejected = deque(), 0
+        self.httpd.random, self.httpd.faults = random.Random(seed), 0
+        self.httpd.lock = threading.Lock()
+        self.httpd.ssl_context = _self_signed_context() if tls else None
+        self.scheme = "https" if tls else "http"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"{self.scheme}://{host}:{port}"
+
+    @property
+    def connections(self):
+        """Number of TCP connections accepted so far."""
+        return self.httpd.connections
+
+    @property
+    def rejected(self):
+        """Requests ``/limited`` answered with 429."""
+        return self.httpd.rejected
+
+    @property
+    def faults(self):
+        """Slow, failed and error answers injected so far."""
+        return self.httpd.faults
+
+    @property
+    def max_in_flight(self):
+        """Most GET requests (pages, DuckDuckGo) served at the same time so far."""
+        return self.httpd.max_in_flight
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
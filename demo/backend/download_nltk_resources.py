@@ -1,6 +1,8 @@
 import nltk
 
-# Download the 'punkt' tokenizer models
+# Download the 'punkt' tokenizer models used to chunk long articles at sentence
+# boundaries (app/utils/chunking.py); NLTK 3.9+ loads them from 'punkt_tab'
 nltk.download('punkt')
+nltk.download('punkt_tab')
 # import nltk
 # print(nltk.__version__)